@@ -1,5 +1,53 @@
+import random
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+# Поля преподавателя без идентификатора (порядок совпадает с аргументами add_teacher)
+TEACHER_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "academic_degree",
+    "administrative_position",
+    "experience_years",
+)
+# Все колонки записи преподавателя
+TEACHER_COLUMNS = ("id_teacher",) + TEACHER_FIELDS
+# Попыток записать изменение, если данные одновременно меняет другой процесс
+MAX_WRITE_ATTEMPTS = 16
+# Попыток без блокировки: дальше изменение выполняется под исключительной блокировкой
+OPTIMISTIC_WRITE_ATTEMPTS = 3
+WRITE_RETRY_DELAY = 0.005  # секунды: начальная пауза перед повтором, дальше удваивается
+WRITE_RETRY_DELAY_MAX = 0.5  # секунды: предел паузы перед повтором
+
+T = TypeVar("T")
+
+
+def projection_columns(fields: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    """
+    Привести запрошенные поля к колонкам хранилища в каноническом порядке.
+    id_teacher включается всегда, None означает все поля.
+    """
+    if fields is None:
+        return None
+    unknown = set(fields) - set(TEACHER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+    return tuple(column for column in TEACHER_COLUMNS if column == "id_teacher" or column in fields)
 
 
 class BaseTeacherRepository(ABC):
@@ -13,50 +61,135 @@ class BaseTeacherRepository(ABC):
         pass
 
     @abstractmethod
-    def read_all(self) -> List[Dict[str, Any]]:
-        """Чтение всех значений из файла"""
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Чтение всех значений из файла (fields - оставить только эти поля)"""
         pass
 
     @abstractmethod
-    def write_all(self, data: List[Dict[str, Any]]) -> str:
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
         """Запись всех значений в файл"""
         pass
 
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        """
+        Потоковое чтение всех значений.
+        Базовая реализация читает все сразу, хранилища переопределяют ее инкрементальным чтением.
+        """
+        yield from self.read_all()
+
+    @staticmethod
+    def _project_all(data: List[Any], fields: Optional[Sequence[str]]) -> List[Any]:
+        """
+        Построить записи только из запрошенных полей.
+        Без проекции возвращает сами записи: словари или TeacherRecord, как их хранит источник.
+        """
+        columns = projection_columns(fields)
+        if columns is None:
+            return data
+        return [{column: entity[column] for column in columns} for entity in data]
+
     # c. Получить объект по ID
-    def get_by_id(self, id_teacher: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         data = self.read_all()
         for entity in data:
             if entity["id_teacher"] == id_teacher:
-                return entity
+                return self._project_all([entity], fields)[0]
         return None
 
+    # c1. Получить несколько объектов по списку ID за один проход по данным
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Порядок результата совпадает с порядком ids, отсутствующие ID пропускаются"""
+        wanted = set(ids)
+        index = {
+            entity["id_teacher"]: entity
+            for entity in self.read_all(fields)
+            if entity["id_teacher"] in wanted
+        }
+        return [index[id_teacher] for id_teacher in ids if id_teacher in index]
+
     # d. Получить список k по счету n объектов класса
-    def get_k_n_short_list(self, k: int, n: int) -> List[Dict[str, Any]]:
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
         data = self.read_all()
         start = (n - 1) * k # k-количество элементов на странице, n - номер страницы
         end = start + k
 
-        short_list = []
-        for entity in data[start:end]:
-            short_entity = {
-                "id_teacher": entity["id_teacher"],
-                "last_name": entity["last_name"],
-                "first_name": entity["first_name"][0] + ".",
-                "email": entity["email"],
-                "academic_degree": entity["academic_degree"],
-                "administrative_position": entity["administrative_position"],
-                "experience_years": entity["experience_years"],
-            }
-            short_list.append(short_entity)
+        short_list = self._project_all(data[start:end], fields)
+        if fields is None:
+            short_list = [dict(entity) for entity in short_list]
+        for short_entity in short_list:
+            if "first_name" in short_entity:
+                short_entity["first_name"] = short_entity["first_name"][0] + "."
 
         return short_list
 
+    # Чтение-изменение-запись с проверкой версии данных
+
+    def _read_versioned(self) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Все записи и версия данных, при которой они прочитаны (None - хранилище без версий)"""
+        return self.read_all(), None
+
+    def _write_versioned(self, data: Sequence[Mapping[str, Any]], version: Optional[int]) -> bool:
+        """
+        Записать данные, если их версия не изменилась с чтения (compare-and-swap).
+        Успешная запись делает версию равной version + 1.
+        False - данные успел изменить другой процесс. Хранилище без версий пишет всегда.
+        """
+        self.write_all(data)
+        return True
+
+    def _exclusive(self) -> ContextManager[None]:
+        """
+        Блокировка, под которой данные не может изменить никто другой
+        (чтение и запись с версией под ней тоже выполняются). Хранилище без версий - без блокировки.
+        """
+        return nullcontext()
+
+    def _modify(
+        self,
+        change: Callable[[Any], Tuple[T, bool]],
+        read: Optional[Callable[[], Tuple[Any, Optional[int]]]] = None,
+        write: Optional[Callable[[Any, Optional[int]], bool]] = None,
+    ) -> T:
+        """
+        Применить change к свежим данным и записать их. change меняет список на месте
+        и возвращает (результат, нужно ли записывать). Если данные тем временем изменил
+        другой процесс, они перечитываются и change применяется заново после паузы.
+        После OPTIMISTIC_WRITE_ATTEMPTS конфликтов чтение, изменение и запись выполняются
+        под исключительной блокировкой: так изменение не может проигрывать бесконечно.
+        read и write заменяют _read_versioned и _write_versioned, если данные в обертке
+        хранятся не списком (например, индекс TeacherRepIndexed).
+        """
+        read = read or self._read_versioned
+        write = write or self._write_versioned
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            if attempt:
+                # Случайная пауза разводит писателей, которые конфликтуют друг с другом
+                delay = min(WRITE_RETRY_DELAY * 2 ** (attempt - 1), WRITE_RETRY_DELAY_MAX)
+                time.sleep(random.uniform(0, delay))
+            locked = attempt >= OPTIMISTIC_WRITE_ATTEMPTS
+            with self._exclusive() if locked else nullcontext():
+                data, version = read()
+                result, changed = change(data)
+                if not changed or write(data, version):
+                    return result
+        raise RuntimeError(
+            f"Не удалось записать изменения за {MAX_WRITE_ATTEMPTS} попыток: "
+            "данные одновременно меняют другие процессы"
+        )
+
     # e. Сортировать элементы по выбранному полю
     def sort_by_field(self, field: str) -> str:
-        data = self.read_all()
-        data.sort(key=lambda x: x[field])
-        self.write_all(data)
-        return "ок"
+        def change(data: List[Dict[str, Any]]) -> Tuple[str, bool]:
+            data.sort(key=lambda x: x[field])
+            return "ок", True
+
+        return self._modify(change)
 
     # f. Добавить объект в список (при добавлении сформировать новый ID)
     def add_teacher(
@@ -68,25 +201,41 @@ class BaseTeacherRepository(ABC):
         administrative_position: str,
         experience_years: int,
     ) -> int:
-        data = self.read_all()
+        def change(data: List[Dict[str, Any]]) -> Tuple[int, bool]:
+            new_id = 1
+            if data:
+                new_id = max(entity["id_teacher"] for entity in data) + 1
 
-        new_id = 1
-        if data:
-            new_id = max(entity["id_teacher"] for entity in data) + 1
-
-        new_entity = {
-            "id_teacher": new_id,
-            "first_name": first_name,
-            "last_name": last_name,
-            "email": email,
-            "academic_degree": academic_degree,
-            "administrative_position": administrative_position,
-            "experience_years": experience_years,
-        }
+            new_entity = {
+                "id_teacher": new_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "academic_degree": academic_degree,
+                "administrative_position": administrative_position,
+                "experience_years": experience_years,
+            }
 
-        data.append(new_entity)
-        self.write_all(data)
-        return new_id
+            data.append(new_entity)
+            return new_id, True
+
+        return self._modify(change)
+
+    # f1. Массово добавить объекты (одна запись в файл на весь пакет)
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        """Добавить уже проверенные записи, ID назначаются по порядку. Возвращает их количество"""
+        if not teachers:
+            return 0
+
+        def change(data: List[Dict[str, Any]]) -> Tuple[int, bool]:
+            next_id = max((entity["id_teacher"] for entity in data), default=0) + 1
+            for offset, teacher in enumerate(teachers):
+                new_entity = {"id_teacher": next_id + offset}
+                new_entity.update({field: teacher[field] for field in TEACHER_FIELDS})
+                data.append(new_entity)
+            return len(teachers), True
+
+        return self._modify(change)
 
     # g. Заменить элемент списка по ID
     def update_teacher(
@@ -99,41 +248,120 @@ class BaseTeacherRepository(ABC):
         administrative_position: Optional[str] = None,
         experience_years: Optional[int] = None,
     ) -> Optional[Dict[str, Any]]:
-        data = self.read_all()
-        entity = self.get_by_id(id_teacher)
-
-        if entity is None:
-            return None
-
-        for i, item in enumerate(data):
-            if item["id_teacher"] == id_teacher:
-                if first_name:
-                    data[i]["first_name"] = first_name
-                if last_name:
-                    data[i]["last_name"] = last_name
-                if email:
-                    data[i]["email"] = email
-                if academic_degree:
-                    data[i]["academic_degree"] = academic_degree
-                if administrative_position:
-                    data[i]["administrative_position"] = administrative_position
-                if experience_years is not None:
-                    data[i]["experience_years"] = experience_years
-                self.write_all(data)
-                return data[i]
-        return None
+        def change(data: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], bool]:
+            for i, item in enumerate(data):
+                if item["id_teacher"] == id_teacher:
+                    if first_name:
+                        data[i]["first_name"] = first_name
+                    if last_name:
+                        data[i]["last_name"] = last_name
+                    if email:
+                        data[i]["email"] = email
+                    if academic_degree:
+                        data[i]["academic_degree"] = academic_degree
+                    if administrative_position:
+                        data[i]["administrative_position"] = administrative_position
+                    if experience_years is not None:
+                        data[i]["experience_years"] = experience_years
+                    return data[i], True
+            return None, False
+
+        return self._modify(change)
 
     # h. Удалить элемент списка по ID
     def delete_teacher(self, id_teacher: int) -> str:
-        data = self.read_all()
-        entity = self.get_by_id(id_teacher)
-        if entity:
-            data.remove(entity)
-            self.write_all(data)
-            return "ок"
-        return "не найден"
+        def change(data: List[Dict[str, Any]]) -> Tuple[str, bool]:
+            for i, item in enumerate(data):
+                if item["id_teacher"] == id_teacher:
+                    del data[i]
+                    return "ок", True
+            return "не найден", False
+
+        return self._modify(change)
 
     # i. Получить количество элементов
     def get_count(self) -> int:
         data = self.read_all()
         return len(data)
+
+    # j. Применить пакет операций (create/update/delete) с одной записью в файл
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Операции применяются к данным в памяти по порядку, файл записывается один раз.
+        Если хотя бы одна операция не выполнена, ничего не сохраняется.
+        """
+
+        def change(data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+            index = {entity["id_teacher"]: entity for entity in data}
+            next_id = max(index, default=0) + 1
+            # Изменения копятся отдельно от data: id -> новая запись (None - удалена)
+            changed: Dict[int, Optional[Dict[str, Any]]] = {}
+            created: List[int] = []
+            results: List[Dict[str, Any]] = []
+
+            for operation in operations:
+                action = operation["op"]
+                if action == "create":
+                    new_entity = {"id_teacher": next_id}
+                    new_entity.update({field: operation["data"][field] for field in TEACHER_FIELDS})
+                    changed[next_id] = new_entity
+                    created.append(next_id)
+                    results.append(self._batch_result(action, next_id, True, "создан", new_entity))
+                    next_id += 1
+                    continue
+
+                id_teacher = operation["id"]
+                entity = changed[id_teacher] if id_teacher in changed else index.get(id_teacher)
+                if entity is None:
+                    results.append(self._batch_result(action, id_teacher, False, "не найден"))
+                elif action == "update":
+                    entity = dict(entity)
+                    for field in TEACHER_FIELDS:
+                        value = operation["data"].get(field)
+                        if value or (field == "experience_years" and value is not None):
+                            entity[field] = value
+                    changed[id_teacher] = entity
+                    results.append(self._batch_result(action, id_teacher, True, "обновлен", entity))
+                else:
+                    changed[id_teacher] = None
+                    results.append(self._batch_result(action, id_teacher, True, "удален"))
+
+            # data меняется только для пакета, выполненного целиком
+            if not all(result["success"] for result in results):
+                return self._cancel_batch(results), False
+
+            rows = [changed.get(entity["id_teacher"], entity) for entity in data]
+            rows.extend(changed[id_teacher] for id_teacher in created)
+            data[:] = [entity for entity in rows if entity is not None]
+            return results, True
+
+        return self._modify(change)
+
+    @staticmethod
+    def _batch_result(
+        action: str,
+        id_teacher: Optional[int],
+        success: bool,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Результат одной операции пакета"""
+        return {
+            "op": action,
+            "id": id_teacher,
+            "success": success,
+            "message": message,
+            "data": dict(data) if data is not None else None,
+        }
+
+    @staticmethod
+    def _cancel_batch(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Пометить успешные операции отмененными, если пакет не применен целиком"""
+        for result in results:
+            if result["success"]:
+                result["success"] = False
+                result["message"] = "отменено: пакет не применен"
+                result["data"] = None
+                if result["op"] == "create":
+                    result["id"] = None
+        return results
@@ -1,3 +1,8 @@
+import csv
+import io
+import itertools
+from contextlib import contextmanager
+
 import psycopg2
 
 
@@ -8,6 +13,7 @@ class DatabaseManager:
     """
 
     _instance = None  # статическая переменная, хранящая единственный экземпляр класса
+    _cursor_names = itertools.count(1)  # имена для серверных курсоров
 
     def __new__(
             cls, dbname="postgres", user="postgres", password="password", host="localhost", port="5433"
@@ -30,6 +36,10 @@ class DatabaseManager:
             }
             self.connection = None
             self.is_connected = False
+            self._in_transaction = False  # внутри transaction() коммит откладывается
+            # Статистика для мониторинга
+            self.queries_total = 0
+            self.query_errors_total = 0
             self._initialized = True
 
     def connect(self):
@@ -61,6 +71,7 @@ class DatabaseManager:
                 print("Нет подключения к базе данных. Не удалось подключиться")
                 return None
 
+        self.queries_total += 1
         try:
             with self.connection.cursor() as cursor:
                 cursor.execute(query, params)  # делегируем выполнение курсору
@@ -71,13 +82,19 @@ class DatabaseManager:
 
                 if is_select or has_returning:
                     result = cursor.fetchall()
-                    self.connection.commit()
+                    if not self._in_transaction:
+                        self.connection.commit()
                     return result
                 else:
-                    self.connection.commit()
+                    if not self._in_transaction:
+                        self.connection.commit()
                     return cursor.rowcount
 
         except Exception as e:
+            self.query_errors_total += 1
+            if self._in_transaction:
+                # Откат выполнит transaction(), ошибку пробрасываем наружу
+                raise
             print(f"Ошибка выполнения запроса: {e}")
             print(f"   Запрос: {query}")
             print(f"   Параметры: {params}")
@@ -88,6 +105,73 @@ class DatabaseManager:
                     print(f"Ошибка при откате транзакции: {rollback_error}")
             return None
 
+    def copy_rows(self, table, columns, rows):
+        """
+        Массовая загрузка строк через COPY ... FROM STDIN в формате CSV.
+        Возвращает количество загруженных строк или None при ошибке.
+        """
+        if not self.is_connected or self.connection is None:
+            if not self.connect():
+                print("Нет подключения к базе данных. Не удалось подключиться")
+                return None
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        query = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+        self.queries_total += 1
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.copy_expert(query, buffer)
+                count = cursor.rowcount
+            if not self._in_transaction:
+                self.connection.commit()
+            return count
+        except Exception as e:
+            self.query_errors_total += 1
+            if self._in_transaction:
+                raise
+            print(f"Ошибка массовой загрузки: {e}")
+            print(f"   Запрос: {query}")
+            self.rollback()
+            return None
+
+    def iter_query(self, query, params=None, chunk_size=1000):
+        """
+        Потоковое выполнение SELECT через серверный (именованный) курсор.
+        Строки забираются из БД порциями по chunk_size, в памяти не накапливаются.
+        Ошибка подключения или чтения пробрасывается, в том числе посреди потока.
+        """
+        if not self.is_connected or self.connection is None:
+            if not self.connect():
+                # Пустой поток выглядел бы как полная выгрузка пустой таблицы
+                raise ConnectionError("Нет подключения к базе данных. Не удалось подключиться")
+
+        cursor = self.connection.cursor(name=f"stream_cursor_{next(self._cursor_names)}")
+        cursor.itersize = chunk_size
+        completed = False
+        self.queries_total += 1
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+            completed = True
+        except Exception as e:
+            self.query_errors_total += 1
+            print(f"Ошибка потокового чтения: {e}")
+            print(f"   Запрос: {query}")
+            # Вызывающий код должен отличить оборванный поток от завершенного
+            raise
+        finally:
+            # Сюда попадаем и при досрочном закрытии генератора (клиент отключился)
+            cursor.close()
+            if not self._in_transaction:
+                if completed:
+                    self.connection.commit()
+                else:
+                    self.connection.rollback()
+
     @property
     def connected(self):
         """Проверка активности соединения"""
@@ -101,6 +185,26 @@ class DatabaseManager:
                 return False
         return False
 
+    @contextmanager
+    def transaction(self):
+        """
+        Выполнить несколько запросов в одной транзакции.
+        При любой ошибке внутри блока все изменения откатываются.
+        """
+        if not self.is_connected or self.connection is None:
+            if not self.connect():
+                raise ConnectionError("Нет подключения к базе данных")
+
+        self._in_transaction = True
+        try:
+            yield self
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self._in_transaction = False
+
     def commit(self):
         """Явное подтверждение транзакции"""
         if self.connection and self.is_connected:
@@ -0,0 +1,292 @@
+import itertools
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировок между процессами нет
+    fcntl = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+NEW_FILE_MODE = 0o644  # права файла хранилища, если его еще не было
+
+# Блокировки, которые держит текущий поток: путь файла блокировки -> операция flock
+_held = threading.local()
+
+
+def fsync_directory(directory: str) -> None:
+    """Сбросить на диск запись каталога, чтобы переименование пережило сбой питания"""
+    if os.name == "nt":
+        return  # каталоги в Windows так не открываются, rename там и так журналируется
+    fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def write_temp(path: str, dump: Callable[[TextIO], None]) -> str:
+    """
+    Записать содержимое во временный файл рядом с path (dump пишет в него) и сбросить его
+    на диск. Возвращает путь временного файла: его остается переименовать через publish.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        os.chmod(temp_path, mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            dump(f)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    return temp_path
+
+
+def publish(temp_path: str, path: str) -> None:
+    """Переименовать подготовленный временный файл поверх path и сбросить запись каталога"""
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def atomic_write(path: str, dump: Callable[[TextIO], None]) -> None:
+    """
+    Атомарно заменить файл: dump пишет во временный файл в том же каталоге,
+    он сбрасывается на диск (fsync) и переименовывается поверх path.
+    Читатели видят либо старое, либо новое содержимое целиком, но не обрезанный файл.
+    """
+    publish(write_temp(path, dump), path)
+
+
+class VersionedFile:
+    """
+    Файл хранилища, общий для нескольких процессов: блокировки fcntl.flock
+    на соседнем файле <path>.lock и номер версии данных в <path>.version.
+    Каждая запись увеличивает версию, поэтому изменение, прочитанное при одной версии,
+    можно записать условно (compare-and-swap) и повторить при конфликте.
+    Разделяемую блокировку держат одновременно сколько угодно читателей;
+    исключительная берется только на проверку версии и переименование готового файла.
+    Блокировка открывается на каждый захват заново: flock привязан к открытому файлу,
+    так что она разделяет и потоки одного процесса. Вложенный захват в том же потоке
+    (например, commit под exclusive) ничего не делает. Без fcntl (Windows) блокировок нет.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.version_path = f"{path}.version"
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[None]:
+        held: Dict[str, int] = _held.__dict__.setdefault("locks", {})
+        key = os.path.abspath(self.lock_path)
+        current = held.get(key)
+        if fcntl is None or current == fcntl.LOCK_EX or current == operation:
+            yield
+            return
+        if current is not None:
+            # Второй flock того же потока на другом дескрипторе ждал бы сам себя
+            raise RuntimeError(f"Нельзя повысить блокировку {self.lock_path} до исключительной")
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f.fileno(), operation)
+            held[key] = operation
+            try:
+                yield
+            finally:
+                del held[key]
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def shared(self) -> ContextManager[None]:
+        """Блокировка для чтения: данные и версия не меняются, пока она взята"""
+        return self._locked(fcntl.LOCK_SH if fcntl is not None else 0)
+
+    def exclusive(self) -> ContextManager[None]:
+        """Блокировка для записи: никто другой не читает с версией и не пишет, пока она взята"""
+        return self._locked(fcntl.LOCK_EX if fcntl is not None else 0)
+
+    def version(self) -> int:
+        """Текущая версия данных (0 - файл ни разу не записывался с версией)"""
+        try:
+            with open(self.version_path, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def commit(
+        self, dump: Callable[[TextIO], None], expected_version: Optional[int] = None
+    ) -> bool:
+        """
+        Записать новое содержимое и увеличить версию.
+        expected_version - записать, только если версия не изменилась с чтения;
+        False - данные успел изменить другой писатель, временный файл удаляется.
+        """
+        temp_path = write_temp(self.path, dump)
+        with self.exclusive():
+            version = self.version()
+            if expected_version is not None and version != expected_version:
+                _remove_quietly(temp_path)
+                return False
+
+            def dump_version(f: TextIO) -> None:
+                f.write(str(version + 1))
+
+            # Версия растет раньше замены данных: сбой между ними дает лишний конфликт,
+            # а не запись поверх чужих изменений
+            atomic_write(self.version_path, dump_version)
+            publish(temp_path, self.path)
+        return True
+
+
+class GroupCommitWriter:
+    """
+    Групповая запись файла: параллельные запросы из потоков одного процесса объединяются.
+    Пока идет запись, новые запросы ждут, а затем один из них выполняет все накопившиеся:
+    подряд идущие write - записью только последнего содержимого (файл заменяется целиком,
+    промежуточные версии все равно были бы перезаписаны), подряд идущие modify - одним
+    чтением-изменением-записью с проверкой версии, где изменения применяются по очереди
+    (ошибка или отказ одного изменения не затрагивает остальные).
+    Один fsync подтверждает сразу все запросы пачки.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = VersionedFile(path)
+        self._cond = threading.Condition()
+        # Ожидающие запросы: (номер, содержимое или изменение, run; None у write)
+        self._pending: List[Tuple[int, Any, Optional[Callable[..., Any]]]] = []
+        self._writing = False
+        self._requested = 0  # номер последнего поданного запроса
+        self._results: Dict[int, Tuple[Any, Optional[BaseException]]] = {}
+        # Статистика: запросов больше, чем записей, когда записи объединяются
+        self.requests_total = 0
+        self.writes_total = 0
+
+    def write(self, dump: Callable[[TextIO], None]) -> None:
+        """Записать содержимое без проверки версии; возвращается, когда оно на диске"""
+        self._submit(dump, None)
+
+    def modify(self, change: Callable[[list], Tuple[T, bool]], run: Callable[..., Any]) -> T:
+        """
+        Выполнить изменение change (см. BaseTeacherRepository._modify) вместе с изменениями
+        других потоков. run применяет объединенное изменение к свежим данным и записывает их
+        с проверкой версии, повторяя при конфликте. Возвращает результат change.
+        """
+        return cast(T, self._submit(change, run))
+
+    def _submit(self, request: Any, run: Optional[Callable[..., Any]]) -> Any:
+        with self._cond:
+            self._requested += 1
+            self.requests_total += 1
+            ticket = self._requested
+            self._pending.append((ticket, request, run))
+            while ticket not in self._results:
+                if self._writing:
+                    self._cond.wait()
+                    continue
+                # Этот поток выполняет запросы всех ожидающих
+                self._writing = True
+                batch, self._pending = self._pending, []
+                self._cond.release()
+                try:
+                    results = self._execute(batch)
+                finally:
+                    self._cond.acquire()
+                    self._writing = False
+                    self._cond.notify_all()
+                self._results.update(results)
+            result, error = self._results.pop(ticket)
+        if error is not None:
+            raise error
+        return result
+
+    def _execute(self, batch: list) -> Dict[int, Tuple[Any, Optional[BaseException]]]:
+        """Выполнить пачку запросов по порядку (вызывается без self._cond)"""
+        results: Dict[int, Tuple[Any, Optional[BaseException]]] = {}
+        for run, group in itertools.groupby(batch, key=lambda request: request[2]):
+            requests = list(group)
+            try:
+                if run is None:
+                    self._file.commit(requests[-1][1])
+                    results.update((ticket, (None, None)) for ticket, _, _ in requests)
+                else:
+                    results.update(self._modify_together(requests, run))
+                self.writes_total += 1
+            except BaseException as e:
+                results.update((ticket, (None, e)) for ticket, _, _ in requests)
+        return results
+
+    @staticmethod
+    def _modify_together(
+        requests: list, run: Callable[..., Any]
+    ) -> Dict[int, Tuple[Any, Optional[BaseException]]]:
+        changes = [change for _, change, _ in requests]
+
+        def combined(data: list) -> Tuple[List[Tuple[Any, Optional[BaseException]]], bool]:
+            # Каждое изменение получает свою копию записей и принимается, только если
+            # вернуло changed=True: отказавшее изменение не оставляет следов в общих данных
+            outcomes: List[Tuple[Any, Optional[BaseException]]] = []
+            changed_any = False
+            for change in changes:
+                working = [dict(row) for row in data]
+                try:
+                    result, changed = change(working)
+                except Exception as e:
+                    outcomes.append((None, e))
+                    continue
+                if changed:
+                    data[:] = working
+                    changed_any = True
+                outcomes.append((result, None))
+            return outcomes, changed_any
+
+        outcomes = run(combined)
+        return {ticket: outcome for (ticket, _, _), outcome in zip(requests, outcomes)}
+
+
+_writers: Dict[str, GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def group_commit_writer(path: str) -> GroupCommitWriter:
+    """Общий для процесса GroupCommitWriter файла (объекты одного файла пишут через него)"""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = GroupCommitWriter(key)
+        return writer
@@ -0,0 +1,222 @@
+import cProfile
+import heapq
+import io
+import itertools
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Доля времени, ниже которой ветки не разворачиваются при построении стеков (секунды)
+MIN_COLLAPSED_TIME = 1e-6
+TRUE_VALUES = ("true", "1", "yes", "on")
+FALSE_VALUES = ("false", "0", "no", "off")
+
+
+def parse_flag(value: Any) -> bool:
+    """Логический флаг из JSON: true/false, 1/0 или строка (true, false, yes, no, on, off)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+    raise ValueError(f"Некорректное значение флага: {value!r}")
+
+
+class RequestProfiler:
+    """
+    Профилирование отдельных HTTP-запросов через cProfile.
+    Запрос профилируется по заголовку X-Profile: 1 (только от доверенных клиентов) или,
+    если профилирование включено, случайно с вероятностью sample_rate.
+    Хранятся профили capacity самых медленных запросов.
+    """
+
+    HEADER = "X-Profile"
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 0.0, capacity: int = 20) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.capacity = capacity
+        self._ids = itertools.count(1)
+        # min-куча (длительность, id): на вершине самый быстрый из сохраненных
+        self._heap: List[Tuple[float, int]] = []
+        self._profiles: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # cProfile нельзя запускать одновременно в нескольких потоках
+        self._profile_lock = threading.Lock()
+
+    def configure(
+        self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None
+    ) -> None:
+        """
+        Включить/выключить профилирование и задать долю профилируемых запросов.
+        Некорректные значения - ValueError, настройки при этом не меняются.
+        """
+        if enabled is not None:
+            enabled = parse_flag(enabled)
+        if sample_rate is not None:
+            try:
+                sample_rate = float(sample_rate)
+            except (TypeError, ValueError):
+                raise ValueError("Некорректная доля запросов") from None
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+
+    def should_profile(self, headers: Any, trusted: bool = False) -> bool:
+        """trusted - клиенту разрешено требовать профиль заголовком X-Profile"""
+        if trusted and headers is not None and headers.get(self.HEADER) == "1":
+            return True
+        return self.enabled and self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def profile(self, label: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Выполнить func под cProfile и сохранить профиль, если запрос среди самых медленных"""
+        if not self._profile_lock.acquire(blocking=False):
+            # Уже профилируется другой запрос - выполняем без профиля
+            return func(*args)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            return profiler.runcall(func, *args)
+        finally:
+            duration = time.perf_counter() - started
+            self._profile_lock.release()
+            self._record(label, duration, profiler)
+
+    def _record(self, label: str, duration: float, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            if len(self._heap) >= self.capacity and duration <= self._heap[0][0]:
+                return
+
+        stats = pstats.Stats(profiler)
+        entry = {
+            "label": label,
+            "duration": duration,
+            "created_at": time.time(),
+            "total_calls": stats.total_calls,  # type: ignore[attr-defined]
+            "stats": stats.stats,  # type: ignore[attr-defined]
+        }
+
+        with self._lock:
+            profile_id = next(self._ids)
+            entry["id"] = profile_id
+            if len(self._heap) >= self.capacity:
+                _, evicted_id = heapq.heapreplace(self._heap, (duration, profile_id))
+                self._profiles.pop(evicted_id, None)
+            else:
+                heapq.heappush(self._heap, (duration, profile_id))
+            self._profiles[profile_id] = entry
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Краткие сведения о сохраненных профилях, самые медленные первыми"""
+        with self._lock:
+            entries = list(self._profiles.values())
+        entries.sort(key=lambda entry: entry["duration"], reverse=True)
+        return [
+            {
+                "id": entry["id"],
+                "label": entry["label"],
+                "duration_ms": round(entry["duration"] * 1000, 3),
+                "created_at": entry["created_at"],
+                "total_calls": entry["total_calls"],
+            }
+            for entry in entries
+        ]
+
+    def _get_stats(self, profile_id: int) -> Optional[Dict[Any, Any]]:
+        with self._lock:
+            entry = self._profiles.get(profile_id)
+        return entry["stats"] if entry else None
+
+    def export_pstats(self, profile_id: int) -> Optional[bytes]:
+        """Профиль в формате файла pstats (читается pstats.Stats, snakeviz и т.п.)"""
+        stats = self._get_stats(profile_id)
+        return marshal.dumps(stats) if stats is not None else None
+
+    def export_text(self, profile_id: int, limit: int = 40) -> Optional[str]:
+        """Текстовый отчет pstats: функции с наибольшим накопленным временем"""
+        stats = self._get_stats(profile_id)
+        if stats is None:
+            return None
+        output = io.StringIO()
+        report = pstats.Stats(_StatsSource(stats), stream=output)  # type: ignore[arg-type]
+        report.sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    def export_collapsed(self, profile_id: int) -> Optional[str]:
+        """Профиль в формате collapsed stacks (flamegraph.pl, speedscope): стек;стек значение_мкс"""
+        stats = self._get_stats(profile_id)
+        if stats is None:
+            return None
+        return collapse_pstats(stats)
+
+
+class _StatsSource:
+    """Обертка, позволяющая создать pstats.Stats из сохраненного словаря"""
+
+    def __init__(self, stats: Dict[Any, Any]) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def _frame_label(func: Tuple[str, int, str]) -> str:
+    filename, _, name = func
+    if filename == "~":
+        return name
+    return f"{os.path.basename(filename)}:{name}"
+
+
+def collapse_pstats(stats: Dict[Any, Any]) -> str:
+    """
+    Восстановить стеки из графа вызовов cProfile (caller -> callee).
+    Собственное время функции делится между путями пропорционально времени по ребрам.
+    """
+    children: Dict[Any, List[Any]] = defaultdict(list)
+    roots = []
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            roots.append(func)
+        for caller in callers:
+            children[caller].append(func)
+
+    totals: Dict[str, float] = defaultdict(float)
+
+    def walk(func: Any, stack: List[str], on_stack: set, fraction: float) -> None:
+        _, _, own_time, cumulative, _ = stats[func]
+        stack.append(_frame_label(func))
+        on_stack.add(func)
+        if own_time * fraction > 0:
+            totals[";".join(stack)] += own_time * fraction
+        for child in children.get(func, ()):
+            if child in on_stack:
+                continue
+            child_cumulative = stats[child][3]
+            edge_cumulative = stats[child][4][func][3]
+            if child_cumulative <= 0 or edge_cumulative * fraction < MIN_COLLAPSED_TIME:
+                continue
+            walk(child, stack, on_stack, fraction * edge_cumulative / child_cumulative)
+        stack.pop()
+        on_stack.discard(func)
+
+    for root in roots:
+        walk(root, [], set(), 1.0)
+
+    lines = [
+        f"{stack} {int(round(seconds * 1_000_000))}"
+        for stack, seconds in sorted(totals.items())
+        if seconds * 1_000_000 >= 1
+    ]
+    return "\n".join(lines) + ("\n" if lines else "")
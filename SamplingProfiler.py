@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Функции, в которых поток простаивает (ждет соединения или события) - такие выборки не считаем
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("socketserver.py", "serve_forever"),
+}
+MAX_STACK_DEPTH = 128
+
+
+class SamplingProfiler:
+    """
+    Статистический профилировщик: фоновый поток с заданной частотой снимает
+    стеки потоков через sys._current_frames() и накапливает их в collapsed-виде.
+    В отличие от cProfile почти не замедляет обработку запросов.
+    """
+
+    def __init__(self, interval: float = 0.01, include_idle: bool = False) -> None:
+        self.interval = interval
+        self.include_idle = include_idle
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._started_at: Optional[float] = None
+        self._sampled_seconds = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None) -> None:
+        if interval is not None:
+            self.interval = max(float(interval), 0.001)
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join()  # type: ignore[union-attr]
+        self._thread = None
+        if self._started_at is not None:
+            self._sampled_seconds += time.monotonic() - self._started_at
+            self._started_at = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self._samples = 0
+            self._sampled_seconds = 0.0
+            if self._started_at is not None:
+                self._started_at = time.monotonic()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = self._samples
+            stacks = len(self._stacks)
+        elapsed = self._sampled_seconds
+        if self._started_at is not None:
+            elapsed += time.monotonic() - self._started_at
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": samples,
+            "unique_stacks": stacks,
+            "seconds": round(elapsed, 3),
+        }
+
+    def collapsed(self) -> str:
+        """Накопленные стеки в формате collapsed stacks: кадр;кадр;... число_выборок"""
+        with self._lock:
+            items = sorted(self._stacks.items())
+        lines = [f"{stack} {count}" for stack, count in items]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self.sample(exclude=own_ident)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Снять один срез стеков всех потоков (кроме exclude)"""
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            stack = self._collapse_frame(frame)
+            if stack is not None:
+                stacks.append(stack)
+
+        with self._lock:
+            self._samples += 1
+            self._stacks.update(stacks)
+
+    def _collapse_frame(self, frame: Any) -> Optional[str]:
+        code = frame.f_code
+        leaf = (os.path.basename(code.co_filename), code.co_name)
+        if not self.include_idle and leaf in IDLE_FRAMES:
+            return None
+
+        labels: List[str] = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            labels.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Снять профиль работающего сервера и сохранить collapsed stacks"
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Адрес сервера")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Длительность записи")
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Период выборки")
+    parser.add_argument("--output", "-o", help="Файл для результата (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    _post_json(
+        f"{base_url}/admin/sampling",
+        {"enabled": True, "reset": True, "interval_ms": args.interval_ms},
+    )
+    try:
+        time.sleep(args.seconds)
+        with urllib.request.urlopen(f"{base_url}/admin/sampling/collapsed") as response:
+            collapsed = response.read().decode("utf-8")
+    finally:
+        _post_json(f"{base_url}/admin/sampling", {"enabled": False})
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(collapsed)
+        print(f"Стеков: {len(collapsed.splitlines())}, сохранено в {args.output}")
+    else:
+        sys.stdout.write(collapsed)
+
+
+def _post_json(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
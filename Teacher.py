@@ -1,6 +1,7 @@
-import re
 from typing import Any, Dict, Optional
 
+from TeacherValidator import EMAIL_PATTERN, TeacherValidator
+
 
 class Teacher:
     def __init__(
@@ -83,19 +84,17 @@ class Teacher:
         administrative_position_str: str = final_administrative_position  # type: ignore
         experience_years_int: int = final_experience_years  # type: ignore
 
-        # Валидация
-        if not self.validate_non_empty_string(first_name_str):
-            raise ValueError("Некорректное имя")
-        if not self.validate_non_empty_string(last_name_str):
-            raise ValueError("Некорректная фамилия")
-        if not self.validate_email(email_str):
-            raise ValueError("Некорректный email")
-        if not self.validate_non_empty_string(academic_degree_str):
-            raise ValueError("Некорректная ученая степень")
-        if not self.validate_non_empty_string(administrative_position_str):
-            raise ValueError("Некорректная должность")
-        if not self.validate_experience_years(experience_years_int):
-            raise ValueError("Некорректный стаж работы")
+        # Валидация: первое нарушенное правило
+        errors = TeacherValidator.errors(
+            first_name_str,
+            last_name_str,
+            email_str,
+            academic_degree_str,
+            administrative_position_str,
+            experience_years_int,
+        )
+        if errors:
+            raise ValueError(errors[0])
 
         # Устанавливаем атрибуты
         self.__first_name: str = first_name_str
@@ -107,8 +106,7 @@ class Teacher:
 
     @staticmethod
     def validate_email(email: str) -> bool:
-        pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-        return isinstance(email, str) and re.match(pattern, email) is not None
+        return isinstance(email, str) and EMAIL_PATTERN.match(email) is not None
 
     @staticmethod
     def validate_non_empty_string(value: str) -> bool:
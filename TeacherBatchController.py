@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from BaseTeacherRepository import BaseTeacherRepository
+from TeacherDBAdapter import TeacherDBAdapter
+from TeacherValidator import TeacherValidator
+
+
+class TeacherBatchController:
+    """
+    Контроллер для пакетных операций (например, импорт сотрудников кафедры).
+    Проверяет все операции заранее и применяет их одним вызовом репозитория.
+    """
+
+    ACTIONS = ("create", "update", "delete")
+
+    def __init__(self, repository: Optional[BaseTeacherRepository] = None) -> None:
+        self.repository: BaseTeacherRepository = repository or TeacherDBAdapter()
+
+    def apply_batch(self, operations: Any) -> Dict[str, Any]:
+        """
+        Принимает список операций вида {"op": "create" | "update" | "delete", "id", "data"}.
+        Возвращает словарь с ключами: success (bool), message (str), results (list).
+        """
+        if not isinstance(operations, list) or not operations:
+            return {
+                "success": False,
+                "message": "Ожидается непустой список операций",
+                "results": [],
+            }
+
+        prepared: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        seen_emails = set()
+
+        for index, operation in enumerate(operations):
+            error, prepared_operation = self._prepare_operation(operation)
+            # Данные есть у create и update после успешной проверки
+            data = prepared_operation.get("data") if prepared_operation is not None else None
+            if isinstance(data, dict):
+                email = data["email"]
+                if email in seen_emails:
+                    error = f"Email {email} повторяется в пакете"
+                seen_emails.add(email)
+
+            if error is not None or prepared_operation is None:
+                errors.append({"index": index, "success": False, "message": error})
+            else:
+                prepared.append(prepared_operation)
+
+        if errors:
+            return {
+                "success": False,
+                "message": f"Пакет не прошел проверку: ошибок {len(errors)}",
+                "results": errors,
+            }
+
+        results = self.repository.apply_batch(prepared)
+        for index, result in enumerate(results):
+            result["index"] = index
+
+        if not all(result["success"] for result in results):
+            return {"success": False, "message": "Пакет не применен", "results": results}
+
+        return {
+            "success": True,
+            "message": f"Пакет применен: операций {len(results)}",
+            "results": results,
+        }
+
+    def _prepare_operation(
+        self, operation: Any
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Проверить одну операцию и привести ее к виду, ожидаемому репозиторием"""
+        if not isinstance(operation, dict):
+            return "Операция должна быть объектом", None
+
+        action = operation.get("op")
+        if action not in self.ACTIONS:
+            return f"Неизвестная операция: {action}", None
+
+        prepared: Dict[str, Any] = {"op": action}
+
+        if action != "create":
+            teacher_id = operation.get("id")
+            if not isinstance(teacher_id, int) or teacher_id <= 0:
+                return "Некорректный идентификатор", None
+            prepared["id"] = teacher_id
+
+        if action == "delete":
+            return None, prepared
+
+        payload = operation.get("data")
+        if not isinstance(payload, dict):
+            return "Отсутствуют данные преподавателя", None
+
+        missing = TeacherValidator.missing_fields(payload)
+        if missing:
+            return f"Отсутствуют обязательные поля: {', '.join(missing)}", None
+
+        errors, teacher = TeacherValidator.validate(payload)
+        if errors:
+            return "; ".join(errors), None
+
+        prepared["data"] = teacher
+        return None, prepared
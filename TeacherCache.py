@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 30.0  # секунды
+
+# Ключ кэша: кортеж с видом значения первым элементом, например ("page", k, n, поля)
+CacheKey = Tuple[Any, ...]
+# Запись кэша: срок годности, значение и id преподавателей, от которых оно зависит
+_Entry = Tuple[float, Any, Tuple[int, ...]]
+
+
+class TeacherCache:
+    """
+    LRU-кэш с ограничением числа записей и временем жизни (TTL).
+    Каждое значение помечено id преподавателей, из которых оно построено,
+    поэтому изменение одной записи удаляет только зависящие от нее значения.
+    Потокобезопасен: все операции под одной блокировкой. Поколение (generation) растет при
+    каждой инвалидации: значение, прочитанное до нее, не попадет в кэш устаревшим.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._keys_by_id: Dict[int, Set[CacheKey]] = {}
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        """Значение по ключу (default - нет в кэше или срок истек)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self, key: CacheKey, value: Any, ids: Iterable[int] = (), generation: Optional[int] = None
+    ) -> None:
+        """
+        Сохранить значение; ids - преподаватели, при изменении которых оно устаревает.
+        generation - поколение на момент чтения из хранилища: если с тех пор была
+        инвалидация, значение не сохраняется.
+        """
+        ids = tuple(ids)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + self.ttl, value, ids)
+            for id_teacher in ids:
+                self._keys_by_id.setdefault(id_teacher, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def items(self) -> List[Tuple[CacheKey, Any]]:
+        """Снимок пар (ключ, значение) без учета срока годности и без влияния на статистику"""
+        with self._lock:
+            return [(key, entry[1]) for key, entry in self._entries.items()]
+
+    def invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            self.generation += 1
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_ids(self, ids: Iterable[int]) -> None:
+        """Удалить все значения, построенные из записей с этими id"""
+        with self._lock:
+            self.generation += 1
+            for id_teacher in ids:
+                for key in list(self._keys_by_id.get(id_teacher, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[CacheKey, Any], bool]) -> None:
+        """Удалить значения, для которых predicate(ключ, значение) истинно"""
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, entry in self._entries.items() if predicate(key, entry[1])]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_id.clear()
+
+    def _remove(self, key: CacheKey) -> None:
+        _, _, ids = self._entries.pop(key)
+        for id_teacher in ids:
+            keys = self._keys_by_id.get(id_teacher)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_id[id_teacher]
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики кэша для метрик и отладки"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio(), 4),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,111 @@
+import json
+import select
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import psycopg2
+import psycopg2.extensions
+
+from TeacherRepDB import CHANGES_CHANNEL
+
+POLL_TIMEOUT = 1.0  # секунды: как часто поток проверяет флаг остановки
+RECONNECT_DELAY_MAX = 30.0  # секунды: предел паузы между попытками переподключения
+
+# Подписчик получает операцию (insert/update/delete/reset) и id измененных записей
+ChangeCallback = Callable[[str, Sequence[int]], None]
+
+
+class TeacherChangeListener:
+    """
+    Поток, который слушает уведомления об изменениях таблицы teachers (LISTEN на отдельном
+    соединении) и передает их подписчикам, например TeacherRepCached.apply_change.
+    Так изменения из других процессов сбрасывают локальные кэши за миллисекунды.
+    Уведомления, отправленные пока соединения не было, потеряны, поэтому после
+    каждого (пере)подключения подписчики получают "reset".
+    """
+
+    def __init__(
+        self, connection_params: Dict[str, Any], channel: str = CHANGES_CHANNEL
+    ) -> None:
+        self.connection_params = connection_params
+        self.channel = channel
+        self._callbacks: List[ChangeCallback] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Статистика для мониторинга
+        self.is_listening = False
+        self.notifications_total = 0
+        self.reconnects_total = 0
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        self._callbacks.append(callback)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="teacher-change-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        delay = POLL_TIMEOUT
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                print(f"Ошибка прослушивания канала {self.channel}: {e}")
+            if self.is_listening:
+                # Соединение было установлено - паузы между попытками начинаются сначала
+                delay = POLL_TIMEOUT
+            self.is_listening = False
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+            self.reconnects_total += 1
+
+    def _listen(self) -> None:
+        """Подключиться, подписаться на канал и разбирать уведомления до остановки"""
+        connection = psycopg2.connect(**self.connection_params)
+        try:
+            connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+            self.is_listening = True
+            # Что менялось до подписки, неизвестно
+            self._dispatch("reset", ())
+
+            while not self._stop.is_set():
+                if select.select([connection], [], [], POLL_TIMEOUT) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    self.notifications_total += 1
+                    self._handle(notify.payload)
+        finally:
+            connection.close()
+
+    def _handle(self, payload: str) -> None:
+        try:
+            change = json.loads(payload)
+            operation = change["op"]
+            ids = [int(id_teacher) for id_teacher in change.get("ids") or ()]
+        except (ValueError, KeyError, TypeError):
+            print(f"Некорректное уведомление в канале {self.channel}: {payload}")
+            operation, ids = "reset", []
+        self._dispatch(operation, ids)
+
+    def _dispatch(self, operation: str, ids: Sequence[int]) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(operation, ids)
+            except Exception as e:
+                print(f"Ошибка обработки изменения {operation} {list(ids)}: {e}")
@@ -0,0 +1,252 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from TeacherIndex import prefix_bounds
+from TeacherSortSpec import collation_key
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # NumPy нужен только колоночному движку
+        np = None
+
+# Поля с небольшим числом значений хранятся кодами категорий (коды в порядке сортировки значений)
+CATEGORY_FIELDS = ("academic_degree", "administrative_position")
+# Текстовые поля остаются списками строк, ключи сортировки для них вычисляются по требованию
+TEXT_FIELDS = ("first_name", "last_name", "email")
+
+
+def _none_first(value: Any) -> Tuple[bool, Any]:
+    return value is not None, value
+
+
+def _text_value(value: Any) -> Any:
+    return "" if value is None else value
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class TeacherColumns:
+    """
+    Колоночное представление записей для аналитических запросов по большим наборам.
+    Маски - булевы массивы NumPy; методы масок совпадают с TeacherIndex, поэтому фильтры
+    декоратора (index_mask) вычисляются векторно без изменений.
+    Словари собираются только для записей, которые действительно возвращаются.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]) -> None:
+        if np is None:
+            raise RuntimeError("Для колоночного движка нужен NumPy")
+        rows = rows if isinstance(rows, list) else list(rows)
+        self._size = len(rows)
+
+        # Пустой (None) стаж в фильтрах и сортировке считается нулевым, как в TeacherIndex;
+        # маска известных значений нужна, чтобы вернуть такие записи без изменений
+        experience = [row.get("experience_years", 0) for row in rows]
+        self._experience_known = np.fromiter(
+            (value is not None for value in experience), dtype=bool, count=self._size
+        )
+        self._experience_complete = bool(self._experience_known.all())
+        self._numeric: Dict[str, Any] = {
+            "id_teacher": np.fromiter(
+                (row["id_teacher"] for row in rows), dtype=np.int32, count=self._size
+            ),
+            "experience_years": np.fromiter(
+                (value or 0 for value in experience), dtype=np.int32, count=self._size
+            ),
+        }
+
+        self._categories: Dict[str, List[Any]] = {}
+        self._codes: Dict[str, Any] = {}
+        for field in CATEGORY_FIELDS:
+            values = [row.get(field) for row in rows]
+            # None (старые записи без значения) - отдельная категория перед строками
+            categories = sorted(set(values), key=_none_first)
+            lookup = {value: code for code, value in enumerate(categories)}
+            self._categories[field] = categories
+            self._codes[field] = np.fromiter(
+                (lookup[value] for value in values), dtype=np.int32, count=self._size
+            )
+
+        self._text: Dict[str, List[str]] = {
+            field: [_text_value(row.get(field)) for row in rows] for field in TEXT_FIELDS
+        }
+
+        # Ключи сравнения фамилий по возрастанию: префикс - диапазон searchsorted
+        surnames = np.array([collation_key(value) for value in self._text["last_name"]], dtype=str)
+        self._surname_order = np.argsort(surnames, kind="stable")
+        self._surnames_sorted = surnames[self._surname_order]
+
+        # Ключи сортировки по фамилии (TeacherSorter.by_surname) - сразу
+        sorted_codes = np.zeros(self._size, dtype=np.int64)
+        if self._size:
+            changes = self._surnames_sorted[1:] != self._surnames_sorted[:-1]
+            sorted_codes[1:] = np.cumsum(changes)
+        surname_codes = np.empty(self._size, dtype=np.int64)
+        surname_codes[self._surname_order] = sorted_codes
+        self._sort_codes: Dict[Tuple[str, Any], Any] = {("last_name", collation_key): surname_codes}
+
+    def __len__(self) -> int:
+        return self._size
+
+    # Маски (интерфейс как у TeacherIndex)
+
+    def all_mask(self) -> Any:
+        return np.ones(self._size, dtype=bool)
+
+    def mask_equals(self, field: str, *values: Any) -> Any:
+        """Записи, у которых field равно одному из values"""
+        if field in self._codes:
+            lookup = {value: code for code, value in enumerate(self._categories[field])}
+            codes = [lookup[value] for value in values if value in lookup]
+            return np.isin(self._codes[field], codes)
+        return np.isin(self._numeric[field], values)
+
+    def mask_range(self, field: str, low: Any = None, high: Any = None) -> Any:
+        """Записи с low <= field <= high (границы None - без ограничения)"""
+        column = self._numeric[field]
+        mask = self.all_mask()
+        if low is not None:
+            mask &= column >= low
+        if high is not None:
+            mask &= column <= high
+        return mask
+
+    def mask_prefix(self, prefix: str) -> Any:
+        """Записи, фамилия которых (в верхнем регистре) начинается с prefix"""
+        low_key, high_key, excluded = prefix_bounds(prefix)
+        low = np.searchsorted(self._surnames_sorted, low_key, side="left")
+        high = np.searchsorted(self._surnames_sorted, high_key, side="right")
+        if excluded is not None:
+            high = min(high, np.searchsorted(self._surnames_sorted, excluded, side="left"))
+        mask = np.zeros(self._size, dtype=bool)
+        mask[self._surname_order[low:high]] = True
+        return mask
+
+    def select(self, filters: Sequence[Any]) -> Tuple[Any, List[Any]]:
+        """Маска по фильтрам с index_mask (AND) и список фильтров для построчной проверки"""
+        mask = self.all_mask()
+        residual = []
+        for filter_obj in filters:
+            filter_mask = filter_obj.index_mask(self)
+            if filter_mask is None:
+                residual.append(filter_obj)
+            else:
+                mask &= filter_mask
+        return mask, residual
+
+    @staticmethod
+    def count(mask: Any) -> int:
+        return int(np.count_nonzero(mask))
+
+    # Сортировка
+
+    def _sort_key_codes(self, field: str, transform: Optional[Callable[[Any], Any]]) -> Any:
+        """
+        Целочисленные ключи сортировки поля (неотрицательные, равным значениям - равные ключи)
+        или None, если поле или преобразование не поддерживаются.
+        """
+        cache_key = (field, transform)
+        if cache_key in self._sort_codes:
+            return self._sort_codes[cache_key]
+
+        if field in self._numeric:
+            if transform is not None:
+                return None
+            column = self._numeric[field].astype(np.int64)
+            codes = column - column.min() if self._size else column
+        elif field in self._codes:
+            # Как в SortKey: нет значения - сортируется как пустая строка
+            categories = [_text_value(value) for value in self._categories[field]]
+            if transform is not None:
+                categories = [transform(value) for value in categories]
+            # Ранги категорий в порядке сортировки (после преобразования значения могут совпасть)
+            ranks = {value: rank for rank, value in enumerate(sorted(set(categories)))}
+            table = np.array([ranks[value] for value in categories], dtype=np.int64)
+            codes = table[self._codes[field]] if len(table) else self._codes[field]
+        elif field in self._text:
+            values = self._text[field]
+            if transform is not None:
+                values = [transform(value) for value in values]
+            _, inverse = np.unique(np.array(values, dtype=str), return_inverse=True)
+            codes = inverse.astype(np.int64).reshape(-1)
+        else:
+            return None
+
+        self._sort_codes[cache_key] = codes
+        return codes
+
+    def positions_sorted(
+        self, mask: Any, keys: Sequence[Any], limit: Optional[int] = None
+    ) -> Optional[Any]:
+        """
+        Позиции записей из маски в порядке сортировки по keys (SortKey: поле, преобразование,
+        направление; первый ключ - главный). Равные записи остаются в порядке хранилища,
+        как у устойчивой sorted(). Для одного ключа и limit - частичный отбор np.partition.
+        None - поле или преобразование не поддерживаются.
+        """
+        positions = np.flatnonzero(mask)
+        columns = []
+        for key in keys:
+            codes = self._sort_key_codes(key.field, key.transform)
+            if codes is None:
+                return None
+            selected = codes[positions]
+            columns.append(codes.max() - selected if key.reverse and len(selected) else selected)
+
+        if len(columns) > 1:
+            # lexsort устойчива, главный ключ у нее последний
+            order = np.lexsort(columns[::-1])
+            return positions[order if limit is None else order[: max(limit, 0)]]
+
+        # Ключ и позиция в одном int64: значения уникальны, порядок устойчив
+        composite = columns[0] * max(self._size, 1) + positions
+        if limit is not None and limit < len(composite):
+            if limit <= 0:
+                return positions[:0]
+            composite = np.partition(composite, limit - 1)[:limit]
+        composite.sort()
+        return composite % max(self._size, 1)
+
+    @staticmethod
+    def positions_in_order(mask: Any, limit: Optional[int] = None) -> Any:
+        """Позиции записей из маски в порядке хранилища (первые limit)"""
+        positions = np.flatnonzero(mask)
+        return positions if limit is None else positions[: max(limit, 0)]
+
+    # Сборка записей
+
+    def rows_at(self, positions: Any) -> List[Dict[str, Any]]:
+        """Словари записей в указанных позициях"""
+        positions = np.asarray(positions, dtype=np.int64)
+        ids = self._numeric["id_teacher"][positions].tolist()
+        experience = self._numeric["experience_years"][positions].tolist()
+        if not self._experience_complete:
+            known = self._experience_known[positions].tolist()
+            experience = [value if ok else None for value, ok in zip(experience, known)]
+        degrees = self._categories["academic_degree"]
+        degree_codes = self._codes["academic_degree"][positions].tolist()
+        job_titles = self._categories["administrative_position"]
+        job_codes = self._codes["administrative_position"][positions].tolist()
+        first_names = self._text["first_name"]
+        last_names = self._text["last_name"]
+        emails = self._text["email"]
+        return [
+            {
+                "id_teacher": ids[i],
+                "first_name": first_names[position],
+                "last_name": last_names[position],
+                "email": emails[position],
+                "academic_degree": degrees[degree_codes[i]],
+                "administrative_position": job_titles[job_codes[i]],
+                "experience_years": experience[i],
+            }
+            for i, position in enumerate(positions.tolist())
+        ]
+
+    def rows_for(self, mask: Any) -> List[Dict[str, Any]]:
+        """Записи из маски в порядке хранилища"""
+        return self.rows_at(np.flatnonzero(mask))
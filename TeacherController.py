@@ -1,14 +1,17 @@
-from typing import Any, Dict, Optional
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
 
-from BaseTeacherRepository import BaseTeacherRepository
+from BaseTeacherRepository import TEACHER_FIELDS, BaseTeacherRepository
 from TeacherDBAdapter import TeacherDBAdapter
 from TeacherRepDecorator import (
     AcademicDegreeFilter,
     ExperienceFilter,
     SurnameFilter,
     TeacherRepDecorator,
-    TeacherSorter,
 )
+from TeacherSortSpec import SortSpec
 
 
 class TeacherController:
@@ -17,6 +20,19 @@ class TeacherController:
     Вся прикладная логика вынесена сюда и использует репозиторий как модель.
     """
 
+    EXPORT_FIELDS = ("id_teacher",) + TEACHER_FIELDS
+    # Поля краткого списка и колонки хранилища, из которых они строятся
+    SHORT_FIELD_SOURCES = {
+        "id": "id_teacher",
+        "last_name": "last_name",
+        "first_initial": "first_name",
+        "email": "email",
+        "academic_degree": "academic_degree",
+        "administrative_position": "administrative_position",
+        "experience_years": "experience_years",
+    }
+    EXPORT_FORMATS = ("ndjson", "csv")
+
     def __init__(self, repository: Optional[BaseTeacherRepository] = None) -> None:
         # По умолчанию работаем с БД через адаптер
         self.repository: BaseTeacherRepository = repository or TeacherDBAdapter()
@@ -24,7 +40,7 @@ class TeacherController:
     def _apply_filters(self, filters: Dict[str, Any], sort_by: Optional[str]) -> BaseTeacherRepository:
         """
         Оборачивает репозиторий декоратором и применяет фильтры/сортировку,
-        если они указаны.
+        если они указаны. Некорректная сортировка - ValueError.
         """
         need_decorator = bool(filters) or sort_by is not None
         if not need_decorator:
@@ -49,19 +65,9 @@ class TeacherController:
             if surname_prefix:
                 decorated.add_filter(SurnameFilter(surname_prefix))
 
-        # Сортировка
+        # Сортировка: одно поле или несколько через запятую, "-" перед полем - по убыванию
         if sort_by:
-            sorters = {
-                "last_name": TeacherSorter.by_surname(),
-                "experience_years": TeacherSorter.by_experience(),
-                "academic_degree": TeacherSorter.by_academic_degree(),
-                "administrative_position": TeacherSorter.by_position(),
-                "email": TeacherSorter.by_email(),
-                "id_teacher": TeacherSorter.by_id(),
-            }
-            sorter = sorters.get(sort_by)
-            if sorter:
-                decorated.set_sorter(sorter)
+            decorated.set_sorter(SortSpec.parse(sort_by))
 
         return decorated
 
@@ -71,52 +77,44 @@ class TeacherController:
         page: int = 1,
         filters: Optional[Dict[str, Any]] = None,
         sort_by: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
         """
         Вернуть сокращенный список преподавателей для главной таблицы.
         Возвращает метаданные пагинации, чтобы фронтенд мог строить страницы.
+        fields ограничивает набор полей элементов (и колонок, читаемых из хранилища).
         """
         page = max(page, 1)
         filters = filters or {}
 
+        short_fields = list(self.SHORT_FIELD_SOURCES)
+        source_fields = None
+        if fields is not None:
+            unknown = set(fields) - set(self.SHORT_FIELD_SOURCES)
+            if unknown:
+                raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+            short_fields = [field for field in self.SHORT_FIELD_SOURCES if field in fields]
+            source_fields = [self.SHORT_FIELD_SOURCES[field] for field in short_fields]
+
         repo_to_use = self._apply_filters(filters, sort_by)
 
         total = repo_to_use.get_count()
 
         if page_size is None or page_size <= 0:
             # Без явной пагинации возвращаем полный список
-            data_slice = repo_to_use.read_all()
+            data_slice = repo_to_use.read_all(source_fields)
             page_size = total if total > 0 else 1
         else:
             # Используем пагинацию репозитория если есть
             if hasattr(repo_to_use, "get_k_n_short_list"):
-                data_slice = repo_to_use.get_k_n_short_list(page_size, page)
+                data_slice = repo_to_use.get_k_n_short_list(page_size, page, source_fields)
             else:
-                all_data = repo_to_use.read_all()
+                all_data = repo_to_use.read_all(source_fields)
                 start = (page - 1) * page_size
                 end = start + page_size
                 data_slice = all_data[start:end]
 
-        short_list = []
-        for teacher in data_slice:
-            first_name_value = teacher.get("first_name", "")
-            # Репозитории с коротким списком уже возвращают инициалы, поэтому проверяем хвост
-            first_initial = (
-                first_name_value
-                if first_name_value.endswith(".")
-                else f"{first_name_value[:1]}."
-            )
-            short_list.append(
-                {
-                    "id": teacher.get("id_teacher"),
-                    "last_name": teacher.get("last_name"),
-                    "first_initial": first_initial,
-                    "email": teacher.get("email"),
-                    "academic_degree": teacher.get("academic_degree"),
-                    "administrative_position": teacher.get("administrative_position"),
-                    "experience_years": teacher.get("experience_years"),
-                }
-            )
+        short_list = [self._short_item(teacher, short_fields) for teacher in data_slice]
 
         return {
             "items": short_list,
@@ -125,6 +123,82 @@ class TeacherController:
             "page_size": page_size,
         }
 
-    def get_teacher(self, teacher_id: int) -> Optional[Dict[str, Any]]:
-        """Получить полные данные преподавателя по id."""
-        return self.repository.get_by_id(teacher_id)
+    def _short_item(self, teacher: Dict[str, Any], short_fields: List[str]) -> Dict[str, Any]:
+        """Построить элемент краткого списка только из запрошенных полей"""
+        item: Dict[str, Any] = {}
+        for field in short_fields:
+            if field == "first_initial":
+                first_name_value = teacher.get("first_name", "")
+                # Репозитории с коротким списком уже возвращают инициалы, поэтому проверяем хвост
+                item[field] = (
+                    first_name_value
+                    if first_name_value.endswith(".")
+                    else f"{first_name_value[:1]}."
+                )
+            else:
+                item[field] = teacher.get(self.SHORT_FIELD_SOURCES[field])
+        return item
+
+    def get_teacher(
+        self, teacher_id: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Получить данные преподавателя по id (fields - только указанные поля)."""
+        return self.repository.get_by_id(teacher_id, fields)
+
+    def get_teachers(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Получить полные данные нескольких преподавателей одним запросом к репозиторию.
+        Порядок items совпадает с порядком ids, ненайденные id перечислены в missing.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        items = self.repository.get_many(unique_ids, fields)
+        found = {teacher["id_teacher"] for teacher in items}
+        return {
+            "items": items,
+            "missing": [teacher_id for teacher_id in unique_ids if teacher_id not in found],
+        }
+
+    def export_teachers(
+        self,
+        export_format: str = "ndjson",
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Потоковая выгрузка преподавателей построчно (NDJSON или CSV с заголовком).
+        Строки берутся из итератора репозитория, весь набор в памяти не собирается.
+        Формат и сортировка проверяются сразу, до начала выгрузки (ValueError).
+        """
+        if export_format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Неподдерживаемый формат выгрузки: {export_format}")
+
+        repo_to_use = self._apply_filters(filters or {}, sort_by)
+        return self._export_lines(repo_to_use.iter_all(), export_format)
+
+    def _export_lines(
+        self, teachers: Iterator[Mapping[str, Any]], export_format: str
+    ) -> Iterator[str]:
+        """Строки выгрузки в выбранном формате по мере чтения записей"""
+        if export_format == "ndjson":
+            for teacher in teachers:
+                row = {field: teacher.get(field) for field in self.EXPORT_FIELDS}
+                yield json.dumps(row, ensure_ascii=False) + "\n"
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.EXPORT_FIELDS)
+        yield self._drain(buffer)
+        for teacher in teachers:
+            writer.writerow([teacher.get(field) for field in self.EXPORT_FIELDS])
+            yield self._drain(buffer)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> str:
+        """Забрать накопленный текст из буфера и очистить его"""
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
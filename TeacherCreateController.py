@@ -1,8 +1,8 @@
 from typing import Any, Dict, Optional
 
-from BaseTeacherRepository import BaseTeacherRepository
-from Teacher import Teacher
+from BaseTeacherRepository import TEACHER_FIELDS, BaseTeacherRepository
 from TeacherDBAdapter import TeacherDBAdapter
+from TeacherValidator import TeacherValidator
 
 
 class TeacherCreateController:
@@ -19,16 +19,7 @@ class TeacherCreateController:
         Валидирует входные данные и создает запись.
         Возвращает словарь с ключами: success (bool), message (str), id (int | None).
         """
-        required_fields = [
-            "first_name",
-            "last_name",
-            "email",
-            "academic_degree",
-            "administrative_position",
-            "experience_years",
-        ]
-
-        missing = [f for f in required_fields if f not in payload or payload[f] in (None, "")]
+        missing = TeacherValidator.missing_fields(payload)
         if missing:
             return {
                 "success": False,
@@ -36,34 +27,13 @@ class TeacherCreateController:
                 "id": None,
             }
 
-        # Приведение типов и базовая валидация
-        try:
-            experience = int(payload.get("experience_years"))
-        except (TypeError, ValueError):
-            return {"success": False, "message": "Стаж должен быть целым числом", "id": None}
-
-        try:
-            # Используем доменную модель для проверки корректности полей
-            Teacher(
-                first_name=str(payload.get("first_name")),
-                last_name=str(payload.get("last_name")),
-                email=str(payload.get("email")),
-                academic_degree=str(payload.get("academic_degree")),
-                administrative_position=str(payload.get("administrative_position")),
-                experience_years=experience,
-            )
-        except Exception as exc:
-            return {"success": False, "message": str(exc), "id": None}
+        # Проверка по правилам модели Teacher без создания объекта
+        errors, teacher = TeacherValidator.validate(payload)
+        if errors:
+            return {"success": False, "message": "; ".join(errors), "id": None}
 
         # Делегируем создание в репозиторий
-        new_id = self.repository.add_teacher(
-            payload.get("first_name"),
-            payload.get("last_name"),
-            payload.get("email"),
-            payload.get("academic_degree"),
-            payload.get("administrative_position"),
-            experience,
-        )
+        new_id = self.repository.add_teacher(*(teacher[field] for field in TEACHER_FIELDS))
 
         if new_id == -1:
             return {"success": False, "message": "Не удалось добавить преподавателя", "id": None}
@@ -1,7 +1,8 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set
 
 from BaseTeacherRepository import BaseTeacherRepository
 from TeacherRepDB import TeacherRepDB
+from TeacherSortSpec import SortSpec
 
 
 class TeacherDBAdapter(BaseTeacherRepository):
@@ -22,21 +23,46 @@ class TeacherDBAdapter(BaseTeacherRepository):
         """
         pass
 
-    def read_all(self) -> List[Dict[str, Any]]:
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """Чтение всех преподавателей из БД"""
-        return self.teacher_rep_db.read_all()
+        return self.teacher_rep_db.read_all(fields)
 
-    def write_all(self, data: List[Dict[str, Any]]) -> str:
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        """Потоковое чтение преподавателей через серверный курсор БД"""
+        return self.teacher_rep_db.iter_all(chunk_size)
+
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
         """Запись всех преподавателей в БД (полная перезапись)"""
         return self.teacher_rep_db.write_all(data)
 
-    def get_by_id(self, id_teacher: int) -> Optional[Dict[str, Any]]:
+    def filter_rows_sorted(
+        self, filters: Sequence[Any], spec: Optional[SortSpec], limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Сортировка декоратора на стороне БД: спецификация переводится в ORDER BY.
+        Фильтры декоратора проверяются в памяти, поэтому с ними возвращается None.
+        """
+        if filters or spec is None:
+            return None
+        return self.teacher_rep_db.read_sorted(spec.to_sql(), limit)
+
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Получение преподавателя по ID (оптимизированная версия для БД)"""
-        return self.teacher_rep_db.get_by_id(id_teacher)
+        return self.teacher_rep_db.get_by_id(id_teacher, fields)
 
-    def get_k_n_short_list(self, k: int, n: int) -> List[Dict[str, Any]]:
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Получение нескольких преподавателей одним запросом к БД"""
+        return self.teacher_rep_db.get_many(ids, fields)
+
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Получение короткого списка преподавателей (пагинация на уровне БД)"""
-        return self.teacher_rep_db.get_k_n_short_list(k, n)
+        return self.teacher_rep_db.get_k_n_short_list(k, n, fields)
 
     def sort_by_field(self, field: str) -> str:
         """
@@ -60,6 +86,14 @@ class TeacherDBAdapter(BaseTeacherRepository):
             first_name, last_name, email, academic_degree, administrative_position, experience_years
         )
 
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        """Массовое добавление через COPY"""
+        return self.teacher_rep_db.add_many(teachers)
+
+    def existing_emails(self, emails: Sequence[str]) -> Set[str]:
+        """Адреса из emails, которые уже есть в базе"""
+        return self.teacher_rep_db.existing_emails(emails)
+
     def update_teacher(
         self,
         id_teacher: int,
@@ -89,6 +123,10 @@ class TeacherDBAdapter(BaseTeacherRepository):
         """Получение общего количества преподавателей из БД"""
         return self.teacher_rep_db.get_count()
 
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Пакетное применение операций в одной транзакции БД"""
+        return self.teacher_rep_db.apply_batch(operations)
+
     def clear_table_completely(self) -> bool:
         """Очистка таблицы"""
         return self.teacher_rep_db.clear_table_completely()
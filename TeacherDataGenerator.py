@@ -0,0 +1,256 @@
+import argparse
+import json
+import random
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import yaml
+
+from BaseTeacherRepository import BaseTeacherRepository
+
+# fmt: off
+MALE_FIRST_NAMES = (
+    "Александр", "Алексей", "Андрей", "Антон", "Артем", "Борис", "Вадим", "Валерий",
+    "Василий", "Виктор", "Владимир", "Геннадий", "Григорий", "Денис", "Дмитрий", "Евгений",
+    "Иван", "Игорь", "Илья", "Кирилл", "Константин", "Леонид", "Максим", "Михаил",
+    "Николай", "Олег", "Павел", "Петр", "Роман", "Сергей", "Станислав", "Юрий",
+)
+FEMALE_FIRST_NAMES = (
+    "Александра", "Алла", "Анастасия", "Анна", "Валентина", "Вера", "Виктория", "Галина",
+    "Дарья", "Екатерина", "Елена", "Жанна", "Зоя", "Инна", "Ирина", "Лариса",
+    "Любовь", "Людмила", "Марина", "Мария", "Надежда", "Наталья", "Нина", "Оксана",
+    "Ольга", "Светлана", "Софья", "Тамара", "Татьяна", "Юлия", "Яна", "Ксения",
+)
+# Мужские формы фамилий, примерно в порядке распространенности
+SURNAMES = (
+    "Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов",
+    "Новиков", "Федоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семенов", "Егоров",
+    "Павлов", "Козлов", "Степанов", "Николаев", "Орлов", "Андреев", "Макаров", "Никитин",
+    "Захаров", "Зайцев", "Соловьев", "Борисов", "Яковлев", "Григорьев", "Романов", "Воробьев",
+    "Сергеев", "Кузьмин", "Фролов", "Александров", "Дмитриев", "Королев", "Гусев", "Киселев",
+    "Ильин", "Максимов", "Поляков", "Сорокин", "Виноградов", "Ковалев", "Белов", "Медведев",
+    "Антонов", "Тарасов", "Жуков", "Баранов", "Филиппов", "Комаров", "Давыдов", "Беляев",
+    "Герасимов", "Богданов", "Осипов", "Сидоров", "Матвеев", "Титов", "Марков", "Миронов",
+    "Крылов", "Куликов", "Карпов", "Власов", "Мельников", "Денисов", "Гаврилов", "Тихонов",
+    "Казаков", "Афанасьев", "Данилов", "Савельев", "Тимофеев", "Фомин", "Чернов", "Абрамов",
+    "Мартынов", "Ефимов", "Федотов", "Щербаков", "Назаров", "Калинин", "Исаев", "Чернышев",
+    "Быков", "Маслов", "Родионов", "Коновалов", "Лазарев", "Воронин", "Климов", "Филатов",
+    "Пономарев", "Голубев", "Кудрявцев", "Прохоров", "Наумов", "Потапов", "Журавлев",
+    "Овчинников", "Трофимов", "Леонов", "Соболев", "Ермаков", "Колесников", "Гончаров",
+    "Емельянов", "Никифоров", "Грачев", "Котов", "Гришин", "Ефремов", "Архипов", "Громов",
+    "Кириллов", "Малышев", "Панов", "Моисеев", "Румянцев", "Акимов", "Кондратьев", "Бирюков",
+    "Горбунов", "Анисимов", "Еремин", "Тихомиров", "Галкин", "Лукьянов", "Михеев", "Скворцов",
+    "Юдин", "Белоусов", "Нестеров", "Симонов", "Прокофьев", "Харитонов", "Князев", "Цветков",
+    "Левин", "Митрофанов", "Воронцов", "Аксенов", "Софронов", "Мальцев", "Логинов", "Горшков",
+    "Савин", "Краснов", "Майоров", "Демидов", "Елисеев", "Рыбаков", "Сафонов", "Плотников",
+    "Ёлкин", "Вишневский", "Островский", "Покровский", "Успенский", "Садовский", "Высоцкий",
+    "Шевченко", "Бондаренко", "Коваленко", "Кравченко", "Ткаченко", "Черных", "Белых", "Седых",
+)
+# fmt: on
+FEMININE_ENDINGS = (
+    ("ский", "ская"),
+    ("цкий", "цкая"),
+    ("ов", "ова"),
+    ("ев", "ева"),
+    ("ёв", "ёва"),
+    ("ин", "ина"),
+)
+
+# Распределения: (значение, вес)
+DEGREES = (("Кандидат наук", 52), ("Без степени", 33), ("Доктор наук", 15))
+POSITIONS_BY_DEGREE = {
+    "Без степени": (
+        ("Ассистент", 45), ("Преподаватель", 35), ("Старший преподаватель", 20),
+    ),
+    "Кандидат наук": (
+        ("Старший преподаватель", 30), ("Доцент", 55), ("Зав кафедрой", 10), ("Декан", 5),
+    ),
+    "Доктор наук": (
+        ("Доцент", 10), ("Профессор", 60), ("Зав кафедрой", 20), ("Декан", 10),
+    ),
+}
+# Типичный стаж по должности: (минимум, медианная надбавка)
+EXPERIENCE_BY_POSITION = {
+    "Ассистент": (0, 2),
+    "Преподаватель": (1, 4),
+    "Старший преподаватель": (3, 7),
+    "Доцент": (6, 9),
+    "Профессор": (12, 12),
+    "Зав кафедрой": (12, 12),
+    "Декан": (15, 14),
+}
+MAX_EXPERIENCE = 50
+EMAIL_DOMAINS = (("university.edu", 70), ("mail.ru", 12), ("yandex.ru", 10), ("gmail.com", 8))
+
+# fmt: off
+TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e", "ж": "zh",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts",
+    "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu",
+    "я": "ya",
+})
+# fmt: on
+
+
+def _weighted(pairs: Sequence[Tuple[str, float]]) -> Tuple[List[str], List[float]]:
+    """Значения и накопленные веса для random.choices(cum_weights=...)"""
+    values = [value for value, _ in pairs]
+    return values, list(accumulate(weight for _, weight in pairs))
+
+
+def feminine_surname(surname: str) -> str:
+    for ending, feminine in FEMININE_ENDINGS:
+        if surname.endswith(ending):
+            return surname[: -len(ending)] + feminine
+    return surname  # несклоняемые: Шевченко, Черных
+
+
+def transliterate(value: str) -> str:
+    return value.lower().translate(TRANSLIT)
+
+
+class TeacherDataGenerator:
+    """
+    Детерминированный генератор правдоподобных записей о преподавателях.
+    При одинаковом seed выдает одну и ту же последовательность; email уникальны
+    в пределах генератора. Фамилии распределены по Ципфу, степень, должность
+    и стаж взаимосвязаны (доктора наук чаще профессора и со стажем больше).
+    """
+
+    def __init__(self, seed: int = 42) -> None:
+        self._rng = random.Random(seed)
+        self._index = 0
+        # Вес фамилии ~ 1 / rank^0.9: несколько очень частых и длинный хвост
+        self._surnames, self._surname_weights = _weighted(
+            [(surname, 1 / (rank ** 0.9)) for rank, surname in enumerate(SURNAMES, 1)]
+        )
+        self._degrees, self._degree_weights = _weighted(DEGREES)
+        self._positions = {
+            degree: _weighted(pairs) for degree, pairs in POSITIONS_BY_DEGREE.items()
+        }
+        self._domains, self._domain_weights = _weighted(EMAIL_DOMAINS)
+
+    def generate(self, count: int) -> Iterator[Dict[str, Any]]:
+        """Поток из count записей без id_teacher"""
+        rng = self._rng
+        choices = rng.choices
+        for _ in range(count):
+            self._index += 1
+            is_female = rng.random() < 0.55
+            first_name = rng.choice(FEMALE_FIRST_NAMES if is_female else MALE_FIRST_NAMES)
+            surname = choices(self._surnames, cum_weights=self._surname_weights)[0]
+            last_name = feminine_surname(surname) if is_female else surname
+
+            degree = choices(self._degrees, cum_weights=self._degree_weights)[0]
+            positions, position_weights = self._positions[degree]
+            position = choices(positions, cum_weights=position_weights)[0]
+
+            minimum, median = EXPERIENCE_BY_POSITION[position]
+            # Логнормальный хвост: большинство около медианы, немногие с очень большим стажем
+            experience = min(int(minimum + rng.lognormvariate(0, 0.6) * median), MAX_EXPERIENCE)
+
+            domain = choices(self._domains, cum_weights=self._domain_weights)[0]
+            email = (
+                f"{transliterate(first_name[0])}.{transliterate(last_name)}"
+                f"{self._index}@{domain}"
+            )
+
+            yield {
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "academic_degree": degree,
+                "administrative_position": position,
+                "experience_years": experience,
+            }
+
+    def generate_with_ids(self, count: int, first_id: int = 1) -> Iterator[Dict[str, Any]]:
+        """Поток записей с последовательными id_teacher (для файловых хранилищ)"""
+        for id_teacher, teacher in enumerate(self.generate(count), first_id):
+            yield {"id_teacher": id_teacher, **teacher}
+
+
+def write_json(path: str, teachers: Iterator[Dict[str, Any]]) -> int:
+    """Потоково записать JSON-массив в том же формате, что и TeacherRepJson.write_all"""
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for teacher in teachers:
+            item = json.dumps(teacher, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            f.write(("," if written else "") + "\n  " + item)
+            written += 1
+        f.write("\n]" if written else "]")
+    return written
+
+
+def write_yaml(path: str, teachers: Iterator[Dict[str, Any]], chunk_size: int = 1000) -> int:
+    """
+    Потоково записать YAML-список: элементы выгружаются порциями,
+    а последовательности верхнего уровня можно склеивать как текст.
+    """
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        chunk: List[Dict[str, Any]] = []
+        for teacher in teachers:
+            chunk.append(teacher)
+            if len(chunk) >= chunk_size:
+                _dump_yaml_chunk(chunk, f, dumper)
+                written += len(chunk)
+                chunk = []
+        if chunk or not written:
+            _dump_yaml_chunk(chunk, f, dumper)
+            written += len(chunk)
+    return written
+
+
+def _dump_yaml_chunk(chunk: List[Dict[str, Any]], stream: Any, dumper: Any) -> None:
+    yaml.dump(
+        chunk, stream, Dumper=dumper, allow_unicode=True, default_flow_style=False, indent=2
+    )
+
+
+def write_repository(
+    repository: BaseTeacherRepository,
+    teachers: Iterator[Dict[str, Any]],
+    chunk_size: int = 50_000,
+) -> int:
+    """Записать через add_many порциями (для БД - COPY), не держа весь набор в памяти"""
+    written = 0
+    chunk: List[Dict[str, Any]] = []
+    for teacher in teachers:
+        chunk.append(teacher)
+        if len(chunk) >= chunk_size:
+            written += repository.add_many(chunk)
+            chunk = []
+    if chunk:
+        written += repository.add_many(chunk)
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных преподавателей")
+    parser.add_argument("--backend", choices=("json", "yaml", "db"), default="json")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--path", help="Файл для json/yaml")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    generator = TeacherDataGenerator(args.seed)
+    if args.backend == "json":
+        written = write_json(args.path or "teachers.json", generator.generate_with_ids(args.count))
+    elif args.backend == "yaml":
+        written = write_yaml(args.path or "teachers.yaml", generator.generate_with_ids(args.count))
+    else:
+        from TeacherDBAdapter import TeacherDBAdapter
+
+        repository = TeacherDBAdapter()
+        repository.teacher_rep_db.clear_table_completely()
+        written = write_repository(repository, generator.generate(args.count), args.chunk_size)
+    print(f"Записано преподавателей: {written}")
+
+
+if __name__ == "__main__":
+    main()
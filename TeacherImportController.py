@@ -0,0 +1,178 @@
+import argparse
+import csv
+import json
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from BaseTeacherRepository import BaseTeacherRepository
+from TeacherDBAdapter import TeacherDBAdapter
+from TeacherValidator import TeacherValidator
+
+
+class TeacherImportController:
+    """
+    Контроллер потокового импорта преподавателей из CSV или NDJSON.
+    Строки читаются по одной, проверяются по правилам модели Teacher,
+    а корректные записываются пакетами через add_many репозитория.
+    """
+
+    IMPORT_FORMATS = ("csv", "ndjson")
+    MAX_REPORTED_ERRORS = 1000  # больше ошибок не храним, только считаем
+
+    def __init__(
+        self, repository: Optional[BaseTeacherRepository] = None, chunk_size: int = 5000
+    ) -> None:
+        self.repository: BaseTeacherRepository = repository or TeacherDBAdapter()
+        self.chunk_size = chunk_size
+
+    def import_stream(self, stream: TextIO, import_format: str = "csv") -> Dict[str, Any]:
+        """
+        Импортировать записи из текстового потока.
+        Возвращает словарь: success, imported, failed, errors (номер строки и список ошибок).
+        """
+        if import_format not in self.IMPORT_FORMATS:
+            return {
+                "success": False,
+                "message": f"Неподдерживаемый формат импорта: {import_format}",
+                "imported": 0,
+                "failed": 0,
+                "errors": [],
+            }
+
+        imported = 0
+        failed = 0
+        errors: List[Dict[str, Any]] = []
+        seen_emails = set()
+        chunk: List[Dict[str, Any]] = []
+        chunk_rows: List[int] = []
+
+        def report(row_number: int, row_errors: List[str]) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < self.MAX_REPORTED_ERRORS:
+                errors.append({"row": row_number, "errors": row_errors})
+
+        # Хранилище с уникальным email (БД) сообщает, какие адреса уже заняты
+        existing_emails = getattr(self.repository, "existing_emails", None)
+
+        def flush() -> None:
+            nonlocal imported
+            taken = existing_emails([t["email"] for t in chunk]) if existing_emails else ()
+            batch: List[Dict[str, Any]] = []
+            batch_rows: List[int] = []
+            for teacher, row_number in zip(chunk, chunk_rows):
+                if teacher["email"] in taken:
+                    report(row_number, [f"Email {teacher['email']} уже есть в хранилище"])
+                else:
+                    batch.append(teacher)
+                    batch_rows.append(row_number)
+            if not batch:
+                return
+
+            written = self.repository.add_many(batch)
+            if written == len(batch):
+                imported += written
+                return
+            # Пакет отклонен целиком (например, email успели занять между проверкой и записью):
+            # пишем строки по одной, чтобы ошибка досталась только виноватым
+            for teacher, row_number in zip(batch, batch_rows):
+                if self.repository.add_many([teacher]) == 1:
+                    imported += 1
+                else:
+                    report(row_number, ["Не удалось записать строку в хранилище"])
+
+        for row_number, row, parse_error in self._iter_rows(stream, import_format):
+            if parse_error is not None:
+                report(row_number, [parse_error])
+                continue
+
+            row_errors, teacher = self.validate_row(row)
+            if not row_errors and teacher["email"] in seen_emails:
+                row_errors = [f"Email {teacher['email']} повторяется в файле"]
+            if row_errors:
+                report(row_number, row_errors)
+                continue
+
+            seen_emails.add(teacher["email"])
+            chunk.append(teacher)
+            chunk_rows.append(row_number)
+            if len(chunk) >= self.chunk_size:
+                flush()
+                chunk, chunk_rows = [], []
+
+        if chunk:
+            flush()
+
+        return {
+            "success": failed == 0,
+            "message": f"Импортировано: {imported}, с ошибками: {failed}",
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+        }
+
+    @staticmethod
+    def validate_row(row: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+        """Проверить строку без исключений: вернуть список ошибок и нормализованную запись"""
+        return TeacherValidator.validate(row)
+
+    @staticmethod
+    def _iter_rows(
+        stream: TextIO, import_format: str
+    ) -> Iterator[Tuple[int, Dict[str, Any], Optional[str]]]:
+        """Построчное чтение: (номер строки, данные, ошибка разбора)"""
+        if import_format == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, {}, "Некорректный JSON"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, {}, "Строка должна быть JSON-объектом"
+                continue
+            yield line_number, row, None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Потоковый импорт преподавателей из CSV/NDJSON")
+    parser.add_argument("source", help="Путь к файлу CSV или NDJSON")
+    parser.add_argument("--format", choices=TeacherImportController.IMPORT_FORMATS)
+    parser.add_argument("--backend", choices=("db", "json", "yaml"), default="db")
+    parser.add_argument("--path", help="Файл хранилища для json/yaml")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    import_format = args.format or (
+        "ndjson" if args.source.endswith((".ndjson", ".jsonl")) else "csv"
+    )
+
+    repository: BaseTeacherRepository
+    if args.backend == "json":
+        from TeacherRepJson import TeacherRepJson
+
+        repository = TeacherRepJson(args.path or "teachers.json")
+    elif args.backend == "yaml":
+        from TeacherRepYaml import TeacherRepYaml
+
+        repository = TeacherRepYaml(args.path or "teachers.yaml")
+    else:
+        repository = TeacherDBAdapter()
+
+    controller = TeacherImportController(repository, chunk_size=args.chunk_size)
+    with open(args.source, "r", encoding="utf-8", newline="") as f:
+        result = controller.import_stream(f, import_format)
+
+    print(result["message"])
+    for error in result["errors"]:
+        print(f"  Строка {error['row']}: {'; '.join(error['errors'])}")
+
+
+if __name__ == "__main__":
+    main()
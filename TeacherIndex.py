@@ -0,0 +1,293 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from TeacherRecord import Row
+from TeacherSortSpec import YO_MARKER, collation_key
+
+# Поля с небольшим числом различных значений: для каждого значения хранится битовая маска
+BITMAP_FIELDS = ("academic_degree", "administrative_position", "experience_years")
+# Поля, по которым дополнительно хранится отсортированный список значений для диапазонов
+RANGE_FIELDS = ("experience_years",)
+# Позиции единичных битов для каждого байта
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+COMPACT_MIN_TOMBSTONES = 1024
+# Верхняя граница для диапазона строк с заданным префиксом
+PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+def surname_key(row: Row) -> str:
+    """Ключ индекса фамилий: ключ сравнения по алфавиту (как у TeacherSorter.by_surname)"""
+    return collation_key(row.get("last_name", ""))
+
+
+def prefix_bounds(prefix: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Границы ключей фамилий, начинающихся с prefix (без учета регистра): [low, high] и
+    начало хвоста диапазона, который нужно исключить. Если префикс кончается на Е,
+    ключи фамилий с Ё на этом месте тоже начинаются с него - они идут в конце диапазона.
+    """
+    low = collation_key(prefix)
+    excluded = low + YO_MARKER if low.endswith("Е") else None
+    return low, low + PREFIX_UPPER_BOUND, excluded
+
+
+def _field_value(row: Row, field: str) -> Any:
+    # Так же, как фильтры декоратора: отсутствующий или пустой (None) стаж считается нулевым
+    if field == "experience_years":
+        value = row.get(field)
+        return 0 if value is None else value
+    return row.get(field)
+
+
+class TeacherIndex:
+    """
+    Вторичные индексы по записям в памяти.
+    Каждая запись занимает слот (позиция в порядке хранилища), множество слотов - это
+    битовая маска в виде int, поэтому условия комбинируются операциями & и |.
+    Удаленные записи оставляют пустой слот, пока их не станет слишком много.
+    Фамилии дополнительно хранятся отсортированными (ключ сравнения, затем слот):
+    префиксный поиск - это диапазон bisect, а записи из него уже упорядочены по фамилии.
+    """
+
+    def __init__(self, rows: Iterable[Row] = ()) -> None:
+        self.rebuild(rows)
+
+    def rebuild(self, rows: Iterable[Row]) -> None:
+        """Построить индексы заново (массово, через байтовые массивы)"""
+        live_rows = list(rows)
+        self._rows: List[Optional[Row]] = list(live_rows)
+        self._slots: Dict[int, int] = {
+            row["id_teacher"]: slot for slot, row in enumerate(live_rows)
+        }
+        self._tombstones = 0
+        self._live_rows: Optional[List[Row]] = None
+
+        size = len(self._rows)
+        self._live = (1 << size) - 1
+        self._bitmaps: Dict[str, Dict[Any, int]] = {}
+        for field in BITMAP_FIELDS:
+            buffers: Dict[Any, bytearray] = {}
+            for slot, row in enumerate(live_rows):
+                value = _field_value(row, field)
+                buffer = buffers.get(value)
+                if buffer is None:
+                    buffer = buffers[value] = bytearray((size >> 3) + 1)
+                buffer[slot >> 3] |= 1 << (slot & 7)
+            self._bitmaps[field] = {
+                value: int.from_bytes(buffer, "little") for value, buffer in buffers.items()
+            }
+
+        self._sorted_values: Dict[str, List[Any]] = {
+            field: sorted(self._bitmaps[field]) for field in RANGE_FIELDS
+        }
+
+        # Параллельные массивы: ключи фамилий по возрастанию и слоты записей
+        keys = [surname_key(row) for row in live_rows]
+        self._surname_slots = sorted(range(size), key=keys.__getitem__)
+        self._surname_keys = [keys[slot] for slot in self._surname_slots]
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, id_teacher: int) -> bool:
+        return id_teacher in self._slots
+
+    @property
+    def max_id(self) -> int:
+        return max(self._slots, default=0)
+
+    def get(self, id_teacher: int) -> Optional[Row]:
+        slot = self._slots.get(id_teacher)
+        return self._rows[slot] if slot is not None else None
+
+    def live_rows(self) -> List[Row]:
+        """Записи в порядке хранилища (список кэшируется до следующего изменения)"""
+        if self._live_rows is None:
+            if self._tombstones:
+                self._live_rows = [row for row in self._rows if row is not None]
+            else:
+                self._live_rows = self._rows  # type: ignore[assignment]
+        return self._live_rows  # type: ignore[return-value]
+
+    # Инкрементальное обновление
+
+    def add(self, row: Row) -> None:
+        slot = len(self._rows)
+        self._rows.append(row)
+        self._slots[row["id_teacher"]] = slot
+        self._live |= 1 << slot
+        self._set_bits(row, slot)
+        self._insert_surname(row, slot)
+        self._live_rows = None
+
+    def update(self, row: Row) -> None:
+        """Заменить запись с тем же id_teacher, сохранив ее позицию"""
+        slot = self._slots[row["id_teacher"]]
+        self._clear_bits(self._rows[slot], slot)  # type: ignore[arg-type]
+        self._remove_surname(self._rows[slot], slot)  # type: ignore[arg-type]
+        self._rows[slot] = row
+        self._set_bits(row, slot)
+        self._insert_surname(row, slot)
+        self._live_rows = None
+
+    def remove(self, id_teacher: int) -> Optional[Row]:
+        slot = self._slots.pop(id_teacher, None)
+        if slot is None:
+            return None
+        row = self._rows[slot]
+        self._clear_bits(row, slot)  # type: ignore[arg-type]
+        self._remove_surname(row, slot)  # type: ignore[arg-type]
+        self._live &= ~(1 << slot)
+        self._rows[slot] = None
+        self._tombstones += 1
+        self._live_rows = None
+        if self._tombstones >= COMPACT_MIN_TOMBSTONES and self._tombstones > len(self._slots):
+            self.rebuild(self.live_rows())
+        return row
+
+    def _set_bits(self, row: Row, slot: int) -> None:
+        bit = 1 << slot
+        for field in BITMAP_FIELDS:
+            value = _field_value(row, field)
+            bitmaps = self._bitmaps[field]
+            if value not in bitmaps:
+                bitmaps[value] = 0
+                if field in RANGE_FIELDS:
+                    bisect.insort(self._sorted_values[field], value)
+            bitmaps[value] |= bit
+
+    def _clear_bits(self, row: Row, slot: int) -> None:
+        bit = 1 << slot
+        for field in BITMAP_FIELDS:
+            value = _field_value(row, field)
+            bitmaps = self._bitmaps[field]
+            bitmaps[value] &= ~bit
+            if not bitmaps[value]:
+                del bitmaps[value]
+                if field in RANGE_FIELDS:
+                    values = self._sorted_values[field]
+                    del values[bisect.bisect_left(values, value)]
+
+    def _surname_position(self, key: str, slot: int) -> int:
+        # Среди равных ключей слоты идут по возрастанию
+        low = bisect.bisect_left(self._surname_keys, key)
+        high = bisect.bisect_right(self._surname_keys, key, low)
+        return bisect.bisect_left(self._surname_slots, slot, low, high)
+
+    def _insert_surname(self, row: Row, slot: int) -> None:
+        key = surname_key(row)
+        position = self._surname_position(key, slot)
+        self._surname_keys.insert(position, key)
+        self._surname_slots.insert(position, slot)
+
+    def _remove_surname(self, row: Row, slot: int) -> None:
+        position = self._surname_position(surname_key(row), slot)
+        del self._surname_keys[position]
+        del self._surname_slots[position]
+
+    # Запросы: все методы возвращают маску слотов
+
+    def all_mask(self) -> int:
+        return self._live
+
+    def mask_equals(self, field: str, *values: Any) -> int:
+        """Записи, у которых field равно одному из values (OR масок)"""
+        bitmaps = self._bitmaps[field]
+        mask = 0
+        for value in values:
+            mask |= bitmaps.get(value, 0)
+        return mask
+
+    def mask_range(self, field: str, low: Any = None, high: Any = None) -> int:
+        """Записи с low <= field <= high (границы None - без ограничения)"""
+        values = self._sorted_values[field]
+        start = bisect.bisect_left(values, low) if low is not None else 0
+        end = bisect.bisect_right(values, high) if high is not None else len(values)
+        return self.mask_equals(field, *values[start:end])
+
+    def _prefix_range(self, prefix: Optional[str]) -> Tuple[int, int]:
+        if not prefix:
+            return 0, len(self._surname_keys)
+        low_key, high_key, excluded = prefix_bounds(prefix)
+        low = bisect.bisect_left(self._surname_keys, low_key)
+        high = bisect.bisect_right(self._surname_keys, high_key, low)
+        if excluded is not None:
+            high = bisect.bisect_left(self._surname_keys, excluded, low, high)
+        return low, high
+
+    def mask_prefix(self, prefix: str) -> int:
+        """Записи, фамилия которых (в верхнем регистре) начинается с prefix"""
+        low, high = self._prefix_range(prefix)
+        if high - low < 64:
+            mask = 0
+            for slot in self._surname_slots[low:high]:
+                mask |= 1 << slot
+            return mask
+        buffer = bytearray((len(self._rows) >> 3) + 1)
+        for slot in self._surname_slots[low:high]:
+            buffer[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(buffer, "little")
+
+    def select(self, filters: Sequence[Any]) -> Tuple[int, List[Any]]:
+        """
+        Маска по фильтрам, которые умеют работать с индексом (index_mask), объединенная по AND,
+        и список остальных фильтров, которые нужно проверить построчно.
+        """
+        mask = self._live
+        residual = []
+        for filter_obj in filters:
+            filter_mask = filter_obj.index_mask(self)
+            if filter_mask is None:
+                residual.append(filter_obj)
+            else:
+                mask &= filter_mask
+        return mask, residual
+
+    def rows_for(self, mask: int) -> List[Row]:
+        """Записи из маски в порядке хранилища"""
+        if mask == self._live:
+            return list(self.live_rows())
+        rows = self._rows
+        result = []
+        data = mask.to_bytes((mask.bit_length() + 7) >> 3, "little")
+        for byte_index, byte in enumerate(data):
+            if byte:
+                base = byte_index << 3
+                for bit in BYTE_BITS[byte]:
+                    result.append(rows[base + bit])
+        return result  # type: ignore[return-value]
+
+    def rows_by_surname(
+        self, mask: int, prefix: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Row]:
+        """
+        Записи из маски в порядке фамилий (равные фамилии - в порядке хранилища).
+        prefix сужает просмотр диапазоном индекса, limit останавливает его досрочно:
+        для префиксного поиска это O(log N + k).
+        """
+        low, high = self._prefix_range(prefix)
+        rows = self._rows
+        result: List[Row] = []
+        if limit is not None and limit <= 0:
+            return result
+
+        every_live = mask == self._live
+        if every_live and limit is not None:
+            high = min(high, low + limit)
+        data = b"" if every_live else mask.to_bytes((mask.bit_length() + 7) >> 3, "little")
+        size = len(data)
+        slots = self._surname_slots
+        for position in range(low, high):
+            slot = slots[position]
+            if not every_live:
+                byte_index = slot >> 3
+                if byte_index >= size or not data[byte_index] >> (slot & 7) & 1:
+                    continue
+            result.append(rows[slot])  # type: ignore[arg-type]
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    @staticmethod
+    def count(mask: int) -> int:
+        return bin(mask).count("1")
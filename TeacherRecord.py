@@ -0,0 +1,120 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Sequence, Union
+
+from BaseTeacherRepository import TEACHER_COLUMNS
+
+_COLUMN_SET = frozenset(TEACHER_COLUMNS)
+
+
+class TeacherRecord(Mapping):
+    """
+    Компактная запись преподавателя: значения в __slots__ вместо словаря на запись
+    (на запись около 90 байт вместо 280 у словаря с теми же семью ключами).
+    Ведет себя как словарь только для чтения (record["email"], get, items, dict(record)),
+    значения известных полей можно заменять через record[field] = value.
+    """
+
+    __slots__ = TEACHER_COLUMNS
+
+    def __init__(
+        self,
+        id_teacher: int,
+        first_name: str,
+        last_name: str,
+        email: str,
+        academic_degree: str,
+        administrative_position: str,
+        experience_years: int,
+    ) -> None:
+        self.id_teacher = id_teacher
+        self.first_name = first_name
+        self.last_name = last_name
+        self.email = email
+        self.academic_degree = academic_degree
+        self.administrative_position = administrative_position
+        self.experience_years = experience_years
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "TeacherRecord":
+        """Запись из строки результата запроса с колонками TEACHER_COLUMNS"""
+        return cls(*row)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "TeacherRecord":
+        """Запись из словаря со всеми колонками (KeyError, если колонки нет)"""
+        return cls(*[data[column] for column in TEACHER_COLUMNS])
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _COLUMN_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _COLUMN_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _COLUMN_SET else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in _COLUMN_SET
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TEACHER_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(TEACHER_COLUMNS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Обычный словарь (быстрее, чем dict(record))"""
+        return {
+            "id_teacher": self.id_teacher,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "email": self.email,
+            "academic_degree": self.academic_degree,
+            "administrative_position": self.administrative_position,
+            "experience_years": self.experience_years,
+        }
+
+    def copy(self) -> "TeacherRecord":
+        return TeacherRecord(
+            self.id_teacher,
+            self.first_name,
+            self.last_name,
+            self.email,
+            self.academic_degree,
+            self.administrative_position,
+            self.experience_years,
+        )
+
+    def __repr__(self) -> str:
+        return f"TeacherRecord({self.to_dict()!r})"
+
+
+# Строка в памяти: компактная запись или словарь (если каких-то колонок нет)
+Row = Union[TeacherRecord, Dict[str, Any]]
+
+
+def as_record(row: Mapping) -> Row:
+    """
+    Независимая копия строки: полная строка становится компактной записью,
+    в неполной (без каких-то колонок) остается словарем.
+    """
+    if isinstance(row, TeacherRecord):
+        return row.copy()
+    if _COLUMN_SET.issubset(row):
+        return TeacherRecord.from_dict(row)
+    return dict(row)
+
+
+def as_records(rows: Iterable[Mapping]) -> Iterator[Row]:
+    return map(as_record, rows)
+
+
+def record_default(value: Any) -> Dict[str, Any]:
+    """Хук default для json.dump/json.dumps: записи сериализуются как словари"""
+    if isinstance(value, TeacherRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,252 @@
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from BaseTeacherRepository import BaseTeacherRepository, projection_columns
+from TeacherCache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, CacheKey, TeacherCache
+
+COUNT_KEY: CacheKey = ("count",)
+
+
+def _id_key(id_teacher: int) -> CacheKey:
+    return ("id", id_teacher)
+
+
+def _page_key(k: int, n: int, fields: Optional[Sequence[str]]) -> CacheKey:
+    return ("page", k, n, projection_columns(fields))
+
+
+class TeacherRepCached(BaseTeacherRepository):
+    """
+    Репозиторий-обертка с кэшем чтения (TeacherCache) для get_by_id, get_many, get_count
+    и страниц get_k_n_short_list. Подходит для любого хранилища (JSON, YAML, БД).
+    Изменения, прошедшие через обертку, удаляют из кэша только затронутые значения:
+    запись по id, страницы с этой записью и страницы после нее, количество.
+    Изменения в обход обертки (другие процессы) видны после истечения TTL
+    или сразу, если их передает apply_change.
+    Остальные атрибуты (filter_rows_sorted и т.п.) берутся у оборачиваемого хранилища.
+    """
+
+    def __init__(
+        self,
+        repository: BaseTeacherRepository,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self._repository = repository
+        self.file_path = getattr(repository, "file_path", "")
+        self.cache = TeacherCache(max_entries, ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._repository, name)
+
+    def _ensure_file_exists(self) -> None:
+        self._repository._ensure_file_exists()
+
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return self._repository.read_all(fields)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        return self._repository.iter_all(chunk_size)
+
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
+        try:
+            return self._repository.write_all(data)
+        finally:
+            self.cache.clear()
+
+    # Чтение-изменение-запись с проверкой версии выполняет оборачиваемое хранилище
+
+    def _read_versioned(self) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        return self._repository._read_versioned()
+
+    def _write_versioned(self, data: Sequence[Mapping[str, Any]], version: Optional[int]) -> bool:
+        try:
+            return self._repository._write_versioned(data, version)
+        finally:
+            self.cache.clear()
+
+    def _exclusive(self) -> ContextManager[None]:
+        return self._repository._exclusive()
+
+    # Чтение через кэш. Наружу отдаются копии, чтобы изменения вызывающего кода не попали в кэш
+
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        key = _id_key(id_teacher)
+        row = self.cache.get(key)
+        if row is None:
+            generation = self.cache.generation
+            row = self._repository.get_by_id(id_teacher)
+            if row is None:
+                return None
+            self.cache.put(key, row, (id_teacher,), generation)
+        return self._project_all([row.copy()], fields)[0]
+
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        found: Dict[int, Dict[str, Any]] = {}
+        missing = []
+        for id_teacher in dict.fromkeys(ids):
+            row = self.cache.get(_id_key(id_teacher))
+            if row is None:
+                missing.append(id_teacher)
+            else:
+                found[id_teacher] = row
+
+        if missing:
+            generation = self.cache.generation
+            for row in self._repository.get_many(missing):
+                found[row["id_teacher"]] = row
+                self.cache.put(_id_key(row["id_teacher"]), row, (row["id_teacher"],), generation)
+
+        rows = [found[id_teacher].copy() for id_teacher in ids if id_teacher in found]
+        return self._project_all(rows, fields)
+
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        key = _page_key(k, n, fields)
+        page = self.cache.get(key)
+        if page is None:
+            generation = self.cache.generation
+            page = self._repository.get_k_n_short_list(k, n, fields)
+            self.cache.put(key, page, [row["id_teacher"] for row in page], generation)
+        return [row.copy() for row in page]
+
+    def get_count(self) -> int:
+        count = self.cache.get(COUNT_KEY)
+        if count is None:
+            generation = self.cache.generation
+            count = self._repository.get_count()
+            self.cache.put(COUNT_KEY, count, (), generation)
+        return count
+
+    # Изменения: точечная инвалидация
+
+    def _invalidate_appended(self) -> None:
+        """Новые записи добавляются в конец: устаревают количество и неполные страницы"""
+        self.cache.invalidate(COUNT_KEY)
+        self.cache.invalidate_where(lambda key, page: key[0] == "page" and len(page) < key[1])
+
+    def _invalidate_removed(self, id_teacher: int) -> None:
+        """Удаленная запись сдвигает все страницы после нее"""
+        position = self._cached_position(id_teacher)
+        self.cache.invalidate_ids((id_teacher,))
+        self.cache.invalidate(COUNT_KEY)
+        if position is None:
+            # Где была запись, неизвестно - устаревшей может быть любая страница
+            self.cache.invalidate_where(lambda key, page: key[0] == "page")
+        else:
+            self.cache.invalidate_where(
+                lambda key, page: key[0] == "page" and key[2] * key[1] > position
+            )
+
+    def _cached_position(self, id_teacher: int) -> Optional[int]:
+        """Позиция записи в порядке хранилища по закэшированным страницам (None - неизвестна)"""
+        for key, page in self.cache.items():
+            if key[0] != "page":
+                continue
+            for offset, row in enumerate(page):
+                if row["id_teacher"] == id_teacher:
+                    return (key[2] - 1) * key[1] + offset
+        return None
+
+    def add_teacher(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        academic_degree: str,
+        administrative_position: str,
+        experience_years: int,
+    ) -> int:
+        try:
+            return self._repository.add_teacher(
+                first_name,
+                last_name,
+                email,
+                academic_degree,
+                administrative_position,
+                experience_years,
+            )
+        finally:
+            self._invalidate_appended()
+
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        try:
+            return self._repository.add_many(teachers)
+        finally:
+            self._invalidate_appended()
+
+    def update_teacher(
+        self,
+        id_teacher: int,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        academic_degree: Optional[str] = None,
+        administrative_position: Optional[str] = None,
+        experience_years: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return self._repository.update_teacher(
+                id_teacher,
+                first_name,
+                last_name,
+                email,
+                academic_degree,
+                administrative_position,
+                experience_years,
+            )
+        finally:
+            self.cache.invalidate_ids((id_teacher,))
+
+    def delete_teacher(self, id_teacher: int) -> str:
+        try:
+            return self._repository.delete_teacher(id_teacher)
+        finally:
+            self._invalidate_removed(id_teacher)
+
+    def sort_by_field(self, field: str) -> str:
+        try:
+            return self._repository.sort_by_field(field)
+        finally:
+            self.cache.clear()
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        try:
+            return self._repository.apply_batch(operations)
+        finally:
+            self.cache.clear()
+
+    def apply_change(self, operation: str, ids: Sequence[int]) -> None:
+        """
+        Изменение, сделанное в обход обертки (другим процессом, см. TeacherChangeListener):
+        инвалидация такая же точечная, как для собственных изменений.
+        operation - insert, update, delete или reset (неизвестно, что менялось).
+        """
+        if operation == "insert":
+            self._invalidate_appended()
+        elif operation == "update":
+            self.cache.invalidate_ids(ids)
+        elif operation == "delete":
+            for id_teacher in ids:
+                self._invalidate_removed(id_teacher)
+        else:
+            self.cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -0,0 +1,166 @@
+from typing import Any, ContextManager, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from BaseTeacherRepository import BaseTeacherRepository
+from TeacherColumns import TeacherColumns, numpy_available
+from TeacherRepDecorator import compile_filter
+from TeacherRepIndexed import file_signature
+from TeacherSortSpec import SortSpec
+
+
+class TeacherRepColumnar(BaseTeacherRepository):
+    """
+    Репозиторий-обертка с колоночным движком на NumPy (TeacherColumns) для больших наборов.
+    Фильтры декоратора вычисляются векторными масками, сортировка - по целочисленным ключам,
+    словари собираются только для возвращаемой страницы.
+    Чтение и изменения выполняет оборачиваемое хранилище; после изменения столбцы
+    строятся заново при следующем запросе.
+    """
+
+    def __init__(self, repository: BaseTeacherRepository) -> None:
+        if not numpy_available():
+            raise RuntimeError("Для колоночного движка нужен NumPy (pip install numpy)")
+        self._repository = repository
+        self.file_path = getattr(repository, "file_path", "")
+        self._columns: Optional[TeacherColumns] = None
+        self._signature: Optional[Tuple[int, int]] = None
+
+    def _ensure_file_exists(self) -> None:
+        self._repository._ensure_file_exists()
+
+    def _load(self) -> TeacherColumns:
+        """Столбцы актуального содержимого хранилища"""
+        signature = file_signature(self.file_path)
+        if self._columns is None or signature != self._signature:
+            self._columns = TeacherColumns(self._repository.read_all())
+            self._signature = signature
+        return self._columns
+
+    def _invalidate(self) -> None:
+        self._columns = None
+
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return self._repository.read_all(fields)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        return self._repository.iter_all(chunk_size)
+
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
+        self._invalidate()
+        return self._repository.write_all(data)
+
+    # Чтение-изменение-запись с проверкой версии выполняет оборачиваемое хранилище
+
+    def _read_versioned(self) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        return self._repository._read_versioned()
+
+    def _write_versioned(self, data: Sequence[Mapping[str, Any]], version: Optional[int]) -> bool:
+        self._invalidate()
+        return self._repository._write_versioned(data, version)
+
+    def _exclusive(self) -> ContextManager[None]:
+        return self._repository._exclusive()
+
+    def filter_rows(self, filters: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Записи, прошедшие фильтры, в порядке хранилища"""
+        columns = self._load()
+        mask, residual = columns.select(filters)
+        rows = columns.rows_for(mask)
+        if residual:
+            rows = compile_filter(residual)(rows)
+        return rows
+
+    def count_rows(self, filters: Sequence[Any]) -> int:
+        columns = self._load()
+        mask, residual = columns.select(filters)
+        if residual:
+            return len(compile_filter(residual)(columns.rows_for(mask)))
+        return columns.count(mask)
+
+    def filter_rows_sorted(
+        self, filters: Sequence[Any], spec: Optional[SortSpec], limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Первые limit записей, прошедших фильтры, в порядке сортировки (без сортировщика -
+        в порядке хранилища). None - есть фильтры без векторной версии или сортировка
+        по неподдерживаемому ключу: тогда декоратор проверяет и сортирует сам.
+        """
+        columns = self._load()
+        mask, residual = columns.select(filters)
+        if residual:
+            return None
+        if spec is None:
+            positions = columns.positions_in_order(mask, limit)
+        else:
+            positions = columns.positions_sorted(mask, spec.keys, limit)
+            if positions is None:
+                return None
+        return columns.rows_at(positions)
+
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        return self._repository.get_by_id(id_teacher, fields)
+
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        return self._repository.get_many(ids, fields)
+
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        return self._repository.get_k_n_short_list(k, n, fields)
+
+    def sort_by_field(self, field: str) -> str:
+        self._invalidate()
+        return self._repository.sort_by_field(field)
+
+    def get_count(self) -> int:
+        return self._repository.get_count()
+
+    def add_teacher(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        academic_degree: str,
+        administrative_position: str,
+        experience_years: int,
+    ) -> int:
+        self._invalidate()
+        return self._repository.add_teacher(
+            first_name, last_name, email, academic_degree, administrative_position, experience_years
+        )
+
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        self._invalidate()
+        return self._repository.add_many(teachers)
+
+    def update_teacher(
+        self,
+        id_teacher: int,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        academic_degree: Optional[str] = None,
+        administrative_position: Optional[str] = None,
+        experience_years: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        self._invalidate()
+        return self._repository.update_teacher(
+            id_teacher,
+            first_name,
+            last_name,
+            email,
+            academic_degree,
+            administrative_position,
+            experience_years,
+        )
+
+    def delete_teacher(self, id_teacher: int) -> str:
+        self._invalidate()
+        return self._repository.delete_teacher(id_teacher)
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._invalidate()
+        return self._repository.apply_batch(operations)
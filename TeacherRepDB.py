@@ -1,12 +1,25 @@
-from typing import Any, Dict, List, Optional
-
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from BaseTeacherRepository import (
+    TEACHER_COLUMNS,
+    TEACHER_FIELDS,
+    BaseTeacherRepository,
+    projection_columns,
+)
 from DatabaseManager import DatabaseManager
+from TeacherRecord import TeacherRecord
+
+# Канал уведомлений об изменениях таблицы teachers (LISTEN/NOTIFY)
+CHANGES_CHANNEL = "teachers_changes"
+# Больше id в одном уведомлении не передаем (предел payload 8000 байт): подписчики сбрасывают кэш
+NOTIFY_MAX_IDS = 500
 
 
 class TeacherRepDB:
     def __init__(self, reset_on_start: bool = True) -> None:  # По умолчанию True для очистки
         self.db = DatabaseManager()
         self._ensure_table_exists(reset_on_start)
+        self._ensure_change_triggers()
 
         # Всегда очищаем и заполняем таблицу начальными данными
         self._reset_and_fill_initial_data()
@@ -32,6 +45,57 @@ class TeacherRepDB:
         """
         self.db.execute_query(create_table_query)
 
+    def _ensure_change_triggers(self) -> None:
+        """
+        Триггеры, которые после каждой команды INSERT/UPDATE/DELETE/TRUNCATE отправляют
+        в канал CHANGES_CHANNEL одно уведомление: {"op": ..., "ids": [...]} или {"op": "reset"}.
+        Уведомление доставляется после коммита, поэтому другие процессы видят уже
+        зафиксированные данные.
+        """
+        function_query = f"""
+        CREATE OR REPLACE FUNCTION teachers_notify_changes() RETURNS trigger AS $$
+        DECLARE
+            changed_ids integer[];
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('{CHANGES_CHANNEL}', json_build_object('op', 'reset')::text);
+                RETURN NULL;
+            END IF;
+            SELECT array_agg(id_teacher) INTO changed_ids
+            FROM (SELECT id_teacher FROM changed_rows LIMIT {NOTIFY_MAX_IDS + 1}) AS limited;
+            IF changed_ids IS NULL THEN
+                RETURN NULL;
+            END IF;
+            IF array_length(changed_ids, 1) > {NOTIFY_MAX_IDS} THEN
+                PERFORM pg_notify('{CHANGES_CHANNEL}', json_build_object('op', 'reset')::text);
+            ELSE
+                PERFORM pg_notify(
+                    '{CHANGES_CHANNEL}',
+                    json_build_object('op', lower(TG_OP), 'ids', changed_ids)::text
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+        self.db.execute_query(function_query)
+
+        # Триггер на команду, а не на строку: массовая загрузка дает одно уведомление
+        triggers = (
+            ("teachers_notify_insert", "INSERT", "REFERENCING NEW TABLE AS changed_rows"),
+            ("teachers_notify_update", "UPDATE", "REFERENCING NEW TABLE AS changed_rows"),
+            ("teachers_notify_delete", "DELETE", "REFERENCING OLD TABLE AS changed_rows"),
+            ("teachers_notify_truncate", "TRUNCATE", ""),
+        )
+        for name, event, transition in triggers:
+            self.db.execute_query(f"DROP TRIGGER IF EXISTS {name} ON teachers")
+            self.db.execute_query(
+                f"""
+                CREATE TRIGGER {name} AFTER {event} ON teachers {transition}
+                FOR EACH STATEMENT EXECUTE FUNCTION teachers_notify_changes()
+                """
+            )
+
     def _reset_and_fill_initial_data(self) -> None:
         """Очистить таблицу и заполнить начальными данными"""
         self.clear_table_completely()
@@ -121,33 +185,58 @@ class TeacherRepDB:
         """Очистить таблицу и заполнить начальными данными (только по явному вызову)"""
         self._reset_and_fill_initial_data()
 
-    def read_all(self) -> List[Dict[str, Any]]:
-        """Чтение всех значений из базы данных"""
+    @staticmethod
+    def _columns(fields: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        """Колонки для SELECT: только запрошенные поля (id_teacher всегда) или все"""
+        return projection_columns(fields) or TEACHER_COLUMNS
+
+    @staticmethod
+    def _rows(columns: Sequence[str], result: Any) -> List[Any]:
+        """Строки результата: все колонки - компактные TeacherRecord, проекция - словари"""
+        if tuple(columns) == TEACHER_COLUMNS:
+            return [TeacherRecord.from_row(row) for row in result or []]
+        return [dict(zip(columns, row)) for row in result or []]
+
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Чтение всех значений из базы данных (выбираются только нужные колонки)"""
+        columns = self._columns(fields)
+        query = f"""
+        SELECT {", ".join(columns)}
+        FROM teachers
+        ORDER BY id_teacher
+        """
+        result = self.db.execute_query(query)
+        return self._rows(columns, result)
+
+    def read_sorted(self, order_by: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Чтение записей в заданном порядке (первые limit).
+        order_by - готовое выражение ORDER BY из SortSpec.to_sql (имена колонок из TEACHER_COLUMNS)
+        """
+        query = f"""
+        SELECT {", ".join(TEACHER_COLUMNS)}
+        FROM teachers
+        {order_by}
+        """
+        params: Optional[Tuple[int]] = None
+        if limit is not None:
+            query += "LIMIT %s"
+            params = (max(limit, 0),)
+        result = self.db.execute_query(query, params)
+        return self._rows(TEACHER_COLUMNS, result)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[TeacherRecord]:
+        """Потоковое чтение через серверный курсор: в памяти не больше chunk_size строк"""
         query = """
         SELECT id_teacher, first_name, last_name, email, academic_degree,
                administrative_position, experience_years
         FROM teachers
         ORDER BY id_teacher
         """
-        result = self.db.execute_query(query)
-
-        teachers = []
-        if result:
-            for row in result:
-                teachers.append(
-                    {
-                        "id_teacher": row[0],
-                        "first_name": row[1],
-                        "last_name": row[2],
-                        "email": row[3],
-                        "academic_degree": row[4],
-                        "administrative_position": row[5],
-                        "experience_years": row[6],
-                    }
-                )
-        return teachers
+        for row in self.db.iter_query(query, chunk_size=chunk_size):
+            yield TeacherRecord.from_row(row)
 
-    def write_all(self, data: List[Dict[str, Any]]) -> str:
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
         """Запись всех значений в базу данных (перезаписывает все данные)"""
         # Очищаем таблицу И сбрасываем последовательность
         self.clear_table_completely()
@@ -183,53 +272,58 @@ class TeacherRepDB:
             return False
 
     # a. Получить объект по ID
-    def get_by_id(self, id_teacher: int) -> Optional[Dict[str, Any]]:
-        query = """
-        SELECT id_teacher, first_name, last_name, email, academic_degree,
-               administrative_position, experience_years
+    def get_by_id(
+            self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        columns = self._columns(fields)
+        query = f"""
+        SELECT {", ".join(columns)}
         FROM teachers
         WHERE id_teacher = %s
         """
         result = self.db.execute_query(query, (id_teacher,))
 
         if result and len(result) > 0:
-            row = result[0]
-            return {
-                "id_teacher": row[0],
-                "first_name": row[1],
-                "last_name": row[2],
-                "email": row[3],
-                "academic_degree": row[4],
-                "administrative_position": row[5],
-                "experience_years": row[6],
-            }
+            return self._rows(columns, result[:1])[0]
         return None
 
+    # a1. Получить несколько объектов по списку ID одним запросом
+    def get_many(
+            self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Порядок результата совпадает с порядком ids, отсутствующие ID пропускаются"""
+        if not ids:
+            return []
+
+        columns = self._columns(fields)
+        query = f"""
+        SELECT {", ".join(columns)}
+        FROM teachers
+        WHERE id_teacher = ANY(%s)
+        """
+        result = self.db.execute_query(query, (list(ids),))
+
+        index = {row["id_teacher"]: row for row in self._rows(columns, result)}
+        return [index[id_teacher] for id_teacher in ids if id_teacher in index]
+
     # b. Получить список k по счету n объектов класса short
-    def get_k_n_short_list(self, k: int, n: int) -> List[Dict[str, Any]]:
+    def get_k_n_short_list(
+            self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
         offset = (n - 1) * k
-        query = """
-        SELECT id_teacher, first_name, last_name, email, academic_degree,
-               administrative_position, experience_years
+        columns = self._columns(fields)
+        query = f"""
+        SELECT {", ".join(columns)}
         FROM teachers
         ORDER BY id_teacher
         LIMIT %s OFFSET %s
         """
         result = self.db.execute_query(query, (k, offset))
 
-        short_list = []
-        if result:
-            for row in result:
-                short_entity = {
-                    "id_teacher": row[0],
-                    "last_name": row[2],
-                    "first_name": row[1][0] + ".",
-                    "email": row[3],
-                    "academic_degree": row[4],
-                    "administrative_position": row[5],
-                    "experience_years": row[6],
-                }
-                short_list.append(short_entity)
+        short_list = self._rows(columns, result)
+        for short_entity in short_list:
+            if "first_name" in short_entity:
+                short_entity["first_name"] = short_entity["first_name"][0] + "."
 
         return short_list
 
@@ -251,20 +345,7 @@ class TeacherRepDB:
         ORDER BY {field}
         """
         result = self.db.execute_query(query)
-
-        teachers = []
-        if result:
-            for row in result:
-                teachers.append({
-                    "id_teacher": row[0],
-                    "first_name": row[1],
-                    "last_name": row[2],
-                    "email": row[3],
-                    "academic_degree": row[4],
-                    "administrative_position": row[5],
-                    "experience_years": row[6],
-                })
-        return teachers
+        return self._rows(TEACHER_COLUMNS, result)
 
     def _check_teacher_exists(self, first_name: str, last_name: str, email: str) -> bool:
         """Проверить существует ли преподаватель с такими данными"""
@@ -339,6 +420,28 @@ class TeacherRepDB:
             return -1
 
 
+    # d1. Массово добавить объекты через COPY
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        """Загрузка уже проверенных записей одной командой COPY. ID назначает SERIAL"""
+        if not teachers:
+            return 0
+
+        rows = ([teacher[field] for field in TEACHER_FIELDS] for teacher in teachers)
+        count = self.db.copy_rows("teachers", TEACHER_FIELDS, rows)
+        if count is None:
+            print(f"Не удалось загрузить пакет из {len(teachers)} преподавателей")
+            return 0
+        return count
+
+    # d2. Какие из адресов уже заняты (email уникален)
+    def existing_emails(self, emails: Sequence[str]) -> Set[str]:
+        """Адреса из emails, которые уже есть в таблице (одним запросом)"""
+        if not emails:
+            return set()
+        query = "SELECT email FROM teachers WHERE email = ANY(%s)"
+        result = self.db.execute_query(query, (list(emails),))
+        return {row[0] for row in result or ()}
+
     # e. Заменить элемент списка по ID
     def update_teacher(
             self,
@@ -437,4 +540,107 @@ class TeacherRepDB:
     def get_count(self) -> int:
         query = "SELECT COUNT(*) FROM teachers"
         result = self.db.execute_query(query)
-        return result[0][0] if result else 0
\ No newline at end of file
+        return result[0][0] if result else 0
+
+    # h. Применить пакет операций в одной транзакции
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Все операции выполняются в одной транзакции с одним коммитом.
+        Проверка дубликатов email для создаваемых записей делается одним запросом.
+        """
+        new_emails = [op["data"]["email"] for op in operations if op["op"] == "create"]
+        taken_emails = set()
+        if new_emails:
+            rows = self.db.execute_query(
+                "SELECT email FROM teachers WHERE email = ANY(%s)", (new_emails,)
+            )
+            taken_emails = {row[0] for row in rows or []}
+
+        results: List[Dict[str, Any]] = []
+        try:
+            with self.db.transaction():
+                for operation in operations:
+                    result = self._apply_batch_operation(operation, taken_emails)
+                    results.append(result)
+                    if not result["success"]:
+                        raise ValueError(result["message"])
+        except Exception as e:
+            print(f"Пакет операций отменен: {e}")
+            if len(results) < len(operations) and (not results or results[-1]["success"]):
+                # Ошибка БД на текущей операции - фиксируем ее в результатах
+                failed = operations[len(results)]
+                results.append(
+                    BaseTeacherRepository._batch_result(
+                        failed["op"], failed.get("id"), False, str(e)
+                    )
+                )
+            for skipped in operations[len(results):]:
+                results.append(
+                    BaseTeacherRepository._batch_result(
+                        skipped["op"], skipped.get("id"), False, "не выполнено: пакет отменен"
+                    )
+                )
+            return BaseTeacherRepository._cancel_batch(results)
+
+        print(f"Пакет из {len(operations)} операций применен")
+        return results
+
+    def _apply_batch_operation(
+            self, operation: Dict[str, Any], taken_emails: set
+    ) -> Dict[str, Any]:
+        """Выполнить одну операцию пакета внутри уже открытой транзакции"""
+        action = operation["op"]
+        columns = ", ".join(TEACHER_COLUMNS)
+
+        if action == "create":
+            data = operation["data"]
+            if data["email"] in taken_emails:
+                return BaseTeacherRepository._batch_result(
+                    action, None, False, f"Email {data['email']} уже используется"
+                )
+            query = f"""
+            INSERT INTO teachers ({", ".join(TEACHER_FIELDS)})
+            VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING {columns}
+            """
+            rows = self.db.execute_query(query, tuple(data[field] for field in TEACHER_FIELDS))
+            return BaseTeacherRepository._batch_result(
+                action, rows[0][0], True, "создан", dict(zip(TEACHER_COLUMNS, rows[0]))
+            )
+
+        if action == "update":
+            data = operation["data"]
+            changes = [
+                (field, data[field])
+                for field in TEACHER_FIELDS
+                if data.get(field)
+                or (field == "experience_years" and data.get(field) is not None)
+            ]
+            if changes:
+                assignments = ", ".join(f"{field} = %s" for field, _ in changes)
+                query = f"""
+                UPDATE teachers SET {assignments}
+                WHERE id_teacher = %s
+                RETURNING {columns}
+                """
+                params = tuple(value for _, value in changes) + (operation["id"],)
+            else:
+                query = f"SELECT {columns} FROM teachers WHERE id_teacher = %s"
+                params = (operation["id"],)
+            rows = self.db.execute_query(query, params)
+            if not rows:
+                return BaseTeacherRepository._batch_result(
+                    action, operation["id"], False, "не найден"
+                )
+            return BaseTeacherRepository._batch_result(
+                action, operation["id"], True, "обновлен", dict(zip(TEACHER_COLUMNS, rows[0]))
+            )
+
+        rows = self.db.execute_query(
+            "DELETE FROM teachers WHERE id_teacher = %s RETURNING id_teacher", (operation["id"],)
+        )
+        if not rows:
+            return BaseTeacherRepository._batch_result(
+                action, operation["id"], False, "не найден"
+            )
+        return BaseTeacherRepository._batch_result(action, operation["id"], True, "удален")
@@ -1,54 +1,156 @@
-from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional
+import heapq
+from abc import ABC
+from contextlib import closing
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from BaseTeacherRepository import BaseTeacherRepository
+from TeacherSortSpec import SortKey, SortSpec, sort_key
+
+# Доля от числа записей, до которой страница отбирается кучей, а не полной сортировкой
+PARTIAL_SORT_MAX_SHARE = 0.02
+# До стольких записей (конец страницы) сортированная страница отбирается кучей прямо из потока
+STREAM_TOP_MAX = 1000
+# Сколько различных фамилий запоминает один фильтр по префиксу
+PREFIX_CACHE_SIZE = 65536
 
 
 class TeacherFilter(ABC):
-    """Базовый класс для фильтров преподавателей"""
+    """
+    Базовый класс для фильтров преподавателей.
+    Наследник переопределяет predicate() (проверка одной записи) или apply() (весь список);
+    condition() позволяет встроить проверку в общий скомпилированный предикат декоратора.
+    """
+
+    fields: Tuple[str, ...] = ()  # поля записи, которые читает фильтр
+    cost = 10  # относительная стоимость проверки: дешевые условия проверяются первыми
 
-    @abstractmethod
     def apply(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Применить фильтр к списку преподавателей"""
-        pass
+        return compile_filter([self])(teachers)
+
+    def predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        """Проверка одной записи"""
+        if type(self).apply is TeacherFilter.apply:
+            # apply, predicate и condition по умолчанию выражены друг через друга
+            raise TypeError(
+                f"{type(self).__name__} должен переопределить apply, predicate или condition"
+            )
+        return lambda teacher: bool(self.apply([teacher]))
+
+    def condition(self, row: str, bind: Callable[[Any], str]) -> str:
+        """
+        Выражение Python над переменной row для скомпилированного предиката.
+        bind(value) кладет константу в пространство имен предиката и возвращает ее имя.
+        """
+        return f"{bind(self.predicate())}({row})"
+
+    def index_mask(self, index: Any) -> Optional[int]:
+        """Маска записей из индекса (TeacherIndex, TeacherColumns); None - проверка построчно"""
+        return None
 
 
 class ExperienceFilter(TeacherFilter):
     """Фильтр по опыту работы"""
 
+    fields = ("experience_years",)
+    cost = 2
+
     def __init__(
         self, min_experience: Optional[int] = None, max_experience: Optional[int] = None
     ) -> None:
         self.min_experience = min_experience
         self.max_experience = max_experience
 
-    def apply(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        result = teachers
+    def predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        low = self.min_experience if self.min_experience is not None else float("-inf")
+        high = self.max_experience if self.max_experience is not None else float("inf")
+        # Отсутствующий или пустой (None) стаж считается нулевым
+        return lambda t: low <= (t.get("experience_years") or 0) <= high
+
+    def condition(self, row: str, bind: Callable[[Any], str]) -> str:
+        value = f'({row}.get("experience_years") or 0)'
+        if self.min_experience is not None and self.max_experience is not None:
+            return f"{bind(self.min_experience)} <= {value} <= {bind(self.max_experience)}"
         if self.min_experience is not None:
-            result = [t for t in result if t.get("experience_years", 0) >= self.min_experience]
+            return f"{value} >= {bind(self.min_experience)}"
         if self.max_experience is not None:
-            result = [t for t in result if t.get("experience_years", 0) <= self.max_experience]
-        return result
+            return f"{value} <= {bind(self.max_experience)}"
+        return "True"
+
+    def index_mask(self, index: Any) -> Optional[int]:
+        return index.mask_range("experience_years", self.min_experience, self.max_experience)
 
 
 class AcademicDegreeFilter(TeacherFilter):
     """Фильтр по ученой степени"""
 
+    fields = ("academic_degree",)
+    cost = 1
+
     def __init__(self, degree: str) -> None:
         self.degree = degree
 
-    def apply(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        return [t for t in teachers if t.get("academic_degree") == self.degree]
+    def predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        degree = self.degree
+        return lambda t: t.get("academic_degree") == degree
+
+    def condition(self, row: str, bind: Callable[[Any], str]) -> str:
+        return f'{row}.get("academic_degree") == {bind(self.degree)}'
+
+    def index_mask(self, index: Any) -> Optional[int]:
+        return index.mask_equals("academic_degree", self.degree)
+
+
+class PrefixMatches(dict):
+    """
+    Результат проверки префикса по значению фамилии: регистр приводится один раз
+    на каждую различную фамилию, а не на каждую запись (фамилии сильно повторяются).
+    Словарь живет столько же, сколько скомпилированный фильтр, и ограничен по размеру.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        super().__init__()
+        self.prefix = prefix
+
+    def __missing__(self, value: str) -> bool:
+        matches = value.upper().startswith(self.prefix)
+        if len(self) < PREFIX_CACHE_SIZE:
+            self[value] = matches
+        return matches
 
 
 class SurnameFilter(TeacherFilter):
     """Фильтр по фамилии"""
 
+    fields = ("last_name",)
+    cost = 5
+
     def __init__(self, starts_with: str) -> None:
         self.starts_with = starts_with.upper()
 
-    def apply(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        return [t for t in teachers if t.get("last_name", "").upper().startswith(self.starts_with)]
+    def predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        matches = PrefixMatches(self.starts_with)
+        return lambda t: matches[t.get("last_name", "")]
+
+    def condition(self, row: str, bind: Callable[[Any], str]) -> str:
+        return f'{bind(PrefixMatches(self.starts_with))}[{row}.get("last_name", "")]'
+
+    def index_mask(self, index: Any) -> Optional[int]:
+        return index.mask_prefix(self.starts_with)
 
 
 class CompositeFilter(TeacherFilter):
@@ -57,49 +159,107 @@ class CompositeFilter(TeacherFilter):
     def __init__(self) -> None:
         self.filters: List[TeacherFilter] = []
 
+    @property
+    def fields(self) -> Tuple[str, ...]:  # type: ignore[override]
+        return tuple({field for filter_obj in self.filters for field in filter_obj.fields})
+
     def add_filter(self, filter_obj: TeacherFilter) -> None:
         """Добавить фильтр в композит"""
         self.filters.append(filter_obj)
 
-    def apply(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        result = teachers
-        for filter_obj in self.filters:
-            result = filter_obj.apply(result)
-        return result
+    def predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        return compile_predicate(self.filters)
+
+    def condition(self, row: str, bind: Callable[[Any], str]) -> str:
+        if not self.filters:
+            return "True"
+        ordered = sorted(self.filters, key=lambda filter_obj: filter_obj.cost)
+        return " and ".join(f"({f.condition(row, bind)})" for f in ordered)
+
+    def index_mask(self, index: Any) -> Optional[int]:
+        mask, residual = index.select(self.filters)
+        return None if residual else mask
+
+
+def _compile(filters: Sequence[TeacherFilter], template: str, **names: Any) -> Any:
+    namespace: Dict[str, Any] = {"__builtins__": {}, **names}
+
+    def bind(value: Any) -> str:
+        name = f"_c{len(namespace) - 1}"
+        namespace[name] = value
+        return name
+
+    ordered = sorted(filters, key=lambda filter_obj: filter_obj.cost)
+    conditions = [f"({filter_obj.condition('t', bind)})" for filter_obj in ordered]
+    source = template.format(condition=" and ".join(conditions) if conditions else "True")
+    # Константы - глобальные имена сгенерированной функции
+    return eval(source, namespace)  # noqa: S307 - код собран из шаблонов фильтров
+
+
+def compile_predicate(filters: Sequence[TeacherFilter]) -> Callable[[Dict[str, Any]], bool]:
+    """Собрать условия всех фильтров в одну функцию проверки записи"""
+    return _compile(filters, "lambda t: {condition}")
+
+
+def compile_filter(
+    filters: Sequence[TeacherFilter],
+) -> Callable[[Iterable[Mapping[str, Any]]], List[Any]]:
+    """
+    Собрать условия всех фильтров в одно списковое включение: записи проверяются
+    за один проход без вызова функции на строку, константы фильтров связаны заранее.
+    """
+    return _compile(filters, "lambda rows: [t for t in rows if {condition}]")
+
+
+def compile_filter_iter(
+    filters: Sequence[TeacherFilter],
+) -> Callable[[Iterable[Mapping[str, Any]]], Iterator[Any]]:
+    """То же, что compile_filter, но ленивое: генератор проверяет записи по мере чтения"""
+    return _compile(filters, "lambda rows: (t for t in rows if {condition})")
+
+
+def compile_count(filters: Sequence[TeacherFilter]) -> Callable[[Iterable[Mapping[str, Any]]], int]:
+    """Подсчет записей, прошедших фильтры, без накопления самих записей"""
+    return _compile(filters, "lambda rows: _sum(1 for t in rows if {condition})", _sum=sum)
 
 
 class TeacherSorter:
     """Класс для сортировки преподавателей"""
 
     @staticmethod
-    def by_surname(reverse: bool = False) -> Callable[[Dict[str, Any]], tuple[str, bool]]:
-        """Сортировка по фамилии"""
-        return lambda t: (t.get("last_name", ""), reverse)
+    def by_surname(reverse: bool = False) -> SortKey:
+        """Сортировка по фамилии (по алфавиту без учета регистра)"""
+        return sort_key("last_name", reverse)
 
     @staticmethod
-    def by_experience(reverse: bool = False) -> Callable[[Dict[str, Any]], tuple[int, bool]]:
+    def by_experience(reverse: bool = False) -> SortKey:
         """Сортировка по опыту работы"""
-        return lambda t: (t.get("experience_years", 0), reverse)
+        return sort_key("experience_years", reverse)
 
     @staticmethod
-    def by_academic_degree(reverse: bool = False) -> Callable[[Dict[str, Any]], tuple[str, bool]]:
+    def by_academic_degree(reverse: bool = False) -> SortKey:
         """Сортировка по ученой степени"""
-        return lambda t: (t.get("academic_degree", ""), reverse)
+        return sort_key("academic_degree", reverse)
 
     @staticmethod
-    def by_position(reverse: bool = False) -> Callable[[Dict[str, Any]], tuple[str, bool]]:
+    def by_position(reverse: bool = False) -> SortKey:
         """Сортировка по административной должности"""
-        return lambda t: (t.get("administrative_position", ""), reverse)
+        return sort_key("administrative_position", reverse)
 
     @staticmethod
-    def by_email(reverse: bool = False) -> Callable[[Dict[str, Any]], tuple[str, bool]]:
+    def by_email(reverse: bool = False) -> SortKey:
         """Сортировка по email"""
-        return lambda t: (t.get("email", ""), reverse)
+        return sort_key("email", reverse)
 
     @staticmethod
-    def by_id(reverse: bool = False) -> Callable[[Dict[str, Any]], tuple[int, bool]]:
+    def by_id(reverse: bool = False) -> SortKey:
         """Сортировка по ID"""
-        return lambda t: (t.get("id_teacher", 0), reverse)
+        return sort_key("id_teacher", reverse)
+
+    @staticmethod
+    def by_fields(spec: str) -> SortSpec:
+        """Сортировка по нескольким полям, например academic_degree,-experience_years,last_name"""
+        return SortSpec.parse(spec)
 
 
 class TeacherRepDecorator(BaseTeacherRepository):
@@ -115,91 +275,238 @@ class TeacherRepDecorator(BaseTeacherRepository):
         self._repository = repository
         self.file_path = getattr(repository, "file_path", "")  # Безопасное получение file_path
         self._filters: List[TeacherFilter] = []
-        self._sorter: Optional[Callable] = None
+        self._sorter: Optional[Union[Callable, SortSpec]] = None
+        self._compiled: Dict[Callable, Callable] = {}  # кэш скомпилированных фильтров
         if hasattr(self._repository, "_ensure_file_exists"):
             self._repository._ensure_file_exists()
 
     def add_filter(self, filter_obj: TeacherFilter) -> None:
         """Добавить фильтр"""
         self._filters.append(filter_obj)
+        self._compiled = {}
 
-    def set_sorter(self, sorter: Callable) -> None:
+    def set_sorter(self, sorter: Union[Callable, SortSpec]) -> None:
         """Установить способ сортировки"""
         self._sorter = sorter
 
     def clear_filters(self) -> None:
         """Очистить фильтры"""
         self._filters = []
+        self._compiled = {}
 
     def clear_sorter(self) -> None:
         """Очистить сортировку"""
         self._sorter = None
 
-    def _apply_filters_and_sorting(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Применить фильтры и сортировку к списку преподавателей"""
-        result = teachers
+    def _compile(self, compiler: Callable) -> Callable:
+        """Фильтры, собранные compiler (compile_filter и др.), с кэшем до изменения фильтров"""
+        compiled = self._compiled.get(compiler)
+        if compiled is None:
+            compiled = self._compiled[compiler] = compiler(self._filters)
+        return compiled
 
+    def _iter_filtered(self, chunk_size: int = 1000) -> Generator[Any, None, None]:
+        """
+        Ленивый конвейер: потоковое чтение хранилища -> скомпилированный фильтр.
+        Закрытие конвейера закрывает и источник (файл или курсор БД), поэтому
+        досрочная остановка не дочитывает хранилище.
+        """
+        source = self._repository.iter_all(chunk_size)
+        try:
+            if self._filters:
+                yield from self._compile(compile_filter_iter)(source)
+            else:
+                yield from source
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    def _sort_key(self) -> Optional[Tuple[Callable[[Mapping[str, Any]], Any], bool]]:
+        """
+        Ключ и направление сортировки (для сортировщика вида t -> (значение, reverse)).
+        None - единого ключа нет, например поля спецификации сортируются в разные стороны.
+        """
+        spec = SortSpec.of(self._sorter)
+        if spec is not None:
+            return spec.key()
+        key_func = self._sorter
+        if not callable(key_func):
+            return None
+        sample_result = key_func({})
+        reverse = (
+            sample_result[1]
+            if isinstance(sample_result, tuple) and len(sample_result) > 1
+            else False
+        )
+        return (lambda t: key_func(t)[0]), reverse
+
+    def _sort(self, teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self._sorter or not teachers:
+            return teachers
+        try:
+            spec = SortSpec.of(self._sorter)
+            if spec is not None:
+                return spec.sort(teachers)
+            sort_key = self._sort_key()
+            if sort_key is not None:
+                key, reverse = sort_key
+                return sorted(teachers, key=key, reverse=reverse)
+        except (TypeError, IndexError) as e:
+            print(f"Ошибка сортировки: {e}")
+        return teachers
+
+    def _top(self, teachers: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """
+        Первые limit записей в порядке сортировки (teachers уже отфильтрованы).
+        Для небольших limit - частичный отбор через кучу за O(N log limit) вместо сортировки.
+        """
+        if not self._sorter or not teachers:
+            return teachers[:limit]
+        if limit > len(teachers) * PARTIAL_SORT_MAX_SHARE:
+            return self._sort(teachers)[:limit]
+        try:
+            sort_key = self._sort_key()
+            if sort_key is None:
+                return self._sort(teachers)[:limit]
+            key, reverse = sort_key
+            # nsmallest/nlargest устойчивы так же, как sorted(...)[:limit]
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            return select(limit, teachers, key=key)
+        except (TypeError, IndexError) as e:
+            print(f"Ошибка сортировки: {e}")
+        return teachers[:limit]
+
+    def _source_fields(self, fields: Optional[Sequence[str]]) -> Optional[List[str]]:
+        """Поля, которые нужно прочитать из хранилища: запрошенные плюс нужные фильтрам"""
+        if fields is None or self._sorter is not None:
+            # Сортировщик может обращаться к любому полю - читаем записи целиком
+            return None
+        needed = set(fields)
         for filter_obj in self._filters:
-            result = filter_obj.apply(result)
+            needed.update(filter_obj.fields)
+        return list(needed)
 
+    def _filtered(self, fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+        """
+        Отфильтрованные записи. Если репозиторий умеет фильтровать сам (filter_rows, например
+        по индексам TeacherRepIndexed), фильтры передаются ему, иначе записи проверяются
+        по мере чтения и в памяти остаются только прошедшие фильтры.
+        """
+        filter_rows = getattr(self._repository, "filter_rows", None)
+        if filter_rows is not None:
+            return filter_rows(self._filters)
+        if self._filters:
+            with closing(self._iter_filtered()) as rows:
+                return list(rows)
+        return self._repository.read_all(self._source_fields(fields))
+
+    def _stream_page(self, start_index: int, end_index: int) -> List[Dict[str, Any]]:
+        """
+        Страница из ленивого конвейера: без сортировки чтение останавливается, как только
+        страница заполнена; с сортировкой небольшие страницы отбираются кучей из потока,
+        так что в памяти не больше end_index записей.
+        """
         if self._sorter:
             try:
-                key_func = self._sorter
-                if callable(key_func):
-                    sample_result = key_func({}) if teachers else (None, False)
-                    reverse = (
-                        sample_result[1]
-                        if isinstance(sample_result, tuple) and len(sample_result) > 1
-                        else False
-                    )
-
-                    result = sorted(result, key=lambda t: key_func(t)[0], reverse=reverse)
+                sort_key = self._sort_key() if end_index <= STREAM_TOP_MAX else None
+                if sort_key is not None:
+                    key, reverse = sort_key
+                    select = heapq.nlargest if reverse else heapq.nsmallest
+                    with closing(self._iter_filtered()) as rows:
+                        return select(end_index, rows, key=key)[start_index:end_index]
             except (TypeError, IndexError) as e:
                 print(f"Ошибка сортировки: {e}")
+            else:
+                # Большая страница или поля в разные стороны - нужен весь отфильтрованный набор
+                return self._top(self._filtered(None), end_index)[start_index:end_index]
 
-        return result
+        with closing(self._iter_filtered()) as rows:
+            return list(islice(rows, start_index, end_index))
+
+    def _presorted(self, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Отфильтрованные записи уже в порядке сортировки от самого репозитория
+        (filter_rows_sorted: индекс фамилий TeacherRepIndexed, колоночный TeacherRepColumnar,
+        ORDER BY в БД) или None, если репозиторий так не умеет.
+        """
+        filter_rows_sorted = getattr(self._repository, "filter_rows_sorted", None)
+        spec = SortSpec.of(self._sorter)
+        if filter_rows_sorted is None or (self._sorter is not None and spec is None):
+            return None
+        return filter_rows_sorted(self._filters, spec, limit)
+
+    def _filtered_sorted(
+        self, fields: Optional[Sequence[str]], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Отфильтрованные и отсортированные записи (limit - нужны только первые limit)"""
+        rows = self._presorted(limit)
+        if rows is not None:
+            return rows
+        filtered = self._filtered(fields)
+        return self._sort(filtered) if limit is None else self._top(filtered, limit)
 
     def _ensure_file_exists(self) -> None:
         """Делегирование создания файла декорируемому объекту"""
         self._repository._ensure_file_exists()
 
-    def read_all(self) -> List[Dict[str, Any]]:
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """Чтение всех преподавателей с применением фильтров и сортировки"""
-        teachers = self._repository.read_all()
-        return self._apply_filters_and_sorting(teachers)
+        return self._project_all(self._filtered_sorted(fields), fields)
 
-    def write_all(self, data: List[Dict[str, Any]]) -> str:
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        """
+        Потоковое чтение с фильтрами.
+        Без сортировки записи проверяются по одной по мере чтения, иначе нужен весь набор.
+        """
+        if self._sorter:
+            yield from self._filtered_sorted(None)
+            return
+        with closing(self._iter_filtered(chunk_size)) as rows:
+            yield from rows
+
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
         """Делегирование записи декорируемому объекту"""
         return self._repository.write_all(data)
 
-    def get_by_id(self, id_teacher: int) -> Optional[Dict[str, Any]]:
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Делегирование получения по ID"""
-        return self._repository.get_by_id(id_teacher)
+        return self._repository.get_by_id(id_teacher, fields)
 
-    def get_k_n_short_list(self, k: int, n: int) -> List[Dict[str, Any]]:
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Делегирование получения нескольких объектов по ID"""
+        return self._repository.get_many(ids, fields)
+
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Получить список с пагинацией с учетом фильтров и сортировки
 
         Args:
             k: Количество элементов на странице
             n: Номер страницы
+            fields: Поля записи, которые нужно вернуть (None - все)
 
         Returns:
             Список преподавателей в коротком формате
         """
-        all_teachers = self._repository.read_all()
-
-        # Применяем фильтры и сортировку
-        filtered_teachers = self._apply_filters_and_sorting(all_teachers)
-
-        # Применяем пагинацию
+        # Применяем фильтры и пагинацию: сортируем только первые n * k записей
         start_index = (n - 1) * k
         end_index = start_index + k
 
-        if start_index >= len(filtered_teachers):
-            return []
-
-        return filtered_teachers[start_index:end_index]
+        rows = self._presorted(end_index)
+        if rows is not None:
+            page = rows[start_index:end_index]
+        elif hasattr(self._repository, "filter_rows"):
+            page = self._top(self._filtered(fields), end_index)[start_index:end_index]
+        else:
+            page = self._stream_page(start_index, end_index)
+        return self._project_all(page, fields)
 
     def sort_by_field(self, field: str) -> str:
         """Делегирование сортировки декорируемому объекту"""
@@ -219,6 +526,10 @@ class TeacherRepDecorator(BaseTeacherRepository):
             first_name, last_name, email, academic_degree, administrative_position, experience_years
         )
 
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        """Делегирование массового добавления"""
+        return self._repository.add_many(teachers)
+
     def update_teacher(
         self,
         id_teacher: int,
@@ -244,6 +555,10 @@ class TeacherRepDecorator(BaseTeacherRepository):
         """Делегирование удаления"""
         return self._repository.delete_teacher(id_teacher)
 
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Делегирование пакетных операций"""
+        return self._repository.apply_batch(operations)
+
     def get_count(self) -> int:
         """
         Получить количество элементов с учетом фильтров
@@ -251,6 +566,11 @@ class TeacherRepDecorator(BaseTeacherRepository):
         Returns:
             Количество преподавателей после применения фильтров
         """
-        all_teachers = self._repository.read_all()
-        filtered_teachers = self._apply_filters_and_sorting(all_teachers)
-        return len(filtered_teachers)
+        # Для подсчета порядок не важен - сортировку не выполняем
+        count_rows = getattr(self._repository, "count_rows", None)
+        if count_rows is not None:
+            return count_rows(self._filters)
+        if not self._filters:
+            return self._repository.get_count()
+        # Отдельный проход по потоку: записи проверяются и сразу отбрасываются
+        return self._compile(compile_count)(self._repository.iter_all())
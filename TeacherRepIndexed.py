@@ -0,0 +1,245 @@
+import os
+from typing import Any, ContextManager, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from BaseTeacherRepository import TEACHER_FIELDS, BaseTeacherRepository
+from TeacherIndex import TeacherIndex
+from TeacherRecord import TeacherRecord, as_records
+from TeacherRepDecorator import SurnameFilter, compile_filter
+from TeacherSortSpec import SortSpec, collation_key
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Время изменения и размер файла хранилища (None - не файл или файла нет)"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TeacherRepIndexed(BaseTeacherRepository):
+    """
+    Репозиторий-обертка, который держит записи в памяти вместе с вторичными индексами
+    (TeacherIndex) и отвечает на фильтры декоратора без полного просмотра.
+    Записи хранятся компактными TeacherRecord, а не словарями.
+    Изменения пишутся в оборачиваемое хранилище сразу, индексы обновляются инкрементально.
+    Запись идет с проверкой версии, при которой индекс прочитан: если файл тем временем
+    изменил другой процесс, индекс перечитывается и изменение повторяется.
+    Если файл хранилища изменен извне, данные и индексы перечитываются и при чтении.
+    """
+
+    def __init__(self, repository: BaseTeacherRepository) -> None:
+        self._repository = repository
+        self.file_path = getattr(repository, "file_path", "")
+        self._index: Optional[TeacherIndex] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._version: Optional[int] = None  # версия хранилища, при которой прочитан индекс
+
+    def _ensure_file_exists(self) -> None:
+        self._repository._ensure_file_exists()
+
+    def _load(self) -> TeacherIndex:
+        """Индекс актуального содержимого хранилища"""
+        signature = file_signature(self.file_path)
+        if self._index is None or signature != self._signature:
+            data, self._version = self._repository._read_versioned()
+            self._index = TeacherIndex(as_records(data))
+            self._signature = signature
+        return self._index
+
+    # Чтение-изменение-запись: версии дает оборачиваемое хранилище
+
+    def _read_index(self) -> Tuple[TeacherIndex, Optional[int]]:
+        index = self._load()
+        return index, self._version
+
+    def _write_index(self, index: TeacherIndex, version: Optional[int]) -> bool:
+        written = False
+        try:
+            written = self._repository._write_versioned(index.live_rows(), version)
+        finally:
+            if not written:
+                # Индекс уже изменен, а хранилище нет (ошибка или конфликт) - перечитаем
+                self._index = None
+        if written:
+            self._index = index
+            self._version = None if version is None else version + 1
+            self._signature = file_signature(self.file_path)
+        return written
+
+    def _read_versioned(self) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        return self._repository._read_versioned()
+
+    def _write_versioned(self, data: Sequence[Mapping[str, Any]], version: Optional[int]) -> bool:
+        return self._write_index(TeacherIndex(as_records(data)), version)
+
+    def _exclusive(self) -> ContextManager[None]:
+        return self._repository._exclusive()
+
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        rows = self._load().live_rows()
+        if fields is None:
+            # Копии: вызывающий код может менять записи, индекс не должен это видеть
+            return [row.copy() for row in rows]
+        return self._project_all(rows, fields)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        for row in self._load().live_rows():
+            yield row.copy()
+
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
+        # Версию после записи без проверки не узнать - индекс перечитается при обращении
+        self._index = None
+        return self._repository.write_all(data)
+
+    def filter_rows(self, filters: Sequence[Any]) -> List[Any]:
+        """
+        Записи, прошедшие фильтры, в порядке хранилища.
+        Индексируемые фильтры отвечают масками, остальные проверяются построчно.
+        Наружу отдаются копии: записи индекса изменяемы, а индекс не должен видеть правок.
+        """
+        index = self._load()
+        mask, residual = index.select(filters)
+        rows = index.rows_for(mask)
+        if residual:
+            rows = compile_filter(residual)(rows)
+        return [row.copy() for row in rows]
+
+    def filter_rows_sorted(
+        self, filters: Sequence[Any], spec: Optional[SortSpec], limit: Optional[int] = None
+    ) -> Optional[List[Any]]:
+        """
+        Записи, прошедшие фильтры, сразу в порядке сортировки, если его дает индекс фамилий
+        (только по фамилии, по возрастанию), иначе None.
+        Префикс SurnameFilter сужает просмотр до диапазона индекса, limit останавливает его.
+        """
+        if spec is None or len(spec.keys) != 1:
+            return None
+        sort_key = spec.keys[0]
+        if (sort_key.field, sort_key.transform) != ("last_name", collation_key):
+            return None
+        if sort_key.reverse:
+            # Порядок равных фамилий при обратной сортировке не совпадает с индексом
+            return None
+
+        index = self._load()
+        prefixes = [f.starts_with for f in filters if isinstance(f, SurnameFilter)]
+        prefix = max(prefixes, key=len, default="")
+        # Префиксы, которые следуют из самого длинного, уже учтены диапазоном
+        others = [
+            f
+            for f in filters
+            if not (isinstance(f, SurnameFilter) and prefix.startswith(f.starts_with))
+        ]
+        mask, residual = index.select(others)
+        if not residual:
+            rows = index.rows_by_surname(mask, prefix, limit)
+        else:
+            rows = compile_filter(residual)(index.rows_by_surname(mask, prefix))
+            if limit is not None:
+                rows = rows[:limit]
+        return [row.copy() for row in rows]
+
+    def count_rows(self, filters: Sequence[Any]) -> int:
+        index = self._load()
+        mask, residual = index.select(filters)
+        if residual:
+            return len(compile_filter(residual)(index.rows_for(mask)))
+        return index.count(mask)
+
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        row = self._load().get(id_teacher)
+        if row is None:
+            return None
+        return self._project_all([row.copy()], fields)[0]
+
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        index = self._load()
+        rows = [row.copy() for row in map(index.get, ids) if row is not None]
+        return self._project_all(rows, fields)
+
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        start = (n - 1) * k
+        page = [row.copy() for row in self._load().live_rows()[start : start + k]]
+        short_list = self._project_all(page, fields)
+        for short_entity in short_list:
+            if "first_name" in short_entity:
+                short_entity["first_name"] = short_entity["first_name"][0] + "."
+        return short_list
+
+    def get_count(self) -> int:
+        return len(self._load())
+
+    def add_teacher(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        academic_degree: str,
+        administrative_position: str,
+        experience_years: int,
+    ) -> int:
+        def change(index: TeacherIndex) -> Tuple[int, bool]:
+            new_id = index.max_id + 1
+            index.add(
+                TeacherRecord(
+                    new_id,
+                    first_name,
+                    last_name,
+                    email,
+                    academic_degree,
+                    administrative_position,
+                    experience_years,
+                )
+            )
+            return new_id, True
+
+        return self._modify(change, self._read_index, self._write_index)
+
+    def update_teacher(
+        self,
+        id_teacher: int,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        academic_degree: Optional[str] = None,
+        administrative_position: Optional[str] = None,
+        experience_years: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        changes = dict(
+            zip(
+                TEACHER_FIELDS,
+                (first_name, last_name, email, academic_degree, administrative_position),
+            )
+        )
+
+        def change(index: TeacherIndex) -> Tuple[Optional[Dict[str, Any]], bool]:
+            current = index.get(id_teacher)
+            if current is None:
+                return None, False
+            updated = current.copy()
+            for field, value in changes.items():
+                if value:
+                    updated[field] = value
+            if experience_years is not None:
+                updated["experience_years"] = experience_years
+            index.update(updated)
+            return dict(updated), True
+
+        return self._modify(change, self._read_index, self._write_index)
+
+    def delete_teacher(self, id_teacher: int) -> str:
+        def change(index: TeacherIndex) -> Tuple[str, bool]:
+            if index.remove(id_teacher) is None:
+                return "не найден", False
+            return "ок", True
+
+        return self._modify(change, self._read_index, self._write_index)
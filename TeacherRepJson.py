@@ -1,25 +1,104 @@
 import json
 import os
+import re
+from functools import partial
 
 from BaseTeacherRepository import BaseTeacherRepository
+from FileStorage import VersionedFile, atomic_write, group_commit_writer
+from TeacherRecord import record_default
+
+READ_BLOCK_SIZE = 64 * 1024  # размер блока при потоковом чтении файла
+SEPARATORS = re.compile(r"[ \t\r\n,]*")  # пробелы и запятые между элементами массива
 
 
 class TeacherRepJson(BaseTeacherRepository):
-    def __init__(self, json_file="teachers.json"):
+    def __init__(self, json_file="teachers.json", group_commit=False):
+        # group_commit - параллельные записи и изменения из потоков процесса объединяются
+        self._writer = group_commit_writer(json_file) if group_commit else None
+        self._file = VersionedFile(json_file)
         super().__init__(json_file)
 
     def _ensure_file_exists(self):
         if not os.path.exists(self.file_path):
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            atomic_write(self.file_path, partial(self._dump, []))
 
-    def read_all(self):
+    def read_all(self, fields=None):
         if os.path.exists(self.file_path):
             with open(self.file_path, "r", encoding="utf-8") as f:
-                return json.load(f) # Преобразует JSON в Python-объект
+                data = json.load(f) # Преобразует JSON в Python-объект
+            return self._project_all(data, fields)
         return []
 
+    def iter_all(self, chunk_size=1000):
+        """Потоковое чтение JSON-массива: элементы разбираются по мере чтения блоков файла"""
+        if not os.path.exists(self.file_path):
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        array_opened = False
+
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            while True:
+                # Пропускаем пробелы и запятые между элементами
+                position = SEPARATORS.match(buffer, position).end()
+
+                if position == len(buffer):
+                    block = f.read(READ_BLOCK_SIZE)
+                    if not block:
+                        return
+                    buffer, position = block, 0
+                    continue
+
+                if not array_opened:
+                    if buffer[position] != "[":
+                        raise ValueError(f"Файл {self.file_path} не содержит JSON-массив")
+                    array_opened = True
+                    position += 1
+                    continue
+
+                if buffer[position] == "]":
+                    return
+
+                try:
+                    entity, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # Элемент разрезан границей блока - дочитываем следующий
+                    block = f.read(READ_BLOCK_SIZE)
+                    if not block:
+                        raise
+                    buffer, position = buffer[position:] + block, 0
+                    continue
+
+                yield entity
+
+    @staticmethod
+    def _dump(data, f):
+        json.dump(data, f, ensure_ascii=False, indent=2, default=record_default)
+
     def write_all(self, data):
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Файл заменяется атомарно: при сбое остается старое содержимое, а не обрезанное
+        if self._writer is not None:
+            self._writer.write(partial(self._dump, data))
+        else:
+            self._file.commit(partial(self._dump, data))
         return "ок"
+
+    def _read_versioned(self):
+        # Под разделяемой блокировкой версия соответствует прочитанным данным
+        with self._file.shared():
+            version = self._file.version()
+            return self.read_all(), version
+
+    def _write_versioned(self, data, version):
+        return self._file.commit(partial(self._dump, data), version)
+
+    def _exclusive(self):
+        return self._file.exclusive()
+
+    def _modify(self, change, read=None, write=None):
+        if self._writer is not None and read is None and write is None:
+            # Изменения потоков процесса применяются вместе: одно чтение и одна запись на пачку
+            return self._writer.modify(change, super()._modify)
+        return super()._modify(change, read, write)
@@ -0,0 +1,300 @@
+import atexit
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from BaseTeacherRepository import TEACHER_FIELDS, BaseTeacherRepository
+from TeacherRecord import Row, TeacherRecord, as_records
+from TeacherRepIndexed import file_signature
+
+DEFAULT_FLUSH_INTERVAL = 1.0  # секунды между фоновыми сбросами на диск
+DEFAULT_MAX_DIRTY = 100  # изменений, после которых сброс выполняется сразу
+
+
+class TeacherRepWriteBehind(BaseTeacherRepository):
+    """
+    Репозиторий-обертка с отложенной записью для файловых хранилищ (JSON, YAML).
+    Изменения сразу применяются к данным в памяти и видны следующим чтениям,
+    а файл перезаписывается одной записью раз в flush_interval секунд
+    или после max_dirty изменений. Записи в памяти не меняются на месте
+    (изменение заменяет запись), поэтому сброс пишет снимок без блокировки изменений.
+    Несброшенные изменения записываются в close() и при завершении процесса;
+    после аварийного завершения теряются изменения за последний интервал.
+    Если файл изменен извне, а несброшенных изменений нет, данные перечитываются.
+    Писать в файл через обертку может только один процесс: сброс идет с проверкой версии,
+    при которой данные прочитаны, и если файл тем временем изменил другой процесс,
+    flush отказывается его перезаписывать (RuntimeError), а изменения остаются в памяти.
+    """
+
+    def __init__(
+        self,
+        repository: BaseTeacherRepository,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_dirty: int = DEFAULT_MAX_DIRTY,
+    ) -> None:
+        if max_dirty <= 0:
+            raise ValueError("Порог изменений должен быть положительным")
+        self._repository = repository
+        self.file_path = getattr(repository, "file_path", "")
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        # Записи по id в порядке хранилища (dict сохраняет порядок вставки)
+        self._rows: Optional[Dict[int, Row]] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._version: Optional[int] = None  # версия хранилища, при которой прочитаны данные
+        self._dirty = 0
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Статистика для мониторинга
+        self.flushes_total = 0
+        self.flushed_changes_total = 0
+        self.flush_errors_total = 0
+
+        if flush_interval > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="teacher-write-behind", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _ensure_file_exists(self) -> None:
+        self._repository._ensure_file_exists()
+
+    # Данные в памяти
+
+    def _load(self) -> Dict[int, Row]:
+        """Актуальные записи (вызывается под self._lock)"""
+        if self._rows is None or (
+            not self._dirty and file_signature(self.file_path) != self._signature
+        ):
+            self._signature = file_signature(self.file_path)
+            data, self._version = self._repository._read_versioned()
+            self._rows = {row["id_teacher"]: row for row in as_records(data)}
+        return self._rows
+
+    def _replace(self, data: Iterable[Mapping[str, Any]]) -> None:
+        self._rows = {row["id_teacher"]: row for row in as_records(data)}
+
+    def _flush_if_full(self) -> None:
+        """
+        Сбросить данные, если накопилось max_dirty изменений. Вызывается после изменения;
+        если сброс уже идет в другом потоке, изменения запишет следующий.
+        """
+        if self._dirty >= self.max_dirty:
+            self.flush(wait=False)
+
+    @property
+    def dirty(self) -> int:
+        """Количество изменений, еще не записанных в файл"""
+        return self._dirty
+
+    # Сброс на диск
+
+    def flush(self, wait: bool = True) -> None:
+        """
+        Записать накопленные изменения одной записью (ничего не делает, если их нет).
+        wait=False - не ждать сброса, который уже выполняется в другом потоке.
+        """
+        if not self._flush_lock.acquire(blocking=wait):
+            return
+        try:
+            with self._lock:
+                if not self._dirty or self._rows is None:
+                    return
+                snapshot: List[Any] = list(self._rows.values())
+                changes = self._dirty
+                version = self._version
+            # Счетчик не обнуляется до конца записи: пока она идет, файл не перечитывается
+            try:
+                if not self._repository._write_versioned(snapshot, version):
+                    raise RuntimeError(
+                        f"Файл {self.file_path} изменен другим процессом: отложенная запись "
+                        "не перезаписывает чужие изменения (нужен один процесс-писатель)"
+                    )
+            except Exception:
+                with self._lock:
+                    self.flush_errors_total += 1
+                raise
+            with self._lock:
+                self._dirty -= changes
+                self._version = None if version is None else version + 1
+                if not self._dirty:
+                    self._signature = file_signature(self.file_path)
+                self.flushes_total += 1
+                self.flushed_changes_total += changes
+        finally:
+            self._flush_lock.release()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Ошибка отложенной записи в {self.file_path}: {e}")
+
+    def close(self) -> None:
+        """Остановить фоновый сброс и записать оставшиеся изменения"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "dirty": self._dirty,
+            "flushes": self.flushes_total,
+            "flushed_changes": self.flushed_changes_total,
+            "flush_errors": self.flush_errors_total,
+        }
+
+    # Чтение из памяти. Наружу отдаются копии, чтобы изменения вызывающего кода не попали в данные
+
+    def read_all(self, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        with self._lock:
+            rows = list(self._load().values())
+        if fields is None:
+            return [row.copy() for row in rows]
+        return self._project_all(rows, fields)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+        with self._lock:
+            rows = list(self._load().values())
+        for row in rows:
+            yield row.copy()
+
+    def write_all(self, data: Sequence[Mapping[str, Any]]) -> str:
+        with self._lock:
+            self._replace(data)
+            self._dirty += 1
+        self._flush_if_full()
+        return "ок"
+
+    def get_by_id(
+        self, id_teacher: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._load().get(id_teacher)
+        if row is None:
+            return None
+        return self._project_all([row.copy()], fields)[0]
+
+    def get_many(
+        self, ids: List[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._load()
+            found = [rows[id_teacher] for id_teacher in ids if id_teacher in rows]
+        return self._project_all([row.copy() for row in found], fields)
+
+    def get_k_n_short_list(
+        self, k: int, n: int, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        start = (n - 1) * k
+        with self._lock:
+            page = list(self._load().values())[start : start + k]
+        short_list = self._project_all([row.copy() for row in page], fields)
+        for short_entity in short_list:
+            if "first_name" in short_entity:
+                short_entity["first_name"] = short_entity["first_name"][0] + "."
+        return short_list
+
+    def get_count(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    # Изменения в памяти
+
+    def sort_by_field(self, field: str) -> str:
+        with self._lock:
+            self._replace(sorted(self._load().values(), key=lambda x: x[field]))
+            self._dirty += 1
+        self._flush_if_full()
+        return "ок"
+
+    def add_teacher(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        academic_degree: str,
+        administrative_position: str,
+        experience_years: int,
+    ) -> int:
+        with self._lock:
+            rows = self._load()
+            new_id = max(rows, default=0) + 1
+            rows[new_id] = TeacherRecord(
+                new_id,
+                first_name,
+                last_name,
+                email,
+                academic_degree,
+                administrative_position,
+                experience_years,
+            )
+            self._dirty += 1
+        self._flush_if_full()
+        return new_id
+
+    def add_many(self, teachers: List[Dict[str, Any]]) -> int:
+        if not teachers:
+            return 0
+        with self._lock:
+            rows = self._load()
+            next_id = max(rows, default=0) + 1
+            for offset, teacher in enumerate(teachers):
+                new_id = next_id + offset
+                rows[new_id] = TeacherRecord(new_id, *(teacher[field] for field in TEACHER_FIELDS))
+            self._dirty += 1
+        self._flush_if_full()
+        return len(teachers)
+
+    def update_teacher(
+        self,
+        id_teacher: int,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        academic_degree: Optional[str] = None,
+        administrative_position: Optional[str] = None,
+        experience_years: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        changes = dict(
+            zip(
+                TEACHER_FIELDS,
+                (first_name, last_name, email, academic_degree, administrative_position),
+            )
+        )
+        with self._lock:
+            rows = self._load()
+            current = rows.get(id_teacher)
+            if current is None:
+                return None
+            updated = current.copy()
+            for field, value in changes.items():
+                if value:
+                    updated[field] = value
+            if experience_years is not None:
+                updated["experience_years"] = experience_years
+            rows[id_teacher] = updated
+            self._dirty += 1
+        self._flush_if_full()
+        return dict(updated)
+
+    def delete_teacher(self, id_teacher: int) -> str:
+        with self._lock:
+            if self._load().pop(id_teacher, None) is None:
+                return "не найден"
+            self._dirty += 1
+        self._flush_if_full()
+        return "ок"
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Базовая реализация читает и записывает через read_all/write_all этой обертки
+        with self._lock:
+            results = super().apply_batch(operations)
+        self._flush_if_full()
+        return results
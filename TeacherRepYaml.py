@@ -1,26 +1,84 @@
 import os
+from functools import partial
 
 import yaml
 
 from BaseTeacherRepository import BaseTeacherRepository
+from FileStorage import VersionedFile, atomic_write, group_commit_writer
+from TeacherRecord import TeacherRecord
+
+# Компактные записи сохраняются так же, как словари
+yaml.add_representer(TeacherRecord, lambda dumper, record: dumper.represent_dict(record.to_dict()))
 
 
 class TeacherRepYaml(BaseTeacherRepository):
-    def __init__(self, yaml_file="teachers.yaml"):
+    def __init__(self, yaml_file="teachers.yaml", group_commit=False):
+        # group_commit - параллельные записи и изменения из потоков процесса объединяются
+        self._writer = group_commit_writer(yaml_file) if group_commit else None
+        self._file = VersionedFile(yaml_file)
         super().__init__(yaml_file)
 
     def _ensure_file_exists(self):
         if not os.path.exists(self.file_path):
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                yaml.dump([], f, allow_unicode=True, default_flow_style=False, indent=2)
+            atomic_write(self.file_path, partial(self._dump, []))
 
-    def read_all(self):
+    def read_all(self, fields=None):
         if os.path.exists(self.file_path):
             with open(self.file_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f) or []
+                data = yaml.safe_load(f) or []
+            return self._project_all(data, fields)
         return []
 
+    def iter_all(self, chunk_size=1000):
+        """Потоковое чтение YAML-списка: каждый элемент собирается отдельно по событиям парсера"""
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            loader = yaml.SafeLoader(f)
+            try:
+                loader.get_event()  # StreamStartEvent
+                if loader.check_event(yaml.StreamEndEvent):
+                    return  # пустой файл
+                loader.get_event()  # DocumentStartEvent
+
+                if not loader.check_event(yaml.SequenceStartEvent):
+                    # Не список (например, пустой документ) - разбираем целиком
+                    yield from loader.construct_document(loader.compose_node(None, None)) or []
+                    return
+
+                loader.get_event()  # SequenceStartEvent
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield loader.construct_document(loader.compose_node(None, None))
+            finally:
+                loader.dispose()
+
+    @staticmethod
+    def _dump(data, f):
+        yaml.dump(data, f, allow_unicode=True, default_flow_style=False, indent=2)
+
     def write_all(self, data):
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False, indent=2)
+        # Файл заменяется атомарно: при сбое остается старое содержимое, а не обрезанное
+        if self._writer is not None:
+            self._writer.write(partial(self._dump, data))
+        else:
+            self._file.commit(partial(self._dump, data))
         return "ок"
+
+    def _read_versioned(self):
+        # Под разделяемой блокировкой версия соответствует прочитанным данным
+        with self._file.shared():
+            version = self._file.version()
+            return self.read_all(), version
+
+    def _write_versioned(self, data, version):
+        return self._file.commit(partial(self._dump, data), version)
+
+    def _exclusive(self):
+        return self._file.exclusive()
+
+    def _modify(self, change, read=None, write=None):
+        if self._writer is not None and read is None and write is None:
+            # Изменения потоков процесса применяются вместе: одно чтение и одна запись на пачку
+            return self._writer.modify(change, super()._modify)
+        return super()._modify(change, read, write)
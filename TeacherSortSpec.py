@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Ё - отдельная буква после Е: в ключе она заменяется на Е и символ больше любой буквы
+YO_MARKER = "\U0010fffe"
+_COLLATION_TABLE = str.maketrans({"Ё": "Е" + YO_MARKER})
+COLLATION_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=COLLATION_CACHE_SIZE)
+def collation_key(value: str) -> str:
+    """
+    Ключ сравнения имен по русскому алфавиту без учета регистра (Ё после Е).
+    Ключ зависит только от значения, поэтому кэшируется по нему: измененная запись
+    получает ключ своего нового значения, а повторяющиеся фамилии вычисляются один раз.
+    """
+    return value.upper().translate(_COLLATION_TABLE)
+
+
+class SortKey:
+    """
+    Сортировщик вида t -> (значение, reverse) по одному полю записи.
+    Поле и преобразование известны, поэтому репозиторий с подходящим индексом
+    может отдать записи уже упорядоченными (filter_rows_sorted).
+    """
+
+    def __init__(
+        self,
+        field: str,
+        default: Any,
+        reverse: bool = False,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.field = field
+        self.default = default
+        self.reverse = reverse
+        self.transform = transform
+        # Ключ для sorted()/heapq без промежуточного кортежа
+        if transform is None:
+            self.value: Callable[[Mapping[str, Any]], Any] = lambda t: t.get(field, default)
+        else:
+            self.value = lambda t: transform(t.get(field, default))
+
+    def __call__(self, teacher: Mapping[str, Any]) -> Tuple[Any, bool]:
+        return self.value(teacher), self.reverse
+
+    def to_sql(self) -> str:
+        """Выражение ORDER BY с тем же порядком, что и value (побайтовое сравнение COLLATE "C")"""
+        column = self.field
+        if self.transform is collation_key:
+            column = f"REPLACE(UPPER({column}), 'Ё', 'Е' || CHR({ord(YO_MARKER)})) COLLATE \"C\""
+        elif isinstance(self.default, str):
+            column = f'{column} COLLATE "C"'
+        return f"{column} {'DESC' if self.reverse else 'ASC'}"
+
+
+# Поля, доступные для сортировки: значение по умолчанию и преобразование ключа
+SORT_FIELDS: Dict[str, Tuple[Any, Optional[Callable[[Any], Any]]]] = {
+    "id_teacher": (0, None),
+    "first_name": ("", collation_key),
+    "last_name": ("", collation_key),
+    "email": ("", None),
+    "academic_degree": ("", collation_key),
+    "administrative_position": ("", collation_key),
+    "experience_years": (0, None),
+}
+
+
+def sort_key(field: str, reverse: bool = False) -> SortKey:
+    """Ключ сортировки поля с правилами сравнения из SORT_FIELDS"""
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Неизвестное поле сортировки: {field}")
+    default, transform = SORT_FIELDS[field]
+    return SortKey(field, default, reverse, transform)
+
+
+def _combined(keys: Sequence[SortKey]) -> Callable[[Mapping[str, Any]], Any]:
+    if len(keys) == 1:
+        return keys[0].value
+    getters = [key.value for key in keys]
+    return lambda t: tuple([getter(t) for getter in getters])
+
+
+class SortSpec:
+    """
+    Сортировка по нескольким полям, у каждого поля свое направление.
+    Сортировка устойчивая: равные по всем ключам записи остаются в порядке хранилища.
+    """
+
+    def __init__(self, keys: Sequence[SortKey]) -> None:
+        if not keys:
+            raise ValueError("Не указаны поля сортировки")
+        self.keys: Tuple[SortKey, ...] = tuple(keys)
+        # Подряд идущие ключи с одним направлением сравниваются одним кортежем за проход
+        groups: List[List[SortKey]] = []
+        for key in self.keys:
+            if groups and groups[-1][0].reverse == key.reverse:
+                groups[-1].append(key)
+            else:
+                groups.append([key])
+        self._passes = [(_combined(group), group[0].reverse) for group in groups]
+
+    @classmethod
+    def parse(cls, spec: str) -> "SortSpec":
+        """
+        Разобрать строку вида "academic_degree,-experience_years,last_name":
+        поля через запятую, минус перед полем - по убыванию.
+        """
+        keys = []
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            reverse = part.startswith("-")
+            keys.append(sort_key(part.lstrip("+-"), reverse))
+        return cls(keys)
+
+    @classmethod
+    def of(cls, sorter: Any) -> Optional["SortSpec"]:
+        """Спецификация для сортировщика декоратора (None - произвольная функция)"""
+        if isinstance(sorter, SortSpec):
+            return sorter
+        if isinstance(sorter, SortKey):
+            return cls([sorter])
+        return None
+
+    def __repr__(self) -> str:
+        return ",".join(("-" if key.reverse else "") + key.field for key in self.keys)
+
+    def key(self) -> Optional[Tuple[Callable[[Mapping[str, Any]], Any], bool]]:
+        """Один ключ и направление, если все поля сортируются в одну сторону, иначе None"""
+        return self._passes[0] if len(self._passes) == 1 else None
+
+    def sort(self, rows: Sequence[Mapping[str, Any]]) -> List[Any]:
+        """Устойчивая сортировка: проходы от младшего ключа к старшему"""
+        result = list(rows)
+        for key_func, reverse in reversed(self._passes):
+            result.sort(key=key_func, reverse=reverse)
+        return result
+
+    def to_sql(self) -> str:
+        """ORDER BY для БД; id_teacher в конце повторяет устойчивость сортировки в памяти"""
+        terms = [key.to_sql() for key in self.keys]
+        if all(key.field != "id_teacher" for key in self.keys):
+            terms.append("id_teacher ASC")
+        return "ORDER BY " + ", ".join(terms)
@@ -1,8 +1,8 @@
 from typing import Any, Dict, Optional
 
 from BaseTeacherRepository import BaseTeacherRepository
-from Teacher import Teacher
 from TeacherDBAdapter import TeacherDBAdapter
+from TeacherValidator import TeacherValidator
 
 
 class TeacherUpdateController:
@@ -22,16 +22,7 @@ class TeacherUpdateController:
         if not existing:
             return {"success": False, "message": "Преподаватель не найден", "data": None}
 
-        required_fields = [
-            "first_name",
-            "last_name",
-            "email",
-            "academic_degree",
-            "administrative_position",
-            "experience_years",
-        ]
-
-        missing = [f for f in required_fields if f not in payload or payload[f] in (None, "")]
+        missing = TeacherValidator.missing_fields(payload)
         if missing:
             return {
                 "success": False,
@@ -39,32 +30,11 @@ class TeacherUpdateController:
                 "data": None,
             }
 
-        try:
-            experience = int(payload.get("experience_years"))
-        except (TypeError, ValueError):
-            return {"success": False, "message": "Стаж должен быть целым числом", "data": None}
-
-        try:
-            Teacher(
-                first_name=str(payload.get("first_name")),
-                last_name=str(payload.get("last_name")),
-                email=str(payload.get("email")),
-                academic_degree=str(payload.get("academic_degree")),
-                administrative_position=str(payload.get("administrative_position")),
-                experience_years=experience,
-            )
-        except Exception as exc:
-            return {"success": False, "message": str(exc), "data": None}
+        errors, teacher = TeacherValidator.validate(payload)
+        if errors:
+            return {"success": False, "message": "; ".join(errors), "data": None}
 
-        updated = self.repository.update_teacher(
-            teacher_id,
-            first_name=payload.get("first_name"),
-            last_name=payload.get("last_name"),
-            email=payload.get("email"),
-            academic_degree=payload.get("academic_degree"),
-            administrative_position=payload.get("administrative_position"),
-            experience_years=experience,
-        )
+        updated = self.repository.update_teacher(teacher_id, **teacher)
 
         if not updated:
             return {"success": False, "message": "Не удалось обновить запись", "data": None}
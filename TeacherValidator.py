@@ -0,0 +1,115 @@
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from BaseTeacherRepository import TEACHER_FIELDS
+
+EMAIL_PATTERN = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+
+FIRST_NAME_ERROR = "Некорректное имя"
+LAST_NAME_ERROR = "Некорректная фамилия"
+EMAIL_ERROR = "Некорректный email"
+DEGREE_ERROR = "Некорректная ученая степень"
+POSITION_ERROR = "Некорректная должность"
+EXPERIENCE_TYPE_ERROR = "Стаж должен быть целым числом"
+EXPERIENCE_ERROR = "Некорректный стаж работы"
+
+
+def _stripped(value: Any) -> Any:
+    return value.strip() if isinstance(value, str) else value
+
+
+def _integer(value: Any) -> Optional[int]:
+    """
+    Стаж как int: целое число или строка с ним. Дробные числа и bool не приводятся
+    (int() молча превратил бы 3.9 в 3, а True в 1) - для них None.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+class TeacherValidator:
+    """
+    Проверка полей преподавателя по правилам модели Teacher без создания объекта и без
+    исключений: ошибки возвращаются списком сообщений в порядке проверки Teacher.
+    Регулярное выражение email скомпилировано один раз, поэтому проверка подходит
+    для массовых операций (импорт, пакеты).
+    """
+
+    @staticmethod
+    def errors(
+        first_name: Any,
+        last_name: Any,
+        email: Any,
+        academic_degree: Any,
+        administrative_position: Any,
+        experience_years: Any,
+    ) -> List[str]:
+        """Ошибки значений полей (пустой список - запись корректна)"""
+        errors = []
+        if not (isinstance(first_name, str) and first_name.strip()):
+            errors.append(FIRST_NAME_ERROR)
+        if not (isinstance(last_name, str) and last_name.strip()):
+            errors.append(LAST_NAME_ERROR)
+        if not (isinstance(email, str) and EMAIL_PATTERN.match(email)):
+            errors.append(EMAIL_ERROR)
+        if not (isinstance(academic_degree, str) and academic_degree.strip()):
+            errors.append(DEGREE_ERROR)
+        if not (isinstance(administrative_position, str) and administrative_position.strip()):
+            errors.append(POSITION_ERROR)
+        if not (isinstance(experience_years, int) and experience_years >= 0):
+            errors.append(EXPERIENCE_ERROR)
+        return errors
+
+    @staticmethod
+    def missing_fields(row: Mapping[str, Any]) -> List[str]:
+        """Обязательные поля, которых нет в строке или они пустые"""
+        return [field for field in TEACHER_FIELDS if row.get(field) in (None, "")]
+
+    @staticmethod
+    def validate(row: Mapping[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Привести строку к записи (пробелы по краям строк убираются, стаж - int) и проверить ее
+        по тем же правилам, что и errors. Возвращает список ошибок и нормализованную запись.
+        """
+        get = row.get
+        first_name = _stripped(get("first_name"))
+        last_name = _stripped(get("last_name"))
+        email = _stripped(get("email"))
+        academic_degree = _stripped(get("academic_degree"))
+        administrative_position = _stripped(get("administrative_position"))
+        experience_years = _integer(_stripped(get("experience_years")))
+
+        errors = TeacherValidator.errors(
+            first_name,
+            last_name,
+            email,
+            academic_degree,
+            administrative_position,
+            0 if experience_years is None else experience_years,
+        )
+        if experience_years is None:
+            errors.append(EXPERIENCE_TYPE_ERROR)
+
+        teacher = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "academic_degree": academic_degree,
+            "administrative_position": administrative_position,
+            "experience_years": experience_years,
+        }
+        return errors, teacher
+
+    @staticmethod
+    def validate_many(rows: Iterable[Mapping[str, Any]]) -> List[List[str]]:
+        """Ошибки каждой строки по порядку (пустой список - строка корректна)"""
+        validate = TeacherValidator.validate
+        return [validate(row)[0] for row in rows]
@@ -0,0 +1,285 @@
+import argparse
+import functools
+import heapq
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from TeacherColumns import TeacherColumns, numpy_available
+from TeacherDataGenerator import TeacherDataGenerator
+from TeacherIndex import TeacherIndex
+from TeacherRecord import Row, as_records
+from TeacherRepDecorator import (
+    PARTIAL_SORT_MAX_SHARE,
+    AcademicDegreeFilter,
+    ExperienceFilter,
+    SurnameFilter,
+    TeacherFilter,
+    compile_filter,
+)
+from TeacherSortSpec import SortSpec, collation_key
+
+Rows = List[Dict[str, Any]]
+MULTI_KEY_SPEC = "academic_degree,-experience_years,last_name"
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Лучшее время из repeat запусков (секунды)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def multi_pass(rows: Rows, degree: Any, min_exp: Any, max_exp: Any, prefix: Any) -> Rows:
+    """Прежняя схема: отдельное списковое включение на каждое условие"""
+    result = rows
+    if degree is not None:
+        result = [t for t in result if t.get("academic_degree") == degree]
+    if min_exp is not None:
+        result = [t for t in result if t.get("experience_years", 0) >= min_exp]
+    if max_exp is not None:
+        result = [t for t in result if t.get("experience_years", 0) <= max_exp]
+    if prefix is not None:
+        upper = prefix.upper()
+        result = [t for t in result if t.get("last_name", "").upper().startswith(upper)]
+    return result
+
+
+def bench_filters(rows: Rows, repeat: int) -> None:
+    scenarios = [
+        ("degree", ("Доктор наук", None, None, None)),
+        ("experience 10..20", (None, 10, 20, None)),
+        ("surname prefix", (None, None, None, "Ив")),
+        ("all combined", ("Кандидат наук", 5, 25, "С")),
+    ]
+    print(f"{'Фильтры':<20}{'несколько проходов':>20}{'один проход':>18}{'ускорение':>12}")
+    for name, (degree, min_exp, max_exp, prefix) in scenarios:
+        filters: List[TeacherFilter] = []
+        if degree is not None:
+            filters.append(AcademicDegreeFilter(degree))
+        if min_exp is not None or max_exp is not None:
+            filters.append(ExperienceFilter(min_exp, max_exp))
+        if prefix is not None:
+            filters.append(SurnameFilter(prefix))
+        fused = compile_filter(filters)
+
+        expected = multi_pass(rows, degree, min_exp, max_exp, prefix)
+        assert fused(rows) == expected
+
+        old = best_of(repeat, lambda: multi_pass(rows, degree, min_exp, max_exp, prefix))
+        new = best_of(repeat, lambda: fused(rows))
+        print(f"{name:<20}{old * 1000:>17.1f} мс{new * 1000:>15.1f} мс{old / new:>11.2f}x")
+
+
+def bench_top_k(rows: Rows, repeat: int, page_size: int = 20) -> None:
+    """Страница n размера k: полная сортировка против отбора n * k записей кучей"""
+    print(f"\n{'Страница':<28}{'sorted()':>12}{'heapq':>12}{'ускорение':>12}")
+    sorters = [
+        ("фамилия", lambda t: t["last_name"], False),
+        ("стаж по убыванию", lambda t: t["experience_years"], True),
+    ]
+    for sorter_name, key, reverse in sorters:
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        for page in (1, 10, 100, 1000):
+            start, end = (page - 1) * page_size, page * page_size
+
+            def full_sort() -> Rows:
+                return sorted(rows, key=key, reverse=reverse)[start:end]
+
+            def partial() -> Rows:
+                return select(end, rows, key=key)[start:end]
+
+            assert full_sort() == partial()
+            old = best_of(repeat, full_sort)
+            new = best_of(repeat, partial)
+            name = f"{sorter_name}, стр. {page}"
+            print(f"{name:<28}{old * 1000:>9.1f} мс{new * 1000:>9.1f} мс{old / new:>11.2f}x")
+
+
+def bench_index(rows: Rows, repeat: int) -> None:
+    """Отбор по битовым маскам TeacherIndex против построчной проверки"""
+    started = time.perf_counter()
+    index = TeacherIndex(rows)
+    print(f"\nПостроение индекса: {(time.perf_counter() - started) * 1000:.0f} мс")
+
+    scenarios: List[Tuple[str, List[TeacherFilter]]] = [
+        ("degree", [AcademicDegreeFilter("Доктор наук")]),
+        ("experience 10..20", [ExperienceFilter(10, 20)]),
+        ("degree + experience", [AcademicDegreeFilter("Доктор наук"), ExperienceFilter(20)]),
+    ]
+    header = f"{'Фильтры':<22}{'проход':>10}{'индекс':>10}{'ускор.':>8}"
+    print(header + f"{'подсчет':>10}{'ускор.':>8}")
+    for name, filters in scenarios:
+        fused = compile_filter(filters)
+        assert index.rows_for(index.select(filters)[0]) == fused(rows)
+
+        scan = best_of(repeat, lambda: fused(rows))
+        indexed = best_of(repeat, lambda: index.rows_for(index.select(filters)[0]))
+        counted = best_of(repeat, lambda: index.count(index.select(filters)[0]))
+        print(
+            f"{name:<22}{scan * 1000:>7.1f} мс{indexed * 1000:>7.1f} мс{scan / indexed:>7.1f}x"
+            f"{counted * 1000:>7.2f} мс{scan / counted:>7.0f}x"
+        )
+
+
+def bench_prefix(rows: Rows, repeat: int, page_size: int = 20) -> None:
+    """Префиксный поиск с сортировкой по фамилии: проход и сортировка против индекса фамилий"""
+    index = TeacherIndex(rows)
+    live = index.all_mask()
+
+    def key(t: Dict[str, Any]) -> str:
+        return collation_key(t.get("last_name", ""))
+
+    print(f"\n{'Префикс':<24}{'найдено':>9}{'проход':>12}{'индекс':>12}{'ускорение':>12}")
+    for prefix in ("С", "Ив", "Смирн"):
+        fused = compile_filter([SurnameFilter(prefix)])
+        for name, limit in ((f"{prefix}, страница", page_size), (f"{prefix}, все", None)):
+
+            def scan() -> Rows:
+                matched = fused(rows)
+                if limit is None:
+                    return sorted(matched, key=key)
+                return heapq.nsmallest(limit, matched, key=key)
+
+            def indexed() -> List[Row]:
+                return index.rows_by_surname(live, prefix, limit)
+
+            assert scan() == indexed()
+            old = best_of(repeat, scan)
+            new = best_of(repeat, indexed)
+            found = len(index.rows_by_surname(live, prefix))
+            print(
+                f"{name:<24}{found:>9}{old * 1000:>9.1f} мс{new * 1000:>9.3f} мс"
+                f"{old / new:>11.0f}x"
+            )
+
+
+def python_page(
+    rows: Rows, filters: List[TeacherFilter], spec: SortSpec, start: int, end: int
+) -> Rows:
+    """Страница так, как ее строит декоратор над списком словарей"""
+    matched = compile_filter(filters)(rows) if filters else rows
+    sort_key = spec.key()
+    if sort_key is not None and end <= len(matched) * PARTIAL_SORT_MAX_SHARE:
+        key, reverse = sort_key
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(end, matched, key=key)[start:end]
+    return spec.sort(matched)[start:end]
+
+
+def compare_rows(spec: SortSpec) -> Callable[[Dict[str, Any], Dict[str, Any]], int]:
+    """Наивная сортировка по нескольким полям: функция сравнения двух записей"""
+
+    def compare(a: Dict[str, Any], b: Dict[str, Any]) -> int:
+        for key in spec.keys:
+            left, right = key.value(a), key.value(b)
+            if left != right:
+                result = -1 if left < right else 1
+                return -result if key.reverse else result
+        return 0
+
+    return compare
+
+
+def bench_sort_spec(rows: Rows, repeat: int) -> None:
+    """Сортировка по нескольким полям: проходы SortSpec против функции сравнения"""
+    print(f"\n{'Сортировка':<48}{'cmp_to_key':>12}{'SortSpec':>12}{'ускорение':>12}")
+    for text in (MULTI_KEY_SPEC, "-experience_years,last_name"):
+        spec = SortSpec.parse(text)
+        compare = functools.cmp_to_key(compare_rows(spec))
+        assert spec.sort(rows) == sorted(rows, key=compare)
+        old = best_of(repeat, lambda: sorted(rows, key=compare))
+        new = best_of(repeat, lambda: spec.sort(rows))
+        print(f"{text:<48}{old * 1000:>9.0f} мс{new * 1000:>9.0f} мс{old / new:>11.1f}x")
+
+
+def bench_columnar(rows: Rows, repeat: int, page_size: int = 20) -> None:
+    """Колоночный движок NumPy против списка словарей: фильтры, сортировка, страница"""
+    if not numpy_available():
+        print("\nNumPy не установлен - колоночный движок пропущен")
+        return
+    started = time.perf_counter()
+    columns = TeacherColumns(rows)
+    print(f"\nПостроение столбцов: {(time.perf_counter() - started) * 1000:.0f} мс")
+
+    doctors = [AcademicDegreeFilter("Доктор наук"), ExperienceFilter(10, 30)]
+    scenarios: List[Tuple[str, List[TeacherFilter], SortSpec, int]] = [
+        ("степень + стаж, стаж↓", doctors, SortSpec.parse("-experience_years"), 1),
+        ("префикс С, фамилия", [SurnameFilter("С")], SortSpec.parse("last_name"), 1),
+        ("без фильтров, email", [], SortSpec.parse("email"), 1),
+        ("без фильтров, фамилия, стр. 500", [], SortSpec.parse("last_name"), 500),
+        ("степень, -стаж, фамилия", [], SortSpec.parse(MULTI_KEY_SPEC), 1),
+    ]
+    print(f"{'Запрос':<34}{'словари':>12}{'NumPy':>12}{'ускорение':>12}")
+    for name, filters, spec, page in scenarios:
+        start, end = (page - 1) * page_size, page * page_size
+
+        def vectorized() -> Rows:
+            mask = columns.select(filters)[0]
+            positions = columns.positions_sorted(mask, spec.keys, end)
+            assert positions is not None  # все поля SORT_FIELDS поддерживаются столбцами
+            return columns.rows_at(positions[start:end])
+
+        vectorized()  # ключи сортировки текстовых полей строятся при первом запросе
+        assert vectorized() == python_page(rows, filters, spec, start, end)
+        old = best_of(repeat, lambda: python_page(rows, filters, spec, start, end))
+        new = best_of(repeat, vectorized)
+        print(f"{name:<34}{old * 1000:>9.1f} мс{new * 1000:>9.1f} мс{old / new:>11.1f}x")
+
+
+def traced_size(build: Callable[[], Any]) -> int:
+    """Память, занятая результатом build() (байты, по tracemalloc)"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_records(rows: Rows, repeat: int) -> None:
+    """Компактные записи TeacherRecord против словарей: память и скорость фильтрации"""
+    # Строки значений общие с rows, поэтому считаются только контейнеры записей
+    dict_size = traced_size(lambda: [dict(row) for row in rows])
+    record_size = traced_size(lambda: list(as_records(rows)))
+    print(f"\n{'Записи':<14}{'память':>12}{'на запись':>12}{'фильтр':>12}{'сортировка':>12}")
+
+    filters = [AcademicDegreeFilter("Доктор наук"), ExperienceFilter(10, 30)]
+    fused = compile_filter(filters)
+    spec = SortSpec.parse(MULTI_KEY_SPEC)
+    records = list(as_records(rows))
+    assert fused(records) == fused(rows)
+    for name, data, size in (("словари", rows, dict_size), ("TeacherRecord", records, record_size)):
+        scan = best_of(repeat, lambda: fused(data))
+        ordered = best_of(repeat, lambda: spec.sort(data))
+        print(
+            f"{name:<14}{size / 2**20:>9.1f} МБ{size / len(rows):>10.0f} Б"
+            f"{scan * 1000:>9.1f} мс{ordered * 1000:>9.0f} мс"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Микробенчмарки фильтрации декоратора")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = list(TeacherDataGenerator(args.seed).generate_with_ids(args.rows))
+    print(f"Записей: {len(rows)}, повторов: {args.repeat}\n")
+    bench_filters(rows, args.repeat)
+    bench_top_k(rows, args.repeat)
+    bench_index(rows, args.repeat)
+    bench_prefix(rows, args.repeat)
+    bench_sort_spec(rows, args.repeat)
+    bench_columnar(rows, args.repeat)
+    bench_records(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from BaseTeacherRepository import BaseTeacherRepository
+from TeacherDataGenerator import TeacherDataGenerator, write_json, write_repository, write_yaml
+from TeacherRepDecorator import (
+    AcademicDegreeFilter,
+    ExperienceFilter,
+    TeacherRepDecorator,
+    TeacherSorter,
+)
+
+BACKENDS = ("json", "yaml", "db")
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+PAGE_SIZE = 20
+FILL_CHUNK_SIZE = 50_000
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Перцентиль по методу ближайшего ранга (samples должны быть отсортированы)"""
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(fraction * len(samples)) - 1, 0)
+    return samples[rank]
+
+
+def measure(
+    operation: Callable[[int], Any], iterations: int, budget: float, warmup: int = 0
+) -> Dict[str, Any]:
+    """
+    Выполнить operation(i) до iterations раз, но не дольше budget секунд (минимум один раз).
+    Возвращает пропускную способность и задержки в миллисекундах.
+    """
+    for i in range(warmup):
+        operation(i)
+
+    samples: List[float] = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - call_started)
+        if time.perf_counter() - started >= budget:
+            break
+    total = time.perf_counter() - started
+
+    samples.sort()
+    return {
+        "iterations": len(samples),
+        "total_s": round(total, 6),
+        "ops_per_s": round(len(samples) / total, 3) if total > 0 else None,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 4),
+        "max_ms": round(samples[-1] * 1000, 4),
+    }
+
+
+def create_repository(
+    backend: str, workdir: str, db_params: Dict[str, Any]
+) -> BaseTeacherRepository:
+    """Пустое хранилище выбранного типа"""
+    if backend == "json":
+        from TeacherRepJson import TeacherRepJson
+
+        path = os.path.join(workdir, "bench_teachers.json")
+        if os.path.exists(path):
+            os.remove(path)
+        repository: BaseTeacherRepository = TeacherRepJson(path)
+    elif backend == "yaml":
+        from TeacherRepYaml import TeacherRepYaml
+
+        path = os.path.join(workdir, "bench_teachers.yaml")
+        if os.path.exists(path):
+            os.remove(path)
+        repository = TeacherRepYaml(path)
+    else:
+        from DatabaseManager import DatabaseManager
+        from TeacherDBAdapter import TeacherDBAdapter
+
+        # Параметры задаются до первого создания синглтона
+        if not DatabaseManager(**db_params).connect():
+            raise RuntimeError("PostgreSQL недоступен")
+        repository = TeacherDBAdapter()
+        repository.teacher_rep_db.clear_table_completely()  # type: ignore[attr-defined]
+
+    repository._ensure_file_exists()
+    return repository
+
+
+def fill_repository(
+    repository: BaseTeacherRepository, backend: str, size: int, generator: TeacherDataGenerator
+) -> None:
+    """Потоковое заполнение: в памяти не держится весь набор записей"""
+    if backend == "json":
+        write_json(repository.file_path, generator.generate_with_ids(size))
+    elif backend == "yaml":
+        write_yaml(repository.file_path, generator.generate_with_ids(size))
+    else:
+        write_repository(repository, generator.generate(size), FILL_CHUNK_SIZE)
+
+
+def run_backend(
+    backend: str, size: int, args: argparse.Namespace, db_params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    repository = create_repository(backend, args.workdir, db_params)
+
+    generator = TeacherDataGenerator(args.seed)
+    fill_started = time.perf_counter()
+    fill_repository(repository, backend, size, generator)
+    fill_seconds = time.perf_counter() - fill_started
+    print(f"[{backend} / {size}] заполнение: {fill_seconds:.2f} с", flush=True)
+
+    rng = random.Random(args.seed)
+    ids = [entity["id_teacher"] for entity in repository.read_all(["id_teacher"])]
+    count = len(ids)
+    last_page = max(math.ceil(count / PAGE_SIZE), 1)
+    random_ids = [rng.choice(ids) for _ in range(args.iterations)]
+
+    filtered = TeacherRepDecorator(repository)
+    filtered.add_filter(AcademicDegreeFilter("Доктор наук"))
+    filtered.add_filter(ExperienceFilter(min_experience=10, max_experience=30))
+    filtered.set_sorter(TeacherSorter.by_surname())
+
+    added_ids: List[int] = []
+
+    # Генератор продолжает последовательность, поэтому email новых записей уникальны
+    new_teachers = generator.generate(args.iterations)
+
+    def add(i: int) -> None:
+        added_ids.append(repository.add_teacher(**next(new_teachers)))
+
+    def update(i: int) -> None:
+        repository.update_teacher(random_ids[i], experience_years=i % 40)
+
+    def delete(i: int) -> None:
+        repository.delete_teacher(added_ids[i])
+
+    operations = [
+        ("read_all", lambda i: repository.read_all(), True),
+        ("get_by_id", lambda i: repository.get_by_id(random_ids[i]), True),
+        ("page_first", lambda i: repository.get_k_n_short_list(PAGE_SIZE, 1), True),
+        (
+            "page_middle",
+            lambda i: repository.get_k_n_short_list(PAGE_SIZE, last_page // 2 + 1),
+            True,
+        ),
+        ("page_last", lambda i: repository.get_k_n_short_list(PAGE_SIZE, last_page), True),
+        ("sort_by_field", lambda i: repository.sort_by_field("last_name"), True),
+        ("filtered_page_first", lambda i: filtered.get_k_n_short_list(PAGE_SIZE, 1), True),
+        ("filtered_count", lambda i: filtered.get_count(), True),
+        ("add_teacher", add, False),
+        ("update_teacher", update, False),
+    ]
+
+    results = []
+    for name, operation, warm in operations:
+        stats = measure(operation, args.iterations, args.budget, args.warmup if warm else 0)
+        results.append(_result_row(backend, size, name, stats))
+
+    # Удаляем ровно те записи, что добавили, чтобы размер набора не менялся
+    stats = measure(delete, len(added_ids), args.budget)
+    results.append(_result_row(backend, size, "delete_teacher", stats))
+    return results
+
+
+def _result_row(backend: str, size: int, name: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+    row = {"backend": backend, "size": size, "operation": name, **stats}
+    print(
+        f"  {name:<22} n={stats['iterations']:<5} {stats['ops_per_s'] or 0:>10.1f} оп/с"
+        f"  p50={stats['p50_ms']:>10.3f} мс  p99={stats['p99_ms']:>10.3f} мс",
+        flush=True,
+    )
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Нагрузочное сравнение репозиториев преподавателей"
+    )
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--iterations", type=int, default=50, help="Повторов на операцию")
+    parser.add_argument(
+        "--budget", type=float, default=10.0, help="Предел времени на операцию, с"
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="Прогревочных вызовов чтения")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=tempfile.gettempdir(), help="Каталог для файлов")
+    parser.add_argument("--output", default="benchmark_results.json", help="Файл результатов")
+    parser.add_argument("--db-host", default="localhost")
+    parser.add_argument("--db-port", default="5433")
+    parser.add_argument("--db-name", default="postgres")
+    parser.add_argument("--db-user", default="postgres")
+    parser.add_argument("--db-password", default="password")
+    args = parser.parse_args()
+
+    db_params = {
+        "dbname": args.db_name,
+        "user": args.db_user,
+        "password": args.db_password,
+        "host": args.db_host,
+        "port": args.db_port,
+    }
+
+    results: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    for backend in args.backends:
+        for size in args.sizes:
+            try:
+                results.extend(run_backend(backend, size, args, db_params))
+            except RuntimeError as exc:
+                print(f"[{backend} / {size}] пропущено: {exc}", flush=True)
+                skipped.append({"backend": backend, "size": size, "reason": str(exc)})
+                break
+
+    report = {
+        "meta": {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "budget_s": args.budget,
+            "seed": args.seed,
+            "page_size": PAGE_SIZE,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+import argparse
+import http.client
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+# Доли типов запросов по умолчанию
+DEFAULT_MIX = {"list": 50, "filter": 20, "detail": 20, "create": 4, "update": 4, "delete": 2}
+PAGE_SIZE = 20
+FILTER_QUERIES = (
+    "degree=" + quote("Доктор наук") + "&sort=last_name",
+    "min_experience=10&max_experience=20&sort=experience_years",
+    "surname_prefix=" + quote("С") + "&sort=last_name",
+)
+
+
+def parse_mix(raw: str) -> Dict[str, int]:
+    """Разобрать строку вида list=50,detail=20,..."""
+    mix: Dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Неизвестный тип запроса: {name}")
+        try:
+            mix[name] = int(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Некорректный вес: {part}")
+    return mix
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Перцентиль по методу ближайшего ранга (samples должны быть отсортированы)"""
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(fraction * len(samples)) - 1, 0)
+    return samples[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(samples, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "p999_ms": round(percentile(samples, 0.999) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3) if samples else 0.0,
+    }
+
+
+def correct_for_omission(samples: List[float], expected_interval: float) -> List[float]:
+    """
+    Поправка на coordinated omission для закрытой модели (как в HdrHistogram):
+    пока запрос длился L, клиент не отправил запросы, которые должен был отправить
+    каждые expected_interval секунд - добавляем их с задержками L - interval, L - 2*interval...
+    """
+    if expected_interval <= 0:
+        return list(samples)
+    corrected = list(samples)
+    for latency in samples:
+        missed = latency - expected_interval
+        while missed >= expected_interval:
+            corrected.append(missed)
+            missed -= expected_interval
+    return corrected
+
+
+class LoadTest:
+    """
+    Генератор нагрузки на HTTP API преподавателей.
+    Закрытая модель: concurrency потоков шлют запросы друг за другом.
+    Открытая модель: запросы планируются с частотой rate в секунду независимо от ответов,
+    задержка считается от запланированного момента (без coordinated omission).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        mix: Dict[str, int],
+        duration: float,
+        concurrency: int = 8,
+        rate: Optional[float] = None,
+        timeout: float = 30.0,
+        seed: int = 42,
+    ) -> None:
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.mix = {name: weight for name, weight in mix.items() if weight > 0}
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.seed = seed
+
+        self._lock = threading.Lock()
+        self._known_ids: List[int] = []
+        self._created_ids: List[int] = []
+        self._emails = itertools.count(1)
+        self._schedule = itertools.count()
+        # тип запроса -> задержки (от отправки) и задержки от запланированного момента
+        self._latencies: Dict[str, List[float]] = {name: [] for name in self.mix}
+        self._intended: Dict[str, List[float]] = {name: [] for name in self.mix}
+        self._errors: Dict[str, Dict[str, int]] = {name: {} for name in self.mix}
+        self._total_pages = 1
+
+    def run(self) -> Dict[str, Any]:
+        self._discover()
+        started = time.perf_counter()
+        deadline = started + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(index, started, deadline), daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self._report(time.perf_counter() - started)
+
+    def _discover(self) -> None:
+        """Узнать существующие ID и число страниц до начала нагрузки"""
+        status, body = self._request("GET", "/api/teachers?page_size=1000&page=1&fields=id")
+        if status != 200:
+            raise RuntimeError(f"Сервер недоступен или вернул {status}")
+        payload = json.loads(body)
+        self._known_ids = [item["id"] for item in payload["items"]]
+        self._total_pages = max(math.ceil(payload["total"] / PAGE_SIZE), 1)
+        if not self._known_ids:
+            raise RuntimeError("В хранилище нет записей для запросов по ID")
+
+    def _worker(self, index: int, started: float, deadline: float) -> None:
+        rng = random.Random(self.seed + index)
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+
+        while True:
+            if self.rate:
+                # Открытая модель: берем следующий слот общего расписания
+                intended = started + next(self._schedule) / self.rate
+                if intended >= deadline:
+                    return
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                intended = time.perf_counter()
+                if intended >= deadline:
+                    return
+
+            name = rng.choices(names, weights)[0]
+            route, teacher_id = self._target(name, rng)
+            sent = time.perf_counter()
+            try:
+                status = self._perform(route, teacher_id, rng)
+                error = None if status < 400 else str(status)
+            except (OSError, http.client.HTTPException) as exc:
+                error = type(exc).__name__
+            except ValueError:
+                # Ответ 200 с телом не в JSON - ошибка сервера, а не повод остановить поток
+                error = "invalid_json"
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._latencies.setdefault(route, []).append(finished - sent)
+                self._intended.setdefault(route, []).append(finished - intended)
+                route_errors = self._errors.setdefault(route, {})
+                if error is not None:
+                    route_errors[error] = route_errors.get(error, 0) + 1
+
+    def _target(self, name: str, rng: random.Random) -> Tuple[str, Optional[int]]:
+        """
+        Маршрут, который действительно будет вызван, и id записи для update/delete.
+        update/delete работают только с записями, созданными самим тестом; пока их нет,
+        выполняется create, и замер попадает в create, а не в выбранный маршрут.
+        """
+        if name not in ("update", "delete"):
+            return name, None
+        with self._lock:
+            if not self._created_ids:
+                return "create", None
+            teacher_id = rng.choice(self._created_ids)
+            if name == "delete":
+                self._created_ids.remove(teacher_id)
+        return name, teacher_id
+
+    def _perform(self, name: str, teacher_id: Optional[int], rng: random.Random) -> int:
+        if name == "list":
+            page = rng.randint(1, self._total_pages)
+            return self._request("GET", f"/api/teachers?page={page}&page_size={PAGE_SIZE}")[0]
+
+        if name == "filter":
+            query = rng.choice(FILTER_QUERIES)
+            return self._request("GET", f"/api/teachers?{query}&page=1&page_size={PAGE_SIZE}")[0]
+
+        if name == "detail":
+            return self._request("GET", f"/api/teachers/{rng.choice(self._known_ids)}")[0]
+
+        if name == "create":
+            status, body = self._request("POST", "/api/teachers", self._new_teacher(rng))
+            if status == 200:
+                payload = json.loads(body)
+                new_id = payload.get("id") if isinstance(payload, dict) else None
+                if new_id is not None:
+                    with self._lock:
+                        self._created_ids.append(new_id)
+            return status
+
+        if name == "update":
+            payload = self._new_teacher(rng)
+            return self._request("PUT", f"/api/teachers/{teacher_id}", payload)[0]
+
+        return self._request("DELETE", f"/api/teachers/{teacher_id}")[0]
+
+    def _new_teacher(self, rng: random.Random) -> Dict[str, Any]:
+        number = next(self._emails)
+        return {
+            "first_name": "Нагрузка",
+            "last_name": f"Тестов{number}",
+            "email": f"load{self.seed}-{number}-{rng.randrange(10**9)}@load.example.com",
+            "academic_degree": rng.choice(("Кандидат наук", "Доктор наук")),
+            "administrative_position": "Доцент",
+            "experience_years": rng.randint(0, 40),
+        }
+
+    def _request(
+        self, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, bytes]:
+        # Сервер отвечает по HTTP/1.0 и закрывает соединение, поэтому новое на каждый запрос
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            headers = {}
+            body = None
+            if payload is not None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                headers["Content-Type"] = "application/json"
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def _report(self, elapsed: float) -> Dict[str, Any]:
+        all_latencies = [value for values in self._latencies.values() for value in values]
+        all_intended = [value for values in self._intended.values() for value in values]
+        total = len(all_latencies)
+        errors = sum(sum(counts.values()) for counts in self._errors.values())
+
+        if self.rate:
+            corrected = all_intended
+            correction = "intended_start"
+        else:
+            # Ожидаемый интервал - среднее время ответа при полной загрузке потока
+            expected = sum(all_latencies) / total if total else 0.0
+            corrected = correct_for_omission(all_latencies, expected)
+            correction = f"expected_interval={expected * 1000:.3f}ms"
+
+        routes = {}
+        for name in self._latencies:
+            route_errors = sum(self._errors[name].values())
+            count = len(self._latencies[name])
+            routes[name] = {
+                **summarize(self._latencies[name]),
+                "errors": route_errors,
+                "error_rate": round(route_errors / count, 4) if count else 0.0,
+                "error_kinds": self._errors[name],
+            }
+
+        return {
+            "mode": f"rate={self.rate}/s" if self.rate else f"concurrency={self.concurrency}",
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "latency": summarize(all_latencies),
+            "corrected_latency": {**summarize(corrected), "method": correction},
+            "routes": routes,
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Режим: {report['mode']}, длительность {report['elapsed_s']} с")
+    print(
+        f"Запросов: {report['requests']}, {report['throughput_rps']} в секунду, "
+        f"ошибок: {report['errors']} ({report['error_rate'] * 100:.2f}%)"
+    )
+    header = f"{'':<12}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'p99.9':>10}{'max':>10}"
+    print(header + f"{'errors':>8}")
+    rows = [("all", report["latency"]), ("corrected", report["corrected_latency"])]
+    rows.extend(report["routes"].items())
+    for name, stats in rows:
+        print(
+            f"{name:<12}{stats['count']:>8}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}"
+            f"{stats['p99_ms']:>10.2f}{stats['p999_ms']:>10.2f}{stats['max_ms']:>10.2f}"
+            f"{stats.get('errors', ''):>8}"
+        )
+    print(f"Поправка на coordinated omission: {report['corrected_latency']['method']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочное тестирование web_server.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Адрес сервера")
+    parser.add_argument("--duration", type=float, default=30.0, help="Длительность, с")
+    parser.add_argument("--concurrency", type=int, default=8, help="Число потоков-клиентов")
+    parser.add_argument(
+        "--rate", type=float, help="Фиксированная частота запросов в секунду (открытая модель)"
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="Доли запросов: list=50,filter=20,detail=20,create=4,update=4,delete=2",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Сохранить отчет в JSON")
+    args = parser.parse_args()
+
+    load_test = LoadTest(
+        args.url,
+        args.mix,
+        args.duration,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    report = load_test.run()
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
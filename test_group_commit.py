@@ -0,0 +1,76 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any, Dict, List
+
+from TeacherRepJson import TeacherRepJson
+
+
+def teacher(first_name: str) -> dict:
+    return {
+        "first_name": first_name,
+        "last_name": "Иванов",
+        "email": f"{first_name.lower()}@example.com",
+        "academic_degree": "Кандидат наук",
+        "administrative_position": "Доцент",
+        "experience_years": 5,
+    }
+
+
+class GroupCommitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.repository = TeacherRepJson(
+            os.path.join(directory.name, "teachers.json"), group_commit=True
+        )
+        self.repository.write_all([])
+
+    def test_rejected_batch_does_not_leak_into_group(self) -> None:
+        writer = self.repository._writer
+        leader_started = threading.Event()
+        release_leader = threading.Event()
+
+        def blocking_change(data: list) -> tuple:
+            leader_started.set()
+            release_leader.wait()
+            return None, False
+
+        results = {}
+        batch: List[Dict[str, Any]] = [
+            {"op": "create", "data": teacher("Ghost")},
+            {"op": "delete", "id": 999},
+        ]
+        calls = {
+            "leader": lambda: self.repository._modify(blocking_change),
+            "batch": lambda: self.repository.apply_batch(batch),
+            "add": lambda: self.repository.add_teacher(*teacher("Real").values()),
+        }
+
+        def run(name: str) -> None:
+            results[name] = calls[name]()
+
+        threads = {name: threading.Thread(target=run, args=(name,)) for name in calls}
+        threads["leader"].start()
+        leader_started.wait()
+        # Пока лидер занят, пакет с ошибкой и добавление попадают в одну группу
+        threads["batch"].start()
+        threads["add"].start()
+        deadline = time.monotonic() + 5
+        while len(writer._pending) < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(len(writer._pending), 2)
+        release_leader.set()
+        for thread in threads.values():
+            thread.join()
+
+        self.assertFalse(any(result["success"] for result in results["batch"]))
+        self.assertEqual(results["add"], 1)
+        rows = self.repository.read_all()
+        self.assertEqual([row["first_name"] for row in rows], ["Real"])
+
+
+if __name__ == "__main__":
+    unittest.main()
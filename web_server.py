@@ -1,47 +1,257 @@
+import io
 import json
-from functools import partial
+import time
+from functools import partial, wraps
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from urllib.parse import parse_qs, urlparse
 
+from DatabaseManager import DatabaseManager
+from Metrics import REGISTRY, instrument_methods
+from RequestProfiler import RequestProfiler
+from SamplingProfiler import SamplingProfiler
+from TeacherBatchController import TeacherBatchController
+from TeacherCache import TeacherCache
+from TeacherChangeListener import TeacherChangeListener
 from TeacherController import TeacherController
 from TeacherCreateController import TeacherCreateController
-from TeacherUpdateController import TeacherUpdateController
+from TeacherDBAdapter import TeacherDBAdapter
 from TeacherDeleteController import TeacherDeleteController
+from TeacherImportController import TeacherImportController
+from TeacherRecord import record_default
+from TeacherRepCached import TeacherRepCached
+from TeacherUpdateController import TeacherUpdateController
 
 BASE_DIR = Path(__file__).parent
 PUBLIC_DIR = BASE_DIR / "public"
+MAX_IDS_PER_REQUEST = 500
+STREAM_FLUSH_BYTES = 64 * 1024  # размер чанка при потоковой выгрузке
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Методы репозитория, время которых попадает в метрики
+REPOSITORY_METHODS = (
+    "read_all",
+    "write_all",
+    "get_by_id",
+    "get_many",
+    "get_k_n_short_list",
+    "get_count",
+    "sort_by_field",
+    "add_teacher",
+    "add_many",
+    "update_teacher",
+    "delete_teacher",
+    "apply_batch",
+)
+# Маршруты API, которые попадают в метки метрик как есть
+KNOWN_ROUTES = {
+    "/api/teachers",
+    "/api/teachers/batch",
+    "/api/teachers/export",
+    "/api/teachers/import",
+    "/metrics",
+    "/admin/profiling",
+    "/admin/sampling",
+    "/admin/sampling/collapsed",
+}
+# Служебные маршруты доступны только с локальной машины
+ADMIN_CLIENTS = ("127.0.0.1", "::1")
+PROFILE_FORMATS = {
+    "pstats": "application/octet-stream",
+    "collapsed": "text/plain; charset=utf-8",
+    "text": "text/plain; charset=utf-8",
+}
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Количество HTTP-запросов", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Длительность обработки HTTP-запросов", ("method", "route")
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "Количество запросов в обработке"
+)
+
+# Время жизни кэша, когда изменения из других процессов приходят уведомлениями БД
+LISTENING_CACHE_TTL = 600.0
+
+PROFILER = RequestProfiler()
+SAMPLER = SamplingProfiler()
+
+
+def create_repository() -> TeacherRepCached:
+    """
+    Общий репозиторий для всех контроллеров: кэш чтения поверх БД.
+    Время вызовов меряется у БД, то есть только для промахов кэша и изменений.
+    """
+    return TeacherRepCached(instrument_methods(TeacherDBAdapter(), REPOSITORY_METHODS))
+
+
+def register_db_metrics(db: DatabaseManager) -> None:
+    """Метрики подключения к БД вычисляются в момент выгрузки"""
+    REGISTRY.gauge(
+        "db_connected", "Есть ли подключение к БД", function=lambda: 1 if db.is_connected else 0
+    )
+    REGISTRY.counter(
+        "db_queries_total", "Количество запросов к БД", function=lambda: db.queries_total
+    )
+    REGISTRY.counter(
+        "db_query_errors_total",
+        "Количество запросов к БД, завершившихся ошибкой",
+        function=lambda: db.query_errors_total,
+    )
+
+
+def register_cache_metrics(cache: TeacherCache) -> None:
+    """Метрики кэша репозитория вычисляются в момент выгрузки"""
+    REGISTRY.counter(
+        "teacher_cache_hits_total", "Попадания в кэш репозитория", function=lambda: cache.hits
+    )
+    REGISTRY.counter(
+        "teacher_cache_misses_total", "Промахи кэша репозитория", function=lambda: cache.misses
+    )
+    REGISTRY.gauge(
+        "teacher_cache_hit_ratio", "Доля попаданий в кэш репозитория", function=cache.hit_ratio
+    )
+    REGISTRY.counter(
+        "teacher_cache_evictions_total",
+        "Значения, вытесненные из кэша по размеру",
+        function=lambda: cache.evictions,
+    )
+    REGISTRY.counter(
+        "teacher_cache_expirations_total",
+        "Значения, удаленные из кэша по TTL",
+        function=lambda: cache.expirations,
+    )
+    REGISTRY.counter(
+        "teacher_cache_invalidations_total",
+        "Значения, удаленные из кэша после изменений",
+        function=lambda: cache.invalidations,
+    )
+    REGISTRY.gauge("teacher_cache_entries", "Значений в кэше репозитория", function=cache.__len__)
+
+
+def start_change_listener(
+    repository: TeacherRepCached, db: DatabaseManager
+) -> TeacherChangeListener:
+    """
+    Сброс кэша по уведомлениям БД об изменениях из других процессов.
+    Пока уведомления доходят, кэш может жить долго.
+    """
+    listener = TeacherChangeListener(db.connection_params)
+    listener.subscribe(repository.apply_change)
+    listener.start()
+    repository.cache.ttl = LISTENING_CACHE_TTL
+
+    REGISTRY.gauge(
+        "teacher_change_listener_up",
+        "Подписан ли процесс на уведомления об изменениях",
+        function=lambda: 1 if listener.is_listening else 0,
+    )
+    REGISTRY.counter(
+        "teacher_change_notifications_total",
+        "Полученные уведомления об изменениях",
+        function=lambda: listener.notifications_total,
+    )
+    return listener
+
+
+def route_label(path: str) -> str:
+    """Шаблон маршрута для меток (id не попадает в метки, чтобы не плодить серии)"""
+    if path in KNOWN_ROUTES:
+        return path
+    if path.startswith("/api/teachers/"):
+        return "/api/teachers/{id}"
+    if path.startswith("/admin/profiles"):
+        return "/admin/profiles"
+    if path.startswith("/api/"):
+        return "/api/other"
+    return "static"
+
+
+def instrumented(method: Callable[[Any], None]) -> Callable[[Any], None]:
+    """Замер длительности, статуса и числа одновременных запросов для do_* методов"""
+
+    @wraps(method)
+    def wrapper(self: "TeacherRequestHandler") -> None:
+        self._response_status = None
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            # Профиль по заголовку дорог, поэтому его могут требовать только служебные клиенты
+            trusted = self.client_address[0] in ADMIN_CLIENTS
+            if not self.path.startswith("/admin/") and PROFILER.should_profile(
+                self.headers, trusted
+            ):
+                PROFILER.profile(f"{self.command} {self.path}", method, self)
+            else:
+                method(self)
+        finally:
+            duration = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = route_label(urlparse(self.path).path)
+            status = str(self._response_status or 500)
+            HTTP_REQUEST_DURATION.observe(duration, (self.command, route))
+            HTTP_REQUESTS.inc((self.command, route, status))
+
+    return wrapper
 
 
 class TeacherRequestHandler(SimpleHTTPRequestHandler):
     """HTTP обработчик: отдает статику и API на основе контроллера."""
 
-    controller = TeacherController()
-    create_controller = TeacherCreateController()
-    update_controller = TeacherUpdateController()
-    delete_controller = TeacherDeleteController()
+    repository = create_repository()
+    controller = TeacherController(repository)
+    create_controller = TeacherCreateController(repository)
+    update_controller = TeacherUpdateController(repository)
+    delete_controller = TeacherDeleteController(repository)
+    batch_controller = TeacherBatchController(repository)
+    import_controller = TeacherImportController(repository)
+    # Статус последнего ответа для метрик (None - ответ еще не отправлен)
+    _response_status: Optional[int] = None
 
     def __init__(self, *args, directory: str = None, **kwargs) -> None:
         directory = directory or str(PUBLIC_DIR)
         super().__init__(*args, directory=directory, **kwargs)
 
+    @instrumented
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
 
+        if parsed.path == "/metrics":
+            self._send_text(REGISTRY.render(), REGISTRY.CONTENT_TYPE)
+            return
+
         if parsed.path == "/api/teachers":
             self._handle_teachers_list(parsed)
             return
 
+        if parsed.path == "/api/teachers/export":
+            self._handle_teachers_export(parsed)
+            return
+
         if parsed.path.startswith("/api/teachers/"):
             self._handle_teacher_detail(parsed)
             return
 
+        if parsed.path == "/admin/profiling" or parsed.path.startswith("/admin/profiles"):
+            self._handle_profiles(parsed)
+            return
+
+        if parsed.path in ("/admin/sampling", "/admin/sampling/collapsed"):
+            self._handle_sampling(parsed)
+            return
+
         if parsed.path == "/":
             self.path = "/index.html"
 
         super().do_GET()
 
+    @instrumented
     def do_POST(self) -> None:
         parsed = urlparse(self.path)
 
@@ -49,8 +259,25 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
             self._handle_teacher_create()
             return
 
+        if parsed.path == "/api/teachers/batch":
+            self._handle_teacher_batch()
+            return
+
+        if parsed.path == "/api/teachers/import":
+            self._handle_teacher_import(parsed)
+            return
+
+        if parsed.path == "/admin/profiling":
+            self._handle_profiling_toggle()
+            return
+
+        if parsed.path == "/admin/sampling":
+            self._handle_sampling_toggle()
+            return
+
         self.send_error(404, "Not Found")
 
+    @instrumented
     def do_PUT(self) -> None:
         parsed = urlparse(self.path)
         if parsed.path.startswith("/api/teachers/"):
@@ -58,6 +285,7 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
             return
         self.send_error(404, "Not Found")
 
+    @instrumented
     def do_DELETE(self) -> None:
         parsed = urlparse(self.path)
         if parsed.path.startswith("/api/teachers/"):
@@ -67,20 +295,72 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
 
     def _handle_teachers_list(self, parsed) -> None:
         query = parse_qs(parsed.query)
+        if "ids" in query:
+            self._handle_teachers_many(query)
+            return
+
         page = self._safe_int(query.get("page", [1])[0], default=1)
         page_size_raw = query.get("page_size", [None])[0]
         page_size = self._safe_int(page_size_raw) if page_size_raw is not None else None
         filters = self._extract_filters(query)
         sort_by = query.get("sort", [None])[0]
 
-        payload = self.controller.get_short_teachers(
-            page_size=page_size,
-            page=page,
-            filters=filters,
-            sort_by=sort_by,
-        )
+        try:
+            payload = self.controller.get_short_teachers(
+                page_size=page_size,
+                page=page,
+                filters=filters,
+                sort_by=sort_by,
+                fields=self._extract_fields(query),
+            )
+        except ValueError as exc:
+            self._send_json({"error": str(exc)}, status=400)
+            return
+        self._send_json(payload)
+
+    def _handle_teachers_many(self, query: Dict[str, list[str]]) -> None:
+        ids_raw = query["ids"][0]
+        try:
+            ids = [int(part) for part in ids_raw.split(",") if part.strip()]
+        except ValueError:
+            self._send_json({"error": "Некорректный список идентификаторов"}, status=400)
+            return
+
+        if not ids:
+            self._send_json({"error": "Не указаны идентификаторы"}, status=400)
+            return
+        if len(ids) > MAX_IDS_PER_REQUEST:
+            self._send_json(
+                {"error": f"Не более {MAX_IDS_PER_REQUEST} идентификаторов за запрос"}, status=400
+            )
+            return
+
+        try:
+            payload = self.controller.get_teachers(ids, fields=self._extract_fields(query))
+        except ValueError as exc:
+            self._send_json({"error": str(exc)}, status=400)
+            return
         self._send_json(payload)
 
+    def _handle_teachers_export(self, parsed) -> None:
+        query = parse_qs(parsed.query)
+        export_format = query.get("format", ["ndjson"])[0]
+        content_type = EXPORT_CONTENT_TYPES.get(export_format)
+        if content_type is None:
+            self._send_json({"error": f"Неподдерживаемый формат: {export_format}"}, status=400)
+            return
+
+        try:
+            lines = self.controller.export_teachers(
+                export_format,
+                filters=self._extract_filters(query),
+                sort_by=query.get("sort", [None])[0],
+            )
+        except ValueError as exc:
+            self._send_json({"error": str(exc)}, status=400)
+            return
+        self._send_stream(lines, content_type)
+
     def _handle_teacher_detail(self, parsed) -> None:
         try:
             teacher_id = int(parsed.path.rstrip("/").split("/")[-1])
@@ -88,7 +368,12 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
             self._send_json({"error": "Некорректный идентификатор"}, status=400)
             return
 
-        teacher = self.controller.get_teacher(teacher_id)
+        try:
+            fields = self._extract_fields(parse_qs(parsed.query))
+            teacher = self.controller.get_teacher(teacher_id, fields=fields)
+        except ValueError as exc:
+            self._send_json({"error": str(exc)}, status=400)
+            return
         if teacher is None:
             self._send_json({"error": "Преподаватель не найден"}, status=404)
             return
@@ -105,6 +390,33 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
         status = 200 if result.get("success") else 400
         self._send_json(result, status=status)
 
+    def _handle_teacher_batch(self) -> None:
+        payload = self._read_json_body()
+        if payload is None:
+            self._send_json({"error": "Некорректный JSON"}, status=400)
+            return
+
+        # Допускаем как голый список операций, так и {"operations": [...]}
+        operations = payload.get("operations") if isinstance(payload, dict) else payload
+        result = self.batch_controller.apply_batch(operations)
+        status = 200 if result.get("success") else 400
+        self._send_json(result, status=status)
+
+    def _handle_teacher_import(self, parsed) -> None:
+        query = parse_qs(parsed.query)
+        import_format = query.get("format", ["csv"])[0]
+        content_length = self._safe_int(self.headers.get("Content-Length"), default=0)
+
+        # Тело читается потоково: контроллер получает текстовый поток, а не весь файл
+        body = io.TextIOWrapper(
+            io.BufferedReader(_BoundedReader(self.rfile, content_length)),
+            encoding="utf-8",
+            newline="",
+        )
+        result = self.import_controller.import_stream(body, import_format)
+        status = 200 if result.get("success") else 400
+        self._send_json(result, status=status)
+
     def _handle_teacher_update(self, parsed) -> None:
         try:
             teacher_id = int(parsed.path.rstrip("/").split("/")[-1])
@@ -132,20 +444,185 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
         status = 200 if result.get("success") else 400
         self._send_json(result, status=status)
 
+    def _handle_profiles(self, parsed) -> None:
+        """Список сохраненных профилей или выгрузка одного: /admin/profiles/{id}?format="""
+        if not self._require_admin():
+            return
+
+        parts = parsed.path.rstrip("/").split("/")
+        if parsed.path == "/admin/profiling" or len(parts) < 4:
+            self._send_json(
+                {
+                    "enabled": PROFILER.enabled,
+                    "sample_rate": PROFILER.sample_rate,
+                    "capacity": PROFILER.capacity,
+                    "profiles": PROFILER.list_profiles(),
+                }
+            )
+            return
+
+        profile_id = self._safe_int(parts[3])
+        profile_format = parse_qs(parsed.query).get("format", ["pstats"])[0]
+        content_type = PROFILE_FORMATS.get(profile_format)
+        if content_type is None:
+            self._send_json({"error": f"Неподдерживаемый формат: {profile_format}"}, status=400)
+            return
+
+        if profile_format == "pstats":
+            body = PROFILER.export_pstats(profile_id)
+        elif profile_format == "collapsed":
+            text = PROFILER.export_collapsed(profile_id)
+            body = text.encode("utf-8") if text is not None else None
+        else:
+            text = PROFILER.export_text(profile_id)
+            body = text.encode("utf-8") if text is not None else None
+
+        if body is None:
+            self._send_json({"error": "Профиль не найден"}, status=404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if profile_format == "pstats":
+            self.send_header(
+                "Content-Disposition", f'attachment; filename="profile-{profile_id}.pstats"'
+            )
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle_profiling_toggle(self) -> None:
+        """Включить/выключить выборочное профилирование: {"enabled": true, "sample_rate": 0.05}"""
+        if not self._require_admin():
+            return
+
+        payload = self._read_json_body()
+        if not isinstance(payload, dict):
+            self._send_json({"error": "Некорректный JSON"}, status=400)
+            return
+
+        try:
+            PROFILER.configure(payload.get("enabled"), payload.get("sample_rate"))
+        except ValueError as exc:
+            self._send_json({"error": str(exc)}, status=400)
+            return
+        self._send_json({"enabled": PROFILER.enabled, "sample_rate": PROFILER.sample_rate})
+
+    def _handle_sampling(self, parsed) -> None:
+        """Состояние статистического профилировщика или накопленные стеки"""
+        if not self._require_admin():
+            return
+        if parsed.path == "/admin/sampling/collapsed":
+            self._send_text(SAMPLER.collapsed(), "text/plain; charset=utf-8")
+            return
+        self._send_json(SAMPLER.status())
+
+    def _handle_sampling_toggle(self) -> None:
+        """Запуск/остановка выборки: {"enabled": true, "interval_ms": 10, "reset": true}"""
+        if not self._require_admin():
+            return
+
+        payload = self._read_json_body()
+        if not isinstance(payload, dict):
+            self._send_json({"error": "Некорректный JSON"}, status=400)
+            return
+
+        interval_ms = payload.get("interval_ms")
+        if interval_ms is not None and not isinstance(interval_ms, (int, float)):
+            self._send_json({"error": "Некорректный период выборки"}, status=400)
+            return
+
+        if payload.get("reset"):
+            SAMPLER.reset()
+        if payload.get("enabled") is True:
+            SAMPLER.start(interval_ms / 1000 if interval_ms is not None else None)
+        elif payload.get("enabled") is False:
+            SAMPLER.stop()
+        self._send_json(SAMPLER.status())
+
+    def _require_admin(self) -> bool:
+        if self.client_address[0] in ADMIN_CLIENTS:
+            return True
+        self._send_json({"error": "Доступ запрещен"}, status=403)
+        return False
+
     def _safe_int(self, value: Any, default: int  = None) -> int:
         try:
             return int(value)
         except (TypeError, ValueError):
             return default
 
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        self._response_status = code
+        super().send_response(code, message)
+
+    def _send_text(self, text: str, content_type: str, status: int = 200) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
-        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        body = json.dumps(payload, ensure_ascii=False, default=record_default).encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    def _send_stream(self, lines: Iterator[str], content_type: str, status: int = 200) -> None:
+        """
+        Потоковая отправка ответа. Для HTTP/1.1 клиентов - chunked transfer encoding,
+        для HTTP/1.0 - тело до закрытия соединения. Заголовки уходят сразу.
+        """
+        chunked = self.request_version == "HTTP/1.1"
+        if chunked:
+            # Чанки существуют только в HTTP/1.1, переключаем версию лишь для этого ответа
+            self.protocol_version = "HTTP/1.1"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        pending: List[bytes] = []
+        pending_size = 0
+        first_chunk = True
+        try:
+            for line in lines:
+                data = line.encode("utf-8")
+                pending.append(data)
+                pending_size += len(data)
+                # Первую строку отправляем сразу, дальше - крупными чанками
+                if pending_size >= STREAM_FLUSH_BYTES or len(pending) == 1 and first_chunk:
+                    self._write_stream_chunk(b"".join(pending), chunked)
+                    pending, pending_size, first_chunk = [], 0, False
+            if pending:
+                self._write_stream_chunk(b"".join(pending), chunked)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Клиент закрыл соединение - прекращаем чтение из репозитория
+            pass
+        except Exception as exc:
+            # Заголовки уже отправлены: обрываем соединение без завершающего чанка,
+            # чтобы клиент увидел неполный ответ, а не принял обрезанную выгрузку за полную
+            print(f"Ошибка потоковой выгрузки: {exc}")
+        finally:
+            close = getattr(lines, "close", None)
+            if close is not None:
+                close()
+
+    def _write_stream_chunk(self, data: bytes, chunked: bool) -> None:
+        if chunked:
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        else:
+            self.wfile.write(data)
+
     def _read_json_body(self) -> Dict[str, Any]:
         try:
             content_length = int(self.headers.get("Content-Length", 0))
@@ -185,17 +662,63 @@ class TeacherRequestHandler(SimpleHTTPRequestHandler):
 
         return filters
 
+    def _extract_fields(self, query: Dict[str, list[str]]) -> Optional[List[str]]:
+        """Разобрать ?fields=a,b,c; None - вернуть все поля"""
+        fields_raw = query.get("fields", [None])[0]
+        if not fields_raw:
+            return None
+        return [field.strip() for field in fields_raw.split(",") if field.strip()]
+
     def log_message(self, format: str, *args) -> None:
         """Тише лог, чтобы не захламлять вывод."""
         return
 
 
-def run_server(host: str = "127.0.0.1", port: int = 8000) -> None:
+class _BoundedReader(io.RawIOBase):
+    """Поток, отдающий из сокета не больше Content-Length байт."""
+
+    def __init__(self, raw, length: int) -> None:
+        self._raw = raw
+        self._remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        data = self._raw.read(min(len(buffer), self._remaining))
+        self._remaining -= len(data)
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    profile_sample_rate: float = 0.0,
+    sampling: bool = False,
+    listen_changes: bool = True,
+) -> None:
+    db = DatabaseManager()
+    register_db_metrics(db)
+    register_cache_metrics(TeacherRequestHandler.repository.cache)
+    listener = None
+    if listen_changes:
+        listener = start_change_listener(TeacherRequestHandler.repository, db)
+    if profile_sample_rate > 0:
+        PROFILER.configure(enabled=True, sample_rate=profile_sample_rate)
+    if sampling:
+        SAMPLER.start()
     handler = partial(TeacherRequestHandler, directory=str(PUBLIC_DIR))
     with HTTPServer((host, port), handler) as httpd:
         print(f"Сервер запущен: http://{host}:{port}")
         print("Ctrl+C для остановки")
-        httpd.serve_forever()
+        try:
+            httpd.serve_forever()
+        finally:
+            if listener is not None:
+                listener.stop()
 
 
 if __name__ == "__main__":